@@ -28,12 +28,13 @@ export default async function RSSFeedsPage() {
                 <th className="py-3 px-4">Status</th>
                 <th className="py-3 px-4">Enabled</th>
                 <th className="py-3 px-4">Last import</th>
+                <th className="py-3 px-4">Health</th>
                 <th className="py-3 px-4">Actions</th>
               </tr>
             </thead>
             <tbody>
               {feeds.length === 0 ? (
-                <tr><td className="py-6 text-center opacity-70" colSpan={6}>No feeds</td></tr>
+                <tr><td className="py-6 text-center opacity-70" colSpan={7}>No feeds</td></tr>
               ) : feeds.map((f: any) => (
                 <tr key={f.id} className="border-t border-white/5">
                   <td className="py-3 px-4">{f.url}</td>
@@ -41,6 +42,7 @@ export default async function RSSFeedsPage() {
                   <td className="py-3 px-4">{f.status}</td>
                   <td className="py-3 px-4">{f.enabled ? 'yes' : 'no'}</td>
                   <td className="py-3 px-4">{f.last_imported_at ? new Date(f.last_imported_at).toLocaleString() : '—'}</td>
+                  <td className="py-3 px-4"><FeedHealth health={f.health} /></td>
                   <td className="py-3 px-4 flex gap-2">
                     <RunNowButton id={f.id} />
                     <ToggleButton id={f.id} enabled={f.enabled} />
@@ -56,6 +58,28 @@ export default async function RSSFeedsPage() {
   )
 }
 
+function FeedHealth({ health }: { health: any }) {
+  if (!health) return <span className="opacity-60">—</span>
+  const score = Math.round(health.score ?? 100)
+  const color = score >= 80 ? 'text-emerald-400' : score >= 50 ? 'text-amber-400' : 'text-red-400'
+  const kb = (n?: number | null) => (n == null ? '—' : `${Math.round(n / 1024)} KB`)
+  return (
+    <div className="space-y-1">
+      <div className={color}>{score}/100{health.consecutive_failures > 0 ? ` · ${health.consecutive_failures} failures` : ''}</div>
+      <div className="text-xs opacity-70">
+        {health.last_fetch_ms ?? '—'} ms · HTTP {health.last_status_code ?? '—'} · {kb(health.last_bytes)} · {health.last_entries ?? 0} entries · parse {health.last_parse_ms ?? '—'} ms · images {kb(health.last_image_bytes)}
+      </div>
+      {health.last_extracted != null ? (
+        <div className="text-xs opacity-70">
+          full text {health.last_extracted} ok · {health.last_extract_failed ?? 0} failed · {health.last_extract_ms ?? 0} ms{health.extract_per_sec ? ` · ${health.extract_per_sec}/s` : ''}
+        </div>
+      ) : null}
+      {health.next_attempt_at ? <div className="text-xs opacity-70">Backoff until {new Date(health.next_attempt_at).toLocaleString()}</div> : null}
+      {health.last_error ? <div className="text-xs text-red-400 truncate max-w-xs" title={health.last_error}>{health.last_error}</div> : null}
+    </div>
+  )
+}
+
 function DeleteButton({ id }: { id: string }) {
   async function action() {
     "use server"
@@ -92,6 +116,7 @@ function CreateFeedForm() {
       status: String(formData.get('status') || 'draft'),
       max_items: Number(formData.get('max_items') || 20),
       download_images: Boolean(formData.get('download_images') || false),
+      extract_full: Boolean(formData.get('extract_full') || false),
     }
     await serverFetch('/admin/rss-feeds', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(payload) })
     revalidatePath('/admin/rss-feeds')
@@ -125,6 +150,9 @@ function CreateFeedForm() {
         <label className="inline-flex items-center gap-2 text-sm opacity-80">
           <input type="checkbox" name="download_images" defaultChecked /> Download images
         </label>
+        <label className="inline-flex items-center gap-2 text-sm opacity-80">
+          <input type="checkbox" name="extract_full" /> Extract full text
+        </label>
         <Button type="submit" className="ml-auto px-4 py-2">Add feed</Button>
       </div>
     </form>
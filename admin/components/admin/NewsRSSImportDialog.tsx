@@ -13,6 +13,7 @@ export default function NewsRSSImportDialog() {
   const [language, setLanguage] = useState('uk')
   const [status, setStatus] = useState<'draft'|'published'>('draft')
   const [downloadImages, setDownloadImages] = useState(true)
+  const [extractFull, setExtractFull] = useState(false)
   const [maxItems, setMaxItems] = useState(20)
   const [loading, setLoading] = useState(false)
   const qc = useQueryClient()
@@ -30,6 +31,7 @@ export default function NewsRSSImportDialog() {
           status,
           max_items: maxItems,
           download_images: downloadImages,
+          extract_full: extractFull,
         })
       })
       const j = await res.json().catch(()=>null)
@@ -69,6 +71,10 @@ export default function NewsRSSImportDialog() {
             <input type="checkbox" checked={downloadImages} onChange={e=>setDownloadImages(e.target.checked)} />
             Download images to /media
           </label>
+          <label className="inline-flex items-center gap-2 text-sm opacity-80">
+            <input type="checkbox" checked={extractFull} onChange={e=>setExtractFull(e.target.checked)} />
+            Extract full article text
+          </label>
           <div className="text-right">
             <Button onClick={submit} disabled={loading || !feedUrl}>{loading ? 'Importing…' : 'Import'}</Button>
           </div>
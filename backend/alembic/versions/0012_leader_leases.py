@@ -0,0 +1,32 @@
+"""create leader_leases table
+
+Revision ID: 0012_leader_leases
+Revises: 0011_content_indexes
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012_leader_leases"
+down_revision = "0011_content_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only used by the non-PostgreSQL fallback; PostgreSQL uses advisory locks.
+    op.create_table(
+        "leader_leases",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("holder", sa.String(length=128), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("leader_leases")
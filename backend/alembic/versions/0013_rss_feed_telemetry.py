@@ -0,0 +1,45 @@
+"""add fetch telemetry and health columns to rss_feeds
+
+Revision ID: 0013_rss_feed_telemetry
+Revises: 0012_leader_leases
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0013_rss_feed_telemetry"
+down_revision = "0012_leader_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("rss_feeds") as batch_op:
+        batch_op.add_column(sa.Column("last_fetch_ms", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_status_code", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_bytes", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_entries", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_parse_ms", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_image_bytes", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_error", sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column("health_score", sa.Float(), nullable=False, server_default="100"))
+        batch_op.add_column(sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("next_attempt_at", sa.DateTime(timezone=False), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("rss_feeds") as batch_op:
+        batch_op.drop_column("next_attempt_at")
+        batch_op.drop_column("consecutive_failures")
+        batch_op.drop_column("health_score")
+        batch_op.drop_column("last_error")
+        batch_op.drop_column("last_image_bytes")
+        batch_op.drop_column("last_parse_ms")
+        batch_op.drop_column("last_entries")
+        batch_op.drop_column("last_bytes")
+        batch_op.drop_column("last_status_code")
+        batch_op.drop_column("last_fetch_ms")
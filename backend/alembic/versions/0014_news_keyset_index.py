@@ -0,0 +1,31 @@
+"""composite index for keyset pagination of news
+
+Revision ID: 0014_news_keyset_index
+Revises: 0013_rss_feed_telemetry
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014_news_keyset_index"
+down_revision = "0013_rss_feed_telemetry"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches NewsService.list_news_page: equality on status/language, then
+    # (published_at, id) descending; id breaks ties so the keyset is total.
+    op.create_index(
+        "ix_news_status_language_published",
+        "news",
+        ["status", "language", sa.text("published_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_news_status_language_published", table_name="news")
@@ -0,0 +1,91 @@
+"""full-text search index for news
+
+Revision ID: 0015_news_fulltext
+Revises: 0014_news_keyset_index
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision = "0015_news_fulltext"
+down_revision = "0014_news_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+# Keep in sync with services/news_search.py::PG_CONFIGS. There is no
+# built-in Ukrainian configuration, so uk (and anything unknown) uses 'simple'.
+PG_CONFIG_SQL = (
+    "CASE language WHEN 'en' THEN 'english'::regconfig WHEN 'ru' THEN 'russian'::regconfig "
+    "WHEN 'de' THEN 'german'::regconfig WHEN 'fr' THEN 'french'::regconfig "
+    "WHEN 'it' THEN 'italian'::regconfig ELSE 'simple'::regconfig END"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            f"""
+            ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector({PG_CONFIG_SQL}, coalesce(title, '')), 'A') ||
+                setweight(to_tsvector({PG_CONFIG_SQL}, coalesce(summary, '')), 'B') ||
+                setweight(to_tsvector({PG_CONFIG_SQL}, coalesce(content, '')), 'C')
+            ) STORED
+            """
+        )
+        op.execute("CREATE INDEX ix_news_search_vector ON news USING GIN (search_vector)")
+    elif bind.dialect.name == "sqlite":
+        # External-content FTS5 table kept in sync with triggers
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                title, summary, content,
+                content='news', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON news BEGIN
+                INSERT INTO news_fts(rowid, title, summary, content)
+                VALUES (new.rowid, new.title, new.summary, new.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON news BEGIN
+                INSERT INTO news_fts(news_fts, rowid, title, summary, content)
+                VALUES ('delete', old.rowid, old.title, old.summary, old.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE ON news BEGIN
+                INSERT INTO news_fts(news_fts, rowid, title, summary, content)
+                VALUES ('delete', old.rowid, old.title, old.summary, old.content);
+                INSERT INTO news_fts(rowid, title, summary, content)
+                VALUES (new.rowid, new.title, new.summary, new.content);
+            END
+            """
+        )
+        op.execute("INSERT INTO news_fts(news_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_news_search_vector")
+        op.execute("ALTER TABLE news DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS news_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS news_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS news_fts_ai")
+        op.execute("DROP TABLE IF EXISTS news_fts")
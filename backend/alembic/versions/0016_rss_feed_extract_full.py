@@ -0,0 +1,33 @@
+"""add full-article extraction flag and stats to rss_feeds
+
+Revision ID: 0016_rss_feed_extract_full
+Revises: 0015_news_fulltext
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0016_rss_feed_extract_full"
+down_revision = "0015_news_fulltext"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("rss_feeds") as batch_op:
+        batch_op.add_column(sa.Column("extract_full", sa.Boolean(), nullable=False, server_default=sa.text("false")))
+        batch_op.add_column(sa.Column("last_extracted", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_extract_failed", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_extract_ms", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("rss_feeds") as batch_op:
+        batch_op.drop_column("last_extract_ms")
+        batch_op.drop_column("last_extract_failed")
+        batch_op.drop_column("last_extracted")
+        batch_op.drop_column("extract_full")
@@ -0,0 +1,39 @@
+"""near-duplicate clustering for news
+
+Revision ID: 0017_news_clusters
+Revises: 0016_rss_feed_extract_full
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0017_news_clusters"
+down_revision = "0016_rss_feed_extract_full"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep NULL simhash; the background backfill job fingerprints them.
+    with op.batch_alter_table("news") as batch_op:
+        batch_op.add_column(sa.Column("simhash", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("cluster_id", sa.String(length=36), nullable=True))
+    op.create_index("ix_news_cluster_id", "news", ["cluster_id"])
+    op.create_table(
+        "news_simhash_buckets",
+        sa.Column("band", sa.SmallInteger(), primary_key=True),
+        sa.Column("value", sa.Integer(), primary_key=True),
+        sa.Column("news_id", sa.String(length=36), sa.ForeignKey("news.id", ondelete="CASCADE"), primary_key=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("news_simhash_buckets")
+    op.drop_index("ix_news_cluster_id", table_name="news")
+    with op.batch_alter_table("news") as batch_op:
+        batch_op.drop_column("cluster_id")
+        batch_op.drop_column("simhash")
@@ -0,0 +1,43 @@
+"""content change feed for delta sync
+
+Revision ID: 0018_content_changes
+Revises: 0017_news_clusters
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0018_content_changes"
+down_revision = "0017_news_clusters"
+branch_labels = None
+depends_on = None
+
+
+TRACKED_TABLES = ("guides", "checklists", "templates", "news", "glossary_terms", "translations")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "content_changes",
+        sa.Column("seq", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.String(length=64), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_content_changes_entity", "content_changes", ["entity", "entity_id", "seq"])
+    # Seed one upsert per existing row so a sync from scratch sees everything
+    for table in TRACKED_TABLES:
+        op.execute(
+            f"INSERT INTO content_changes (entity, entity_id, op, changed_at) "
+            f"SELECT '{table}', id, 'upsert', CURRENT_TIMESTAMP FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_content_changes_entity", table_name="content_changes")
+    op.drop_table("content_changes")
@@ -0,0 +1,35 @@
+"""add pre-rendered markdown columns to guides
+
+Revision ID: 0019_guide_rendered_content
+Revises: 0018_content_changes
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0019_guide_rendered_content"
+down_revision = "0018_content_changes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing guides are rendered by the periodic backfill (main._render_guides);
+    # until then /rendered renders them in memory without writing
+    with op.batch_alter_table("guides") as batch_op:
+        batch_op.add_column(sa.Column("content_html", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("content_ast", sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("reading_minutes", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("guides") as batch_op:
+        batch_op.drop_column("reading_minutes")
+        batch_op.drop_column("content_hash")
+        batch_op.drop_column("content_ast")
+        batch_op.drop_column("content_html")
@@ -0,0 +1,52 @@
+"""unique news url (upsert key for bulk imports)
+
+Revision ID: 0020_news_url_unique
+Revises: 0019_guide_rendered_content
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0020_news_url_unique"
+down_revision = "0019_guide_rendered_content"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Keep the oldest row per url; the rest are dropped, and cluster members
+    # pointing at a dropped head are reset so the backfill job re-clusters them.
+    duplicates = [
+        row[0]
+        for row in bind.execute(
+            sa.text(
+                "SELECT n.id FROM news n WHERE EXISTS ("
+                " SELECT 1 FROM news o WHERE o.url = n.url"
+                " AND (o.created_at < n.created_at OR (o.created_at = n.created_at AND o.id < n.id)))"
+            )
+        )
+    ]
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(duplicates), 500):
+        ids = duplicates[start:start + 500]
+        params = {"ids": ids}
+        in_ids = sa.bindparam("ids", expanding=True)
+        bind.execute(sa.text("DELETE FROM news_simhash_buckets WHERE news_id IN :ids").bindparams(in_ids), params)
+        bind.execute(sa.text("UPDATE news SET cluster_id = NULL WHERE cluster_id IN :ids").bindparams(in_ids), params)
+        bind.execute(sa.text("DELETE FROM news WHERE id IN :ids").bindparams(in_ids), params)
+        bind.execute(
+            sa.text("INSERT INTO content_changes (entity, entity_id, op, changed_at) VALUES ('news', :id, 'delete', :now)"),
+            [{"id": i, "now": now} for i in ids],
+        )
+    op.create_index("uq_news_url", "news", ["url"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_news_url", table_name="news")
@@ -0,0 +1,52 @@
+"""unique (entity, entity_id, language) on translations
+
+Revision ID: 0021_translations_unique_key
+Revises: 0020_news_url_unique
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0021_translations_unique_key"
+down_revision = "0020_news_url_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # One row per key survives: approved first, then the most recently updated
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, entity, entity_id, language FROM translations"
+            " ORDER BY entity, entity_id, language,"
+            " CASE WHEN status = 'approved' THEN 0 ELSE 1 END, updated_at DESC, id"
+        )
+    )
+    seen = set()
+    duplicates = []
+    for row_id, entity, entity_id, language in rows:
+        key = (entity, entity_id, language)
+        if key in seen:
+            duplicates.append(row_id)
+        else:
+            seen.add(key)
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(duplicates), 500):
+        ids = duplicates[start:start + 500]
+        bind.execute(sa.text("DELETE FROM translations WHERE id IN :ids").bindparams(sa.bindparam("ids", expanding=True)), {"ids": ids})
+        bind.execute(
+            sa.text("INSERT INTO content_changes (entity, entity_id, op, changed_at) VALUES ('translations', :id, 'delete', :now)"),
+            [{"id": i, "now": now} for i in ids],
+        )
+    op.create_index("uq_translations_entity_language", "translations", ["entity", "entity_id", "language"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_translations_entity_language", table_name="translations")
@@ -0,0 +1,32 @@
+"""add glossary term spans to guides and news
+
+Revision ID: 0022_glossary_term_spans
+Revises: 0021_translations_unique_key
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0022_glossary_term_spans"
+down_revision = "0021_translations_unique_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows are annotated by the periodic glossary backfill (NULL version)
+    for table in ("guides", "news"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("term_spans", sa.JSON(), nullable=True))
+            batch_op.add_column(sa.Column("term_spans_version", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("news", "guides"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("term_spans_version")
+            batch_op.drop_column("term_spans")
@@ -0,0 +1,34 @@
+"""create revoked_tokens table
+
+Revision ID: 0023_revoked_tokens
+Revises: 0022_glossary_term_spans
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0023_revoked_tokens"
+down_revision = "0022_glossary_term_spans"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Used refresh and password-reset token ids; rows are purged once the token expires
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(length=64), primary_key=True),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
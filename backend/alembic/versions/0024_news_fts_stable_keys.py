@@ -0,0 +1,130 @@
+"""key the SQLite news full-text index by a stable integer id
+
+Revision ID: 0024_news_fts_stable_keys
+Revises: 0023_revoked_tokens
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision = "0024_news_fts_stable_keys"
+down_revision = "0023_revoked_tokens"
+branch_labels = None
+depends_on = None
+
+
+# 0015 pointed an external-content FTS5 table at news.rowid. news has a
+# string primary key, so that rowid is only an implicit one: VACUUM may
+# renumber it and INSERT OR REPLACE assigns a new one, either of which leaves
+# the index pointing at the wrong stories. The index now stores its own copy
+# of the text under an INTEGER PRIMARY KEY handed out per news id.
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS news_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS news_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS news_fts_ai")
+    op.execute("DROP TABLE IF EXISTS news_fts")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS news_fts_keys (
+            fts_rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+            news_id VARCHAR(36) NOT NULL UNIQUE
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, summary, content,
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON news BEGIN
+            INSERT OR IGNORE INTO news_fts_keys(news_id) VALUES (new.id);
+            INSERT OR REPLACE INTO news_fts(rowid, title, summary, content)
+            SELECT fts_rowid, new.title, new.summary, new.content FROM news_fts_keys WHERE news_id = new.id;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON news BEGIN
+            DELETE FROM news_fts WHERE rowid = (SELECT fts_rowid FROM news_fts_keys WHERE news_id = old.id);
+            DELETE FROM news_fts_keys WHERE news_id = old.id;
+        END
+        """
+    )
+    # Only text edits touch the index; cluster, status and annotation updates do not
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE OF id, title, summary, content ON news BEGIN
+            UPDATE news_fts_keys SET news_id = new.id WHERE news_id = old.id;
+            UPDATE news_fts SET title = new.title, summary = new.summary, content = new.content
+            WHERE rowid = (SELECT fts_rowid FROM news_fts_keys WHERE news_id = new.id);
+        END
+        """
+    )
+    op.execute("INSERT INTO news_fts_keys(news_id) SELECT id FROM news ORDER BY published_at, id")
+    op.execute(
+        """
+        INSERT INTO news_fts(rowid, title, summary, content)
+        SELECT k.fts_rowid, n.title, n.summary, n.content FROM news_fts_keys k JOIN news n ON n.id = k.news_id
+        """
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS news_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS news_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS news_fts_ai")
+    op.execute("DROP TABLE IF EXISTS news_fts")
+    op.execute("DROP TABLE IF EXISTS news_fts_keys")
+    # Back to the 0015 external-content table
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, summary, content,
+            content='news', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON news BEGIN
+            INSERT INTO news_fts(rowid, title, summary, content)
+            VALUES (new.rowid, new.title, new.summary, new.content);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON news BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, summary, content)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.content);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE ON news BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, summary, content)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.content);
+            INSERT INTO news_fts(rowid, title, summary, content)
+            VALUES (new.rowid, new.title, new.summary, new.content);
+        END
+        """
+    )
+    op.execute("INSERT INTO news_fts(news_fts) VALUES ('rebuild')")
@@ -0,0 +1,28 @@
+"""re-render guides after the closing-hash heading fix
+
+Revision ID: 0025_rerender_guides
+Revises: 0024_news_fts_stable_keys
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision = "0025_rerender_guides"
+down_revision = "0024_news_fts_stable_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Headings ending in "#" (e.g. "Learn C#") were stored with the "#" cut off.
+    # Clearing the hash hands every guide back to the periodic render backfill;
+    # until it runs, /rendered renders them in memory.
+    op.execute("UPDATE guides SET content_hash = NULL")
+
+
+def downgrade() -> None:
+    pass
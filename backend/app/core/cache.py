@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+"""
+In-process response caching primitives.
+
+Writers call `bump_version("<table>")` after committing; cached entries
+remember the versions they were built from and are discarded as soon as
+any of them moves. Versions live in process memory, so a write handled by
+one uvicorn worker does not invalidate the others: every entry also has a
+TTL that bounds how stale another worker's copy can get.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import sha256
+import threading
+import time
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+
+_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+
+def bump_version(*tables: str) -> None:
+    with _versions_lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def get_versions(tables: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(_versions.get(t, 0) for t in tables)
+
+
+def snapshot_versions() -> Dict[str, int]:
+    with _versions_lock:
+        return dict(_versions)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against our (strong) ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison, so a W/ prefix still matches.
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    versions: Tuple[int, ...]
+    created_at: float
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized response bodies bounded by entry count and total bytes."""
+
+    def __init__(self, *, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024, ttl_seconds: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, versions: Tuple[int, ...]) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.versions != versions or time.monotonic() - entry.created_at > self.ttl_seconds:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, body: bytes, versions: Tuple[int, ...], headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            versions=versions,
+            created_at=time.monotonic(),
+            headers=dict(headers or {}),
+        )
+        if len(body) > self.max_bytes:
+            # Too large to keep; still hand back an entry so the caller gets an ETag.
+            return entry
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
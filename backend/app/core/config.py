@@ -31,6 +31,20 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = Field(default="change-me-in-production")
     JWT_ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60 * 24, alias="JWT_EXPIRE_MINUTES")
+    # Authenticated users are cached per process (core/principals.py); writes to
+    # a user invalidate locally, the TTL bounds staleness across workers
+    PRINCIPAL_CACHE_TTL_SEC: int = Field(default=30, description="Max age of a cached authenticated user")
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(default=10000, description="Cached (subject, token issue time) pairs")
+    TOKEN_CACHE_MAX_ENTRIES: int = Field(default=10000, description="Verified access tokens kept decoded (core/token_cache.py)")
+    # bcrypt runs in its own process pool (core/password_hashing.py); past the
+    # pending limit logins and registrations get a 503 instead of queueing
+    PASSWORD_HASH_WORKERS: int = Field(default=2, description="Processes running bcrypt (0 hashes in the request thread)")
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=16, description="bcrypt operations queued or running before requests are shed")
+    PASSWORD_HASH_TIMEOUT_SEC: int = Field(default=10, description="Max wait for one bcrypt operation")
+    # Used refresh/reset token ids (services/token_revocation.py)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, description="Lifetime of a refresh token; each refresh issues a new one")
+    REVOKED_TOKENS_BLOOM_CAPACITY: int = Field(default=100_000, description="Revoked token ids the in-memory filter is sized for")
+    REVOKED_TOKENS_BLOOM_FP_RATE: float = Field(default=0.001, description="Filter false-positive rate (each costs one table lookup)")
 
     # Email / SMTP (optional, used for password reset and notifications)
     SMTP_HOST: str | None = Field(default=None, description="SMTP host for outgoing email")
@@ -56,6 +70,36 @@ class Settings(BaseSettings):
     # Remote config
     REMOTE_FLAGS: dict = Field(default_factory=lambda: {"enableNewOnboarding": True})
 
+    # Response caching (per process; TTL bounds staleness across workers)
+    RESPONSE_CACHE_TTL_SEC: int = Field(default=30, description="Default max age of a cached GET response")
+    NEWS_CACHE_TTL_SEC: int = Field(default=30, description="Max age of a cached news page")
+
+    # Delta sync: changes younger than this are held back so late-committing
+    # transactions cannot slip behind a cursor already handed to a client (a
+    # transaction open longer than this between flush and commit still can)
+    SYNC_SETTLE_SEC: int = Field(default=5, description="Seconds before a change is served by /sync")
+
+    # Near-duplicate news clustering
+    NEWS_DEDUP_WINDOW_DAYS: int = Field(default=14, description="Only stories published this close together can cluster")
+    NEWS_DEDUP_DROP: bool = Field(default=False, description="Skip storing imported stories that duplicate an existing one")
+
+    # Background jobs (only the elected leader process runs them)
+    FEED_IMPORT_INTERVAL_SEC: int = Field(default=900, description="Seconds between scheduled RSS imports")
+    FEED_BACKOFF_MAX_SEC: int = Field(default=6 * 3600, description="Upper bound for failing-feed backoff")
+    LEADER_LEASE_TTL_SEC: int = Field(default=15, description="Seconds before a silent leader's lease can be taken over")
+    LEADER_HEARTBEAT_SEC: int = Field(default=5, description="Seconds between leader heartbeats")
+
+    # Full-article extraction for feeds with extract_full (CPU work runs in a process pool)
+    ARTICLE_EXTRACT_WORKERS: int = Field(default=2, description="Processes parsing article HTML")
+    ARTICLE_EXTRACT_MAX_PENDING: int = Field(default=8, description="Pages queued for extraction before importers block")
+    ARTICLE_EXTRACT_TIMEOUT_SEC: int = Field(default=20, description="Max wait for one page's extraction")
+    ARTICLE_MAX_BYTES: int = Field(default=2_000_000, description="Article pages larger than this are truncated")
+    HTML_HEAD_MAX_BYTES: int = Field(default=256 * 1024, description="Max bytes read looking for </head> on single-article imports")
+
+    # Admin bulk imports (services/bulk_import.py)
+    IMPORT_CHUNK_SIZE: int = Field(default=500, description="Rows written per upsert statement and commit")
+    IMPORT_MAX_LINE_BYTES: int = Field(default=1024 * 1024, description="NDJSON lines longer than this are rejected")
+
 
     def parsed_cors_origins(self) -> List[str]:
         raw = self.CORS_ORIGINS
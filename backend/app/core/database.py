@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from .config import get_settings
@@ -40,3 +41,11 @@ def db_session() -> Generator[Session, None, None]:
         session.close()
 
 
+def upsert_insert(session: Session, table: Any) -> Optional[Any]:
+    """INSERT for `table` that supports `.on_conflict_do_update`, or None if the session's dialect has no ON CONFLICT."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    return None
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+"""
+Conditional-GET response cache for read endpoints.
+
+Routes opt in with `@cached("<table>", ...)`, naming the tables their output
+depends on. `ResponseCacheMiddleware` then serves repeat GETs from memory
+(serialized body, ETag computed once) and answers a matching If-None-Match
+with 304, without running the endpoint, its dependencies or the DB query.
+Entries are invalidated through the per-table versions in `core.cache`, which
+the service layer bumps after every committed write.
+
+The middleware is pure ASGI and should sit innermost so logging, CORS, rate
+limiting and metrics still see cached requests.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import CachedResponse, ResponseCache, etag_matches, get_versions, snapshot_versions
+from .metrics import RESPONSE_CACHE_TOTAL
+
+
+# Response headers that are recomputed on every send rather than stored
+_VOLATILE_HEADERS = {"content-length", "etag", "cache-control", "date", "server"}
+_ROUTE_MEMO_MAX = 4096
+
+
+@dataclass(frozen=True)
+class RouteCache:
+    name: str
+    tables: Tuple[str, ...]
+    vary: Tuple[str, ...]
+    cache: ResponseCache
+
+
+def cached(
+    *tables: str,
+    vary: Iterable[str] = (),
+    max_entries: int = 256,
+    max_bytes: int = 8 * 1024 * 1024,
+    ttl_seconds: Optional[float] = None,
+) -> Callable:
+    """
+    Mark a GET endpoint as cacheable. The cache key is the path plus the
+    normalized query string plus any `vary` request headers; use `vary` for
+    endpoints whose output depends on the caller (e.g. "authorization").
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        ttl = ttl_seconds
+        if ttl is None:
+            from .config import get_settings
+
+            ttl = get_settings().RESPONSE_CACHE_TTL_SEC
+        endpoint.__response_cache__ = RouteCache(
+            name=f"{endpoint.__module__}.{endpoint.__qualname__}",
+            tables=tuple(tables),
+            vary=tuple(h.lower() for h in vary),
+            cache=ResponseCache(max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl),
+        )
+        return endpoint
+
+    return decorator
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # path -> RouteCache (None: not cacheable), learned from the endpoint the
+        # router resolved for the first request to that path
+        self._routes: Dict[str, Optional[RouteCache]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        route_cache = self._routes.get(scope["path"])
+        if route_cache is None:
+            # Known uncacheable, or never seen yet
+            await self._first_pass(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = _cache_key(scope, headers, route_cache)
+        versions = get_versions(route_cache.tables)
+        entry = route_cache.cache.get(key, versions)
+        if entry is not None:
+            RESPONSE_CACHE_TOTAL.labels(endpoint=route_cache.name, result="hit").inc()
+            await _send_entry(entry, headers.get("if-none-match"), send)
+            return
+        await self._fill(scope, receive, send, route_cache, key, versions)
+
+    async def _first_pass(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request through; on a path seen for the first time, buffer and store it if the routed endpoint is cacheable."""
+        path = scope["path"]
+        if path in self._routes:
+            await self.app(scope, receive, send)
+            return
+        # The tables are unknown until routing, so snapshot every version up front
+        versions_at_start = snapshot_versions()
+        buffered: Optional[Callable] = None
+
+        async def route_aware_send(message: Message) -> None:
+            nonlocal buffered
+            if message["type"] == "http.response.start" and path not in self._routes:
+                # The router has resolved the endpoint by the time a response starts
+                route_cache = getattr(scope.get("endpoint"), "__response_cache__", None)
+                if len(self._routes) >= _ROUTE_MEMO_MAX:
+                    self._routes.clear()
+                self._routes[path] = route_cache
+                if route_cache is not None:
+                    headers = Headers(scope=scope)
+                    versions = tuple(versions_at_start.get(t, 0) for t in route_cache.tables)
+                    buffered = _collector(route_cache, _cache_key(scope, headers, route_cache), versions, headers.get("if-none-match"), send)
+            if buffered is not None:
+                await buffered(message)
+            else:
+                await send(message)
+
+        await self.app(scope, receive, route_aware_send)
+
+    async def _fill(self, scope: Scope, receive: Receive, send: Send, route_cache: RouteCache, key: Hashable, versions: Tuple[int, ...]) -> None:
+        # Versions were read before the endpoint ran: a write that lands
+        # mid-request leaves this entry already stale rather than wrongly fresh.
+        collect = _collector(route_cache, key, versions, Headers(scope=scope).get("if-none-match"), send)
+        await self.app(scope, receive, collect)
+
+
+def _cache_key(scope: Scope, headers: Headers, route_cache: RouteCache) -> Hashable:
+    query = scope.get("query_string", b"").decode("latin-1")
+    return (
+        scope["path"],
+        tuple(sorted(parse_qsl(query, keep_blank_values=True))),
+        tuple(headers.get(h) for h in route_cache.vary),
+    )
+
+
+def _collector(route_cache: RouteCache, key: Hashable, versions: Tuple[int, ...], if_none_match: Optional[str], send: Send) -> Callable:
+    """ASGI send that buffers a response, stores it if cacheable and sends it on."""
+    start: Optional[Message] = None
+    chunks: List[bytes] = []
+
+    async def collect(message: Message) -> None:
+        nonlocal start
+        if message["type"] == "http.response.start":
+            start = message
+            return
+        if message["type"] != "http.response.body" or start is None:
+            await send(message)
+            return
+        chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+        raw_headers = start.get("headers", [])
+        if start["status"] != 200 or any(k.lower() == b"set-cookie" for k, _ in raw_headers):
+            RESPONSE_CACHE_TOTAL.labels(endpoint=route_cache.name, result="bypass").inc()
+            await send(start)
+            await send({"type": "http.response.body", "body": b"".join(chunks)})
+            return
+        stored = {}
+        for k, v in raw_headers:
+            name = k.decode("latin-1").lower()
+            if name not in _VOLATILE_HEADERS:
+                stored[name] = v.decode("latin-1")
+        entry = route_cache.cache.set(key, b"".join(chunks), versions, headers=stored)
+        RESPONSE_CACHE_TOTAL.labels(endpoint=route_cache.name, result="miss").inc()
+        await _send_entry(entry, if_none_match, send)
+
+    return collect
+
+
+async def _send_entry(entry: CachedResponse, if_none_match: Optional[str], send: Send) -> None:
+    headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in entry.headers.items()]
+    headers += [(b"etag", entry.etag.encode("latin-1")), (b"cache-control", b"no-cache")]
+    if etag_matches(if_none_match, entry.etag):
+        headers = [(k, v) for k, v in headers if k != b"content-type"]
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    headers.append((b"content-length", str(len(entry.body)).encode("latin-1")))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": entry.body})
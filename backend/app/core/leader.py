@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+"""
+Leader election for periodic background work.
+
+Every uvicorn worker (and every replica) runs the same lifespan, so without
+coordination each process would import the same feeds at the same time.
+`LeaderElection` makes exactly one process the leader:
+
+- PostgreSQL: a session-level advisory lock held on a dedicated connection.
+  If the leader process dies its connection is closed and the lock is freed
+  immediately, so another worker takes over on its next heartbeat.
+- Other databases (SQLite): a row in `leader_leases` with an expiry that the
+  leader keeps pushing forward. A dead leader stops renewing and the lease
+  becomes available once `ttl_seconds` have passed.
+
+`heartbeat()` is blocking and should be called from a worker thread.
+"""
+
+from datetime import datetime, timedelta, timezone
+import os
+import socket
+import uuid
+import zlib
+
+from sqlalchemy import insert, or_, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from .logging import get_logger
+from ..models.leader_lease import LeaderLease
+
+
+log = get_logger(module="leader")
+
+
+def _default_holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderElection:
+    def __init__(self, name: str, *, ttl_seconds: float = 15.0, engine: Engine | None = None, holder_id: str | None = None) -> None:
+        if engine is None:
+            from .database import engine as default_engine
+
+            engine = default_engine
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder_id = holder_id or _default_holder_id()
+        self._engine = engine
+        self._use_advisory_lock = engine.dialect.name == "postgresql"
+        # Advisory locks are keyed by a bigint; derive a stable one from the name.
+        self._lock_key = zlib.crc32(name.encode("utf-8"))
+        self._conn: Connection | None = None
+        self._leader = False
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader
+
+    def heartbeat(self) -> bool:
+        """Acquire or renew leadership. Returns whether this process is the leader."""
+        was_leader = self._leader
+        try:
+            if self._use_advisory_lock:
+                self._leader = self._advisory_heartbeat()
+            else:
+                self._leader = self._lease_heartbeat()
+        except Exception as exc:
+            log.warning("leader_heartbeat_failed", name=self.name, error=str(exc))
+            self._drop_connection()
+            self._leader = False
+        if self._leader and not was_leader:
+            log.info("leader_acquired", name=self.name, holder=self.holder_id)
+        elif was_leader and not self._leader:
+            log.warning("leader_lost", name=self.name, holder=self.holder_id)
+        return self._leader
+
+    def release(self) -> None:
+        """Give up leadership so another process can take over without waiting for the TTL."""
+        if not self._leader:
+            self._drop_connection()
+            return
+        try:
+            if self._use_advisory_lock:
+                if self._conn is not None:
+                    self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self._lock_key})
+            else:
+                now = datetime.now(timezone.utc)
+                with self._engine.begin() as conn:
+                    conn.execute(
+                        update(LeaderLease)
+                        .where(LeaderLease.name == self.name, LeaderLease.holder == self.holder_id)
+                        .values(expires_at=now, updated_at=now)
+                    )
+            log.info("leader_released", name=self.name, holder=self.holder_id)
+        except Exception as exc:
+            log.warning("leader_release_failed", name=self.name, error=str(exc))
+        finally:
+            self._leader = False
+            self._drop_connection()
+
+    # --- PostgreSQL -----------------------------------------------------------
+
+    def _advisory_heartbeat(self) -> bool:
+        if self._conn is None:
+            # Autocommit so the held connection never sits "idle in transaction".
+            self._conn = self._engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        if self._leader:
+            # The lock lives as long as the session; just make sure it is still alive.
+            self._conn.execute(text("SELECT 1"))
+            return True
+        acquired = self._conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self._lock_key}).scalar()
+        return bool(acquired)
+
+    def _drop_connection(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            # Discard the DBAPI connection instead of returning it to the pool:
+            # it may still hold the session-level advisory lock, which the next
+            # checkout would inherit (or nobody would ever release)
+            self._conn.invalidate()
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    # --- Lease row fallback ---------------------------------------------------
+
+    def _lease_heartbeat(self) -> bool:
+        now = datetime.now(timezone.utc)
+        expires_at = now + self.ttl
+        with self._engine.begin() as conn:
+            # Renew our own lease or steal an expired one in a single atomic statement.
+            result = conn.execute(
+                update(LeaderLease)
+                .where(
+                    LeaderLease.name == self.name,
+                    or_(LeaderLease.holder == self.holder_id, LeaderLease.expires_at < now),
+                )
+                .values(holder=self.holder_id, expires_at=expires_at, updated_at=now)
+            )
+            if result.rowcount == 1:
+                return True
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(
+                    insert(LeaderLease).values(
+                        name=self.name, holder=self.holder_id, expires_at=expires_at, updated_at=now
+                    )
+                )
+            return True
+        except IntegrityError:
+            # Someone else holds a live lease.
+            return False
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+"""
+Application-level Prometheus metrics.
+
+HTTP metrics come from `prometheus_fastapi_instrumentator`; the collectors
+below cover background work that never shows up as an HTTP request. They
+register on the default registry, so they are exported on `/metrics`
+together with the HTTP metrics.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# Feeds are labelled by URL. Ad-hoc admin imports use the "adhoc" label so
+# arbitrary pasted URLs cannot blow up label cardinality.
+RSS_FETCH_SECONDS = Histogram(
+    "sweezy_rss_fetch_seconds",
+    "Time to download a feed document",
+    ["feed"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+RSS_FETCH_BYTES = Histogram(
+    "sweezy_rss_fetch_bytes",
+    "Size of the downloaded feed document",
+    ["feed"],
+    buckets=(1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6),
+)
+RSS_PARSE_SECONDS = Histogram(
+    "sweezy_rss_parse_seconds",
+    "Time spent parsing a feed document",
+    ["feed"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+RSS_ENTRIES = Histogram(
+    "sweezy_rss_entries",
+    "Entries found in a feed document",
+    ["feed"],
+    buckets=(0, 1, 5, 10, 20, 50, 100, 500),
+)
+RSS_IMAGE_BYTES = Histogram(
+    "sweezy_rss_image_bytes",
+    "Bytes of images downloaded during one feed import",
+    ["feed"],
+    buckets=(0, 1e5, 5e5, 1e6, 5e6, 2e7, 1e8),
+)
+RSS_IMPORTS_TOTAL = Counter(
+    "sweezy_rss_imports_total",
+    "Feed imports by outcome",
+    ["feed", "outcome"],
+)
+RSS_EXTRACT_SECONDS = Histogram(
+    "sweezy_rss_extract_seconds",
+    "Worker time spent extracting one article body",
+    ["feed"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2),
+)
+RSS_EXTRACTIONS_TOTAL = Counter(
+    "sweezy_rss_extractions_total",
+    "Article extractions by outcome",
+    ["feed", "outcome"],
+)
+
+# Labelled by endpoint function, never the raw path
+RESPONSE_CACHE_TOTAL = Counter(
+    "sweezy_response_cache_total",
+    "Cacheable GET requests by outcome (hit, miss, bypass)",
+    ["endpoint", "result"],
+)
+
+# Authentication caches (principal: user row behind a token, token: decoded JWT claims)
+AUTH_CACHE_TOTAL = Counter(
+    "sweezy_auth_cache_total",
+    "Authentication cache lookups by cache and outcome (hit, miss)",
+    ["cache", "result"],
+)
+
+# bcrypt work in the password hashing pool (core/password_hashing.py), op is hash or verify
+PASSWORD_HASH_SECONDS = Histogram(
+    "sweezy_password_hash_seconds",
+    "Worker time spent on one bcrypt operation",
+    ["op"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2),
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "sweezy_password_hash_wait_seconds",
+    "Time a bcrypt operation waited for a pool worker",
+    ["op"],
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+PASSWORD_HASH_TOTAL = Counter(
+    "sweezy_password_hash_total",
+    "bcrypt operations by outcome (ok, shed, timeout, broken)",
+    ["op", "outcome"],
+)
+PASSWORD_HASH_PENDING = Gauge(
+    "sweezy_password_hash_pending",
+    "bcrypt operations queued or running in the pool",
+)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+"""
+Opaque keyset-pagination cursors.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and
+base64url-wrapped so clients treat it as an opaque token.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    parts = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor`. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(parts, list) or len(parts) != arity:
+        raise ValueError("Invalid cursor")
+    values: List[Any] = []
+    for part in parts:
+        if isinstance(part, dict) and "dt" in part:
+            try:
+                values.append(datetime.fromisoformat(part["dt"]))
+            except (TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+        else:
+            values.append(part)
+    return values
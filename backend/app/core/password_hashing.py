@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+"""
+bcrypt hashing and verification off the request thread pool.
+
+A bcrypt round costs about 250 ms of CPU. Sync route handlers run on AnyIO's
+shared worker threads, so a burst of logins used to tie those threads up and
+stall every other endpoint. `hash_password` and `verify_password` hand the
+work to a small dedicated process pool (no GIL contention with the API) and
+wait for the result. The number of operations queued or running is bounded:
+once the pool holds `PASSWORD_HASH_MAX_PENDING` of them, further calls fail
+fast with `PasswordHashingBusy`, which the app turns into a 503, instead of
+parking more request threads behind the queue.
+
+`PASSWORD_HASH_WORKERS=0` runs bcrypt in the calling thread (tests, one-off
+scripts); the pending bound still applies. A pool whose worker died (OOM
+kill, crash) is broken for good, so it is dropped and the operation retried
+once on a fresh one. Workers are started by a fork
+server rather than forked from the API process, which by then runs threads
+(AnyIO workers, the DB pool) whose locks a plain fork could copy held.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+import time
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from .config import get_settings
+from .metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_SECONDS, PASSWORD_HASH_TOTAL, PASSWORD_HASH_WAIT_SECONDS
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(RuntimeError):
+    """The hashing pool is saturated (or too slow); retry later."""
+
+
+# Module-level so they pickle into pool workers; each returns (result, seconds)
+def _hash_timed(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    return pwd_context.hash(password), time.perf_counter() - started
+
+
+def _verify_timed(password: str, hashed: str) -> Tuple[bool, float]:
+    started = time.perf_counter()
+    return pwd_context.verify(password, hashed), time.perf_counter() - started
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_slots: Optional[threading.BoundedSemaphore] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Tuple[Optional[ProcessPoolExecutor], threading.BoundedSemaphore]:
+    global _pool, _pool_slots
+    with _pool_lock:
+        settings = get_settings()
+        if _pool is None and settings.PASSWORD_HASH_WORKERS > 0:
+            _pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("forkserver"))
+        if _pool_slots is None:
+            _pool_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+        return _pool, _pool_slots
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    # Only the caller that saw it break replaces it; others already got the new pool
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(op: str, fn: Callable[..., Tuple[T, float]], *args: str, retry: bool = True) -> T:
+    pool, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        PASSWORD_HASH_TOTAL.labels(op=op, outcome="shed").inc()
+        raise PasswordHashingBusy("Password hashing is at capacity")
+    PASSWORD_HASH_PENDING.inc()
+
+    def _release(_: object = None) -> None:
+        PASSWORD_HASH_PENDING.dec()
+        slots.release()
+
+    submitted = time.perf_counter()
+    if pool is None:
+        try:
+            result, seconds = fn(*args)
+        finally:
+            _release()
+    else:
+        try:
+            future: "Future[Tuple[T, float]]" = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            _release()
+            return _retry_broken(op, pool, fn, args, retry)
+        except Exception:
+            _release()
+            raise
+        # The slot stays taken until the worker is done, even if we stop waiting
+        future.add_done_callback(_release)
+        try:
+            result, seconds = future.result(timeout=get_settings().PASSWORD_HASH_TIMEOUT_SEC)
+        except FutureTimeoutError:
+            PASSWORD_HASH_TOTAL.labels(op=op, outcome="timeout").inc()
+            raise PasswordHashingBusy("Password hashing timed out") from None
+        except BrokenProcessPool:
+            return _retry_broken(op, pool, fn, args, retry)
+    PASSWORD_HASH_SECONDS.labels(op=op).observe(seconds)
+    PASSWORD_HASH_WAIT_SECONDS.labels(op=op).observe(max(time.perf_counter() - submitted - seconds, 0.0))
+    PASSWORD_HASH_TOTAL.labels(op=op, outcome="ok").inc()
+    return result
+
+
+def _retry_broken(op: str, pool: ProcessPoolExecutor, fn: Callable[..., Tuple[T, float]], args: Tuple[str, ...], retry: bool) -> T:
+    PASSWORD_HASH_TOTAL.labels(op=op, outcome="broken").inc()
+    _discard_pool(pool)
+    if not retry:
+        raise PasswordHashingBusy("Password hashing workers crashed")
+    return _run(op, fn, *args, retry=False)
+
+
+def hash_password(password: str) -> str:
+    return _run("hash", _hash_timed, password)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return _run("verify", _verify_timed, password, hashed)
+
+
+def shutdown_password_pool() -> None:
+    global _pool, _pool_slots
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_slots = None, None
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+"""
+Authenticated-user cache for `get_current_user`.
+
+A valid access token still needs the user row behind it (is the account
+active, what role and subscription does it have). Instead of a SELECT on
+every request, the fields endpoints use are kept as an immutable
+`Principal`, keyed by the token's subject and issue time. A flush listener
+collects every user row written in a session and drops their entries when
+the session commits: role, subscription, password and account-deletion
+writes all go through the ORM. As with the response cache, entries live in
+process memory, so a TTL bounds how long another worker's write goes unseen.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+import threading
+import time
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+from .config import get_settings
+from .metrics import AUTH_CACHE_TOTAL
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: str
+    email: str
+    role: str
+    is_active: bool
+    is_superuser: bool
+    subscription_status: str
+    subscription_expire_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            subscription_status=user.subscription_status or "free",
+            subscription_expire_at=user.subscription_expire_at,
+        )
+
+
+class PrincipalCache:
+    def __init__(self, *, max_entries: int = 10000, ttl_seconds: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Principal, float]]" = OrderedDict()
+        self._by_subject: Dict[str, Set[Tuple[str, Hashable]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, subject: str, issued_at: Hashable) -> Optional[Principal]:
+        key = (subject, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                AUTH_CACHE_TOTAL.labels(cache="principal", result="miss").inc()
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                AUTH_CACHE_TOTAL.labels(cache="principal", result="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+        AUTH_CACHE_TOTAL.labels(cache="principal", result="hit").inc()
+        return principal
+
+    def set(self, subject: str, issued_at: Hashable, principal: Principal) -> None:
+        key = (subject, issued_at)
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._by_subject.setdefault(subject, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *subjects: str) -> None:
+        with self._lock:
+            for subject in subjects:
+                for key in list(self._by_subject.get(subject, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def _remove(self, key: Tuple[str, Hashable]) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_subject.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_subject[key[0]]
+
+
+@lru_cache(maxsize=1)
+def principal_cache() -> PrincipalCache:
+    settings = get_settings()
+    return PrincipalCache(max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SEC)
+
+
+_PENDING = "principal_cache_invalidate"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_users(session: Session, flush_context) -> None:
+    subjects: Set[str] = session.info.setdefault(_PENDING, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            subjects.add(obj.email)
+            # Tokens carry the email the row had when they were issued
+            subjects.update(e for e in inspect(obj).attrs.email.history.deleted if e)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_users(session: Session) -> None:
+    subjects = session.info.pop(_PENDING, None)
+    if subjects:
+        principal_cache().invalidate(*subjects)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_written_users(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+"""
+Field projection for list endpoints (`?fields=`).
+
+List screens usually render a title and a few attributes, not the large
+body columns. A projection names the fields to return, either as a preset
+("summary") or as a comma-separated list. Services select only those columns.
+"""
+
+from typing import Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+
+SUMMARY = "summary"
+
+
+def parse_fields(raw: Optional[str], schema: Type[BaseModel], summary: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Resolve a `fields` query value against the output schema. Returns None for
+    full rows; otherwise the fields to select in schema order, always including
+    the schema's required fields. Raises ValueError for unknown fields.
+    """
+    if raw is None or not raw.strip():
+        return None
+    requested = set(summary) if raw.strip() == SUMMARY else {f.strip() for f in raw.split(",") if f.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    required = {name for name, info in schema.model_fields.items() if info.is_required()}
+    wanted = requested | required
+    return tuple(name for name in schema.model_fields if name in wanted)
@@ -2,30 +2,34 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
+import uuid
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from .config import get_settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
+# bcrypt runs in core/password_hashing.py's process pool
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    from .password_hashing import verify_password as _verify
+
+    return _verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    from .password_hashing import hash_password
+
+    return hash_password(password)
 
 
 def create_access_token(subject: str, *, is_admin: bool = False, role: str | None = None, expires_delta: Optional[timedelta] = None) -> str:
     settings = get_settings()
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    expire = datetime.now(timezone.utc) + expires_delta
-    to_encode: Dict[str, Any] = {"sub": subject, "exp": expire, "is_admin": is_admin}
+    now = datetime.now(timezone.utc)
+    expire = now + expires_delta
+    # iat keys the principal cache (core/principals.py)
+    to_encode: Dict[str, Any] = {"sub": subject, "exp": expire, "iat": now, "is_admin": is_admin}
     if role:
         to_encode["role"] = role
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
@@ -41,11 +45,21 @@ def decode_token(token: str) -> Dict[str, Any]:
         raise ValueError("Invalid token") from exc
 
 
-def create_refresh_token(subject: str, *, expires_delta: Optional[timedelta] = None) -> str:
+def _create_single_use_token(subject: str, token_type: str, expires_delta: timedelta) -> str:
     settings = get_settings()
-    if expires_delta is None:
-        expires_delta = timedelta(days=7)
     expire = datetime.now(timezone.utc) + expires_delta
-    payload: Dict[str, Any] = {"sub": subject, "type": "refresh", "exp": expire}
+    # jti is recorded in revoked_tokens once the token is used (services/token_revocation.py)
+    payload: Dict[str, Any] = {"sub": subject, "type": token_type, "exp": expire, "jti": uuid.uuid4().hex}
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
+
+def create_refresh_token(subject: str, *, expires_delta: Optional[timedelta] = None) -> str:
+    if expires_delta is None:
+        expires_delta = timedelta(days=get_settings().REFRESH_TOKEN_EXPIRE_DAYS)
+    return _create_single_use_token(subject, "refresh", expires_delta)
+
+
+def create_password_reset_token(subject: str, *, expires_delta: Optional[timedelta] = None) -> str:
+    # A distinct type so a reset link cannot be traded in at /auth/refresh, and vice versa
+    return _create_single_use_token(subject, "password_reset", expires_delta or timedelta(hours=1))
+
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+"""
+Decoded-JWT cache for the auth dependencies.
+
+A client sends the same access token with every request until it expires,
+and `decode_token` (signature check plus JSON parse) is repeated each time,
+twice when a route needs both a role and the current user. Verified claims
+are kept in a bounded LRU keyed by a digest of the token, so the token
+itself is not held as a key. An entry is dropped at the token's `exp`, so a
+cached token never outlives what `decode_token` would accept. Only valid
+tokens are cached: garbage cannot push real entries out.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from .config import get_settings
+from .metrics import AUTH_CACHE_TOTAL
+from .security import decode_token
+
+
+class TokenCache:
+    def __init__(self, *, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """`decode_token` with caching; raises ValueError for invalid or expired tokens."""
+        key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.time():
+                    self._entries.move_to_end(key)
+                    AUTH_CACHE_TOTAL.labels(cache="token", result="hit").inc()
+                    # Callers get their own copy; the cached claims stay untouched
+                    return dict(entry[0])
+                del self._entries[key]
+        AUTH_CACHE_TOTAL.labels(cache="token", result="miss").inc()
+        claims = decode_token(token)
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)):
+            with self._lock:
+                self._entries[key] = (dict(claims), float(expires_at))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache(maxsize=1)
+def token_cache() -> TokenCache:
+    return TokenCache(max_entries=get_settings().TOKEN_CACHE_MAX_ENTRIES)
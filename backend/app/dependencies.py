@@ -7,7 +7,9 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from .core.database import get_db
-from .core.security import decode_token
+from .core.principals import Principal, principal_cache
+from .core.token_cache import token_cache
+from .models.user import User
 from .services.users import UserService
 from datetime import datetime, timezone
 
@@ -19,7 +21,7 @@ def get_current_admin(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security_scheme)],
 ) -> Dict:
     try:
-        payload = decode_token(credentials.credentials)
+        payload = token_cache().decode(credentials.credentials)
         if not payload.get("is_admin"):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
         return payload
@@ -34,25 +36,45 @@ DBSession = Annotated[Session, Depends(get_db)]
 def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security_scheme)],
     db: DBSession,
-):
+) -> Principal:
     try:
-        payload = decode_token(credentials.credentials)
+        payload = token_cache().decode(credentials.credentials)
         email = payload.get("sub")
-        if not email:
+        # Refresh and password-reset tokens carry a type; only access tokens authenticate
+        if not email or payload.get("type"):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        user = UserService.get_by_email(db, email)
-        if not user or not user.is_active:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
-        return user
+        # The session only connects on a cache miss
+        cache = principal_cache()
+        principal = cache.get(email, payload.get("iat"))
+        if principal is None:
+            user = UserService.get_by_email(db, email)
+            if not user or not user.is_active:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
+            principal = Principal.from_user(user)
+            cache.set(email, payload.get("iat"), principal)
+        return principal
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
 
-CurrentUser = Annotated[object, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+
+
+def get_current_user_record(user: CurrentUser, db: DBSession) -> User:
+    """The current user's row, for endpoints that modify it."""
+    record = db.get(User, user.id)
+    if record is None or not record.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
+    return record
+
+CurrentUserRecord = Annotated[User, Depends(get_current_user_record)]
 
 
 def require_roles(*roles: str):
     def dependency(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security_scheme)]):
-        payload = decode_token(credentials.credentials)
+        try:
+            payload = token_cache().decode(credentials.credentials)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
         role = payload.get("role")
         is_admin = payload.get("is_admin")
         if is_admin:
@@ -65,20 +87,17 @@ def require_roles(*roles: str):
 
 def require_premium():
     def dependency(user=Depends(get_current_user)):
-        # Expire trial/premium if past date
-        expire_at = getattr(user, "subscription_expire_at", None)
-        status = getattr(user, "subscription_status", "free") or "free"
-        if status in {"trial", "premium"} and expire_at is not None:
+        # A trial/premium past its expiry counts as free; the stored status is
+        # corrected by the next subscription write
+        expire_at = user.subscription_expire_at
+        plan = user.subscription_status
+        if plan in {"trial", "premium"} and expire_at is not None:
             try:
                 if expire_at < datetime.now(timezone.utc):
-                    # downgrade
-                    user.subscription_status = "free"
-                    user.subscription_expire_at = None
-                    # We do not have db session here; silently rely on next write to persist, or ignore.
-                    status = "free"
+                    plan = "free"
             except Exception:
                 pass
-        if status not in {"trial", "premium"}:
+        if plan not in {"trial", "premium"}:
             raise HTTPException(
                 status_code=status.HTTP_402_PAYMENT_REQUIRED,
                 detail="Premium required. Subscribe to continue.",
@@ -6,7 +6,6 @@ import contextlib
 from typing import List
 import subprocess
 from pathlib import Path
-import os
 import time as _time
 import sys
 
@@ -15,11 +14,14 @@ import uuid
 from fastapi import FastAPI, HTTPException, Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .core.config import get_settings
 from .core.rate_limit import limiter
 from .core.logging import configure_logging, get_logger
 from .core.sentry import init_sentry
+from .core.http_cache import ResponseCacheMiddleware
+from .core.password_hashing import PasswordHashingBusy
 from .routers.auth import router as auth_router
 from .routers.guides import router as guides_router
 from .routers.checklists import router as checklists_router
@@ -38,6 +40,9 @@ from .routers.translations import router as translations_router
 from .routers.subscriptions import router as subscriptions_router
 from .routers.telemetry import router as telemetry_router
 from .routers.legal import router as legal_router
+from .routers.sync import router as sync_router
+from .routers.content import router as content_router
+from .routers.search import router as search_router
 
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -55,30 +60,131 @@ except Exception:
     raise
 
 
-async def _background_tick() -> None:
+def _import_enabled_feeds() -> None:
+    from datetime import datetime
+    from sqlalchemy import or_
     from .core.database import SessionLocal
     from .models.rss_feed import RSSFeed
     from .services.rss_importer import RSSImporter
 
-    interval = int(os.getenv("FEED_IMPORT_INTERVAL_SEC", "900"))
-    last_run = 0.0
-    while True:
-        await asyncio.sleep(60)
-        now = _time.monotonic()
-        if now - last_run < interval:
-            continue
-        last_run = now
+    with SessionLocal() as db:
+        # Feeds in failure backoff are skipped until their next attempt is due
+        feeds: List[RSSFeed] = (
+            db.query(RSSFeed)
+            .filter(RSSFeed.enabled == True)  # noqa: E712
+            .filter(or_(RSSFeed.next_attempt_at.is_(None), RSSFeed.next_attempt_at <= datetime.utcnow()))
+            .all()
+        )
+        for f in feeds:
+            try:
+                RSSImporter.import_feed_record(db, f)
+            except Exception:
+                db.rollback()
+                continue
+
+
+def _backfill_news_clusters() -> None:
+    from .core.cache import bump_version
+    from .core.database import SessionLocal
+    from .services.news_dedup import NewsDedup
+
+    # Fingerprint stories created before clustering existed (no-op once done)
+    with SessionLocal() as db:
+        total = 0
+        while True:
+            processed = NewsDedup.backfill(db, batch_size=500)
+            total += processed
+            if processed < 500:
+                break
+    if total:
+        bump_version("news")
+        log.info("news_clusters_backfilled", rows=total)
+
+
+def _annotate_glossary_terms() -> None:
+    from .core.database import SessionLocal
+    from .models import Guide
+    from .models.news import News
+    from .services.glossary_annotator import GlossaryAnnotator
+
+    # Rows written before annotation existed, or against an older glossary
+    with SessionLocal() as db:
+        total = 0
+        for model in (Guide, News):
+            while True:
+                processed = GlossaryAnnotator.backfill(db, model, batch_size=200)
+                total += processed
+                if processed < 200:
+                    break
+    if total:
+        log.info("glossary_terms_annotated", rows=total)
+
+
+def _render_guides() -> None:
+    from .core.database import SessionLocal
+    from .services import GuideService
+
+    # Guides written before pre-rendering existed; until then the API renders them per request
+    with SessionLocal() as db:
+        total = 0
+        while True:
+            processed = GuideService.backfill_rendered(db, batch_size=200)
+            total += processed
+            if processed < 200:
+                break
+    if total:
+        log.info("guides_rendered", rows=total)
+
+
+def _compact_content_changes() -> None:
+    from .core.database import SessionLocal
+    from .services.sync import SyncService
+
+    with SessionLocal() as db:
+        removed = SyncService.compact(db)
+    if removed:
+        log.info("content_changes_compacted", rows=removed)
+
+
+def _purge_revoked_tokens() -> None:
+    from .core.database import SessionLocal
+    from .services.token_revocation import TokenRevocation
+
+    with SessionLocal() as db:
+        removed = TokenRevocation.purge(db)
+    if removed:
+        log.info("revoked_tokens_purged", rows=removed)
+
+
+def _run_periodic_jobs() -> None:
+    # Blocking; runs in a worker thread so heartbeats keep flowing during long imports.
+    for job in (_import_enabled_feeds, _backfill_news_clusters, _annotate_glossary_terms, _render_guides, _compact_content_changes, _purge_revoked_tokens):
         try:
-            with SessionLocal() as db:
-                feeds: List[RSSFeed] = db.query(RSSFeed).filter(RSSFeed.enabled == True).all()  # noqa: E712
-                for f in feeds:
-                    try:
-                        RSSImporter.import_feed_record(db, f)
-                    except Exception:
-                        continue
-        except Exception:
+            job()
+        except Exception as exc:
             # never break background loop
-            pass
+            log.warning("periodic_job_failed", job=job.__name__, error=str(exc))
+
+
+async def _background_tick() -> None:
+    from .core.leader import LeaderElection
+
+    election = LeaderElection("background-jobs", ttl_seconds=settings.LEADER_LEASE_TTL_SEC)
+    interval = settings.FEED_IMPORT_INTERVAL_SEC
+    last_run = 0.0
+    job: asyncio.Future | None = None
+    try:
+        while True:
+            is_leader = await asyncio.to_thread(election.heartbeat)
+            now = _time.monotonic()
+            if is_leader and (job is None or job.done()) and now - last_run >= interval:
+                last_run = now
+                job = asyncio.ensure_future(asyncio.to_thread(_run_periodic_jobs))
+            await asyncio.sleep(settings.LEADER_HEARTBEAT_SEC)
+    finally:
+        # Hand over immediately instead of making the next leader wait for the lease TTL.
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(election.release)
 
 
 @asynccontextmanager
@@ -106,6 +212,30 @@ async def lifespan(app: FastAPI):
         # Seeding is helpful but not critical for serving requests; log and continue.
         log.warning("seed_admin_failed", error=str(exc))
 
+    from .services.content_search import ContentSearch
+
+    def _build_search_index() -> None:
+        with SessionLocal() as db:
+            ContentSearch.rebuild(db)
+
+    try:
+        await asyncio.to_thread(_build_search_index)
+    except Exception as exc:
+        # The first search request builds it instead
+        log.warning("search_index_build_failed", error=str(exc))
+
+    from .services.translation_memory import TranslationMemory
+
+    def _build_translation_memory() -> None:
+        with SessionLocal() as db:
+            TranslationMemory.rebuild(db)
+
+    try:
+        await asyncio.to_thread(_build_translation_memory)
+    except Exception as exc:
+        # The first suggest request builds it instead
+        log.warning("translation_memory_build_failed", error=str(exc))
+
     task = asyncio.create_task(_background_tick())
     try:
         yield
@@ -114,6 +244,11 @@ async def lifespan(app: FastAPI):
         # Suppress task cancellation on shutdown to avoid noisy tracebacks
         with contextlib.suppress(asyncio.CancelledError):
             await task
+        from .core.password_hashing import shutdown_password_pool
+        from .services.article_extractor import shutdown_extraction_pool
+
+        shutdown_extraction_pool()
+        shutdown_password_pool()
 
 
 app = FastAPI(
@@ -139,12 +274,18 @@ allowed_origins = list(getattr(settings, "parsed_cors_origins", lambda: settings
 if settings.APP_ENV.lower() == "production" and (not allowed_origins or "*" in allowed_origins):
     allowed_origins = []  # locked — must be provided explicitly by env
 
+# Added first so it sits innermost: logging, CORS, rate limiting and metrics
+# still run for responses served from the cache.
+app.add_middleware(ResponseCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cross-origin clients (e.g. the admin panel) page the news list by this header
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -196,6 +337,19 @@ app.add_middleware(RequestIDMiddleware)
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 
+
+async def _password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy) -> JSONResponse:
+    # Login bursts are shed rather than queued behind the bcrypt pool
+    log.warning("password_hashing_shed", path=request.url.path, reason=str(exc))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+app.add_exception_handler(PasswordHashingBusy, _password_hashing_busy_handler)
+
 # Prometheus metrics must be registered BEFORE startup (instrumentator adds middleware).
 try:
     instrumentator.instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
@@ -274,6 +428,9 @@ app.include_router(translations_router, prefix=f"{API_PREFIX}/translations", tag
 app.include_router(subscriptions_router, prefix=f"{API_PREFIX}/subscriptions", tags=["subscriptions"])
 app.include_router(analytics_router, prefix=f"{API_PREFIX}/analytics", tags=["analytics"])
 app.include_router(telemetry_router, prefix=f"{API_PREFIX}/telemetry", tags=["telemetry"])
+app.include_router(sync_router, prefix=f"{API_PREFIX}/sync", tags=["sync"])
+app.include_router(content_router, prefix=f"{API_PREFIX}/content", tags=["content"])
+app.include_router(search_router, prefix=f"{API_PREFIX}/search", tags=["search"])
 
 # Public pages (App Store / legal)
 app.include_router(legal_router, tags=["legal"])
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, event
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from ..core.database import Base
+
+
+# Tables whose rows are mirrored by clients through GET /sync
+TRACKED_TABLES = ("guides", "checklists", "templates", "news", "glossary_terms", "translations")
+
+
+class ContentChange(Base):
+    """Append-only change feed; `seq` is the sync cursor clients resume from."""
+
+    __tablename__ = "content_changes"
+    __table_args__ = (Index("ix_content_changes_entity", "entity", "entity_id", "seq"),)
+
+    seq: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # upsert|delete
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+def record_changes(session: Session, entity: str, entity_ids: Iterable[str], op: str = "upsert") -> None:
+    """
+    Log changes made outside the ORM unit of work (bulk/core statements),
+    which the flush listener below cannot see. Runs in the caller's transaction.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [{"entity": entity, "entity_id": str(i), "op": op, "changed_at": now} for i in entity_ids]
+    if rows:
+        session.execute(ContentChange.__table__.insert(), rows)
+
+
+def _tracked(obj) -> bool:
+    # Only models on this module's metadata: if the package is imported twice
+    # (`app.` and `backend.app.`), each copy's listener logs its own models once.
+    table = getattr(obj.__class__, "__table__", None)
+    return table is not None and table.metadata is Base.metadata and table.name in TRACKED_TABLES
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session: Session, flush_context) -> None:
+    # new/dirty/deleted and attribute history still describe the flush here,
+    # and primary keys generated by column defaults are populated.
+    changes: Dict[tuple, str] = {}
+    for obj in session.new:
+        if _tracked(obj):
+            changes[(obj.__class__.__table__.name, obj.id)] = "upsert"
+    for obj in session.dirty:
+        if _tracked(obj) and session.is_modified(obj, include_collections=False):
+            changes[(obj.__class__.__table__.name, obj.id)] = "upsert"
+    for obj in session.deleted:
+        if _tracked(obj):
+            changes[(obj.__class__.__table__.name, obj.id)] = "delete"
+    if not changes:
+        return
+    now = datetime.now(timezone.utc)
+    rows: List[dict] = [
+        {"entity": entity, "entity_id": str(entity_id), "op": op, "changed_at": now}
+        for (entity, entity_id), op in changes.items()
+    ]
+    session.connection().execute(ContentChange.__table__.insert(), rows)
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, func
+from sqlalchemy import JSON, Boolean, DateTime, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.database import Base
@@ -23,6 +23,14 @@ class Guide(Base):
     is_published: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     status: Mapped[str] = mapped_column(String(20), default="published", nullable=False)
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    # Pre-rendered `content` (services.markdown_render), refreshed on write
+    content_html: Mapped[Optional[str]] = mapped_column(Text)
+    content_ast: Mapped[Optional[dict]] = mapped_column(JSON)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
+    reading_minutes: Mapped[Optional[int]] = mapped_column(Integer)
+    # Glossary mentions in `content` (services.glossary_annotator)
+    term_spans: Mapped[Optional[list]] = mapped_column(JSON)
+    term_spans_version: Mapped[Optional[int]] = mapped_column(Integer)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
@@ -4,13 +4,15 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Text
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index, Integer, SmallInteger, String, Text
 
 from ..core.database import Base
 
 
 class News(Base):
     __tablename__ = "news"
+    # url is the upsert key for bulk imports (services/bulk_import.py)
+    __table_args__ = (Index("uq_news_url", "url", unique=True),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
@@ -22,7 +24,22 @@ class News(Base):
     status: Mapped[str] = mapped_column(String(16), nullable=False, default="published")  # 'draft' | 'published'
     published_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False, default=datetime.utcnow)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Near-duplicate clustering (services/news_dedup.py): 64-bit simhash of
+    # title+summary and the id of the cluster's canonical story (self for heads)
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    cluster_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+    # Glossary mentions in `content` (services/glossary_annotator.py)
+    term_spans: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    term_spans_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False, default=datetime.utcnow)
 
 
+class NewsSimhashBucket(Base):
+    """LSH index: one row per 16-bit band of each canonical story's simhash."""
+
+    __tablename__ = "news_simhash_buckets"
+
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, primary_key=True)
+    news_id: Mapped[str] = mapped_column(String(36), ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
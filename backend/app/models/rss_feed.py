@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Boolean, DateTime, Integer
+from sqlalchemy import String, Boolean, DateTime, Float, Integer
 
 from ..core.database import Base
 
@@ -19,7 +19,26 @@ class RSSFeed(Base):
     enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     max_items: Mapped[int] = mapped_column(Integer, nullable=False, default=20)
     download_images: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Fetch each entry's page and store the extracted article body in News.content
+    extract_full: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     last_imported_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), nullable=True)
+
+    # Telemetry from the most recent import attempt
+    last_fetch_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_entries: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_parse_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_image_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    last_extracted: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_extract_failed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_extract_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Health: EWMA score 0..100 and failure backoff used by the scheduler
+    health_score: Mapped[float] = mapped_column(Float, nullable=False, default=100.0)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False, default=datetime.utcnow)
 
@@ -4,7 +4,7 @@ from datetime import datetime
 from uuid import uuid4
 from typing import Optional
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import DateTime, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.database import Base
@@ -12,6 +12,7 @@ from ..core.database import Base
 
 class Translation(Base):
     __tablename__ = "translations"
+    __table_args__ = (Index("uq_translations_entity_language", "entity", "entity_id", "language", unique=True),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     entity: Mapped[str] = mapped_column(String(50), nullable=False)  # guides|templates|checklists|news
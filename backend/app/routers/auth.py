@@ -4,20 +4,21 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status, Backgrou
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from ..schemas import Token, TokenPair
+from ..schemas import RefreshRequest, Token, TokenPair
 from ..schemas.user import UserCreate, UserLogin, UserOut
 from ..services import AuthService
+from ..services.token_revocation import TokenRevocation
 from ..services.users import UserService, seed_admin_user
 from ..services.email import send_password_reset_email
-from ..core.security import create_access_token, create_refresh_token, decode_token, get_password_hash
+from ..core.security import create_access_token, create_password_reset_token, create_refresh_token, decode_token, get_password_hash
 from ..core.password_policy import validate_password_strength
 from ..core.database import get_db
 from ..core.config import get_settings
 from ..core.rate_limit import limiter
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user_record
 from ..models.user import User
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 
 router = APIRouter()
@@ -67,12 +68,42 @@ def login_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    access = create_access_token(subject=user.email, is_admin=user.is_superuser, role=getattr(user, "role", None), expires_delta=timedelta(minutes=15))
-    refresh = create_refresh_token(subject=user.email, expires_delta=timedelta(days=7))
+    return _issue_token_pair(user)
+
 
+def _issue_token_pair(user: User) -> TokenPair:
+    access = create_access_token(subject=user.email, is_admin=user.is_superuser, role=getattr(user, "role", None), expires_delta=timedelta(minutes=15))
+    refresh = create_refresh_token(subject=user.email)
     return TokenPair(access_token=access, refresh_token=refresh, expires_in=15 * 60)
 
 
+@router.post("/refresh", response_model=TokenPair)
+@limiter.limit("30/minute")
+def refresh_tokens(
+    request: Request,
+    payload: RefreshRequest,
+    db: Session = Depends(get_db),
+) -> TokenPair:
+    """
+    Exchange a refresh token for a new access/refresh pair. Refresh tokens are
+    single use: the presented one is revoked, and presenting it again fails.
+    """
+    try:
+        data = decode_token(payload.refresh_token)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    email, jti = data.get("sub"), data.get("jti")
+    if data.get("type") != "refresh" or not email or not jti:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    user = UserService.get_by_email(db, email)
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if not TokenRevocation.revoke(db, jti, email, datetime.fromtimestamp(data["exp"], tz=timezone.utc)):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token already used")
+    return _issue_token_pair(user)
+
+
 @router.post("/password/forgot")
 @limiter.limit("5/minute")
 def forgot_password(
@@ -93,8 +124,8 @@ def forgot_password(
         # Do not leak whether the user exists.
         return {"status": "ok"}
 
-    # Use a refresh‑style token with a short expiry specifically for password reset.
-    token = create_refresh_token(subject=user.email, expires_delta=timedelta(hours=1))
+    # Short-lived and scoped to password reset (it is not accepted as a refresh token).
+    token = create_password_reset_token(subject=user.email, expires_delta=timedelta(hours=1))
     background_tasks.add_task(send_password_reset_email, user.email, token)
     return {"status": "ok"}
 
@@ -109,15 +140,19 @@ def reset_password(payload: PasswordResetConfirm, db: Session = Depends(get_db))
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
 
-    email = data.get("sub")
-    if not email:
+    email, jti = data.get("sub"), data.get("jti")
+    if data.get("type") != "password_reset" or not email or not jti:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token")
 
     user = UserService.get_by_email(db, email)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token")
+    # Hash first: a shed request (503) must not use up the link, which works once
+    hashed_password = get_password_hash(payload.password)
+    if not TokenRevocation.revoke(db, jti, email, datetime.fromtimestamp(data["exp"], tz=timezone.utc)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
 
-    user.hashed_password = get_password_hash(payload.password)
+    user.hashed_password = hashed_password
     db.add(user)
     db.commit()
     return {"status": "ok"}
@@ -136,7 +171,7 @@ def seed_admin(request: Request, db: Session = Depends(get_db)) -> dict:
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 def delete_my_account(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db),
 ) -> Response:
     """
@@ -4,6 +4,8 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, Query, Request
 
+from ..core.http_cache import cached
+from ..core.projection import parse_fields
 from ..dependencies import CurrentAdmin, DBSession
 from ..schemas import ChecklistCreate, ChecklistOut, ChecklistUpdate
 from ..services import ChecklistService
@@ -12,20 +14,37 @@ from ..services import ChecklistService
 router = APIRouter()
 
 
-@router.get("/", response_model=List[ChecklistOut])
+@router.get("/", response_model=List[ChecklistOut], response_model_exclude_unset=True)
+@cached("checklists", "translations")
 def list_checklists(
     db: DBSession,
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: str | None = None,
     include_drafts: bool = False,
+    fields: str | None = Query(None, description="'summary' or comma-separated fields; omit for full rows"),
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
 ) -> list[ChecklistOut]:
+    try:
+        projection = parse_fields(fields, ChecklistOut, ChecklistService.SUMMARY_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if projection is not None or lang:
+        return ChecklistService.list_fields(db, projection or tuple(ChecklistOut.model_fields), offset=offset, limit=limit, status=status, include_drafts=include_drafts, language=lang)
     return ChecklistService.list(db, offset=offset, limit=limit, status=status, include_drafts=include_drafts)
 
 
 @router.get("/{checklist_id}", response_model=ChecklistOut)
-def get_checklist(checklist_id: str, db: DBSession) -> ChecklistOut:
-    obj = ChecklistService.get(db, checklist_id)
+@cached("checklists", "translations")
+def get_checklist(
+    checklist_id: str,
+    db: DBSession,
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
+) -> ChecklistOut:
+    if lang:
+        obj = ChecklistService.get_localized(db, checklist_id, tuple(ChecklistOut.model_fields), lang)
+    else:
+        obj = ChecklistService.get(db, checklist_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Checklist not found")
     return obj
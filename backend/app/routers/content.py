@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+from ..core.cache import etag_matches
+from ..dependencies import DBSession
+from ..services.content_bundle import LANGUAGES, ContentBundleService
+
+
+router = APIRouter()
+
+
+def _check_language(language: Optional[str]) -> None:
+    if language is not None and language not in LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Unsupported language; expected one of {', '.join(LANGUAGES)}")
+
+
+@router.get("/bundle")
+def bundle_manifest(request: Request, db: DBSession, language: Optional[str] = Query(None, max_length=8)) -> Response:
+    """
+    Manifest pointing at the current bundle. Clients poll this (cheaply, with
+    If-None-Match) and download `url` only when `version` changed.
+    """
+    _check_language(language)
+    bundle = ContentBundleService.current(db, language)
+    etag = f'"{bundle.version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    url = request.url_for("bundle_download", version=bundle.version).path
+    if language:
+        url += f"?language={language}"
+    manifest = {
+        "version": bundle.version,
+        "language": bundle.language,
+        "url": url,
+        "sections": bundle.counts,
+        "size": len(bundle.raw),
+        "size_gzip": len(bundle.gzip),
+        "size_br": len(bundle.br) if bundle.br is not None else None,
+    }
+    return JSONResponse(manifest, headers=headers)
+
+
+@router.get("/bundle/{version}", name="bundle_download")
+def bundle_download(version: str, request: Request, db: DBSession, language: Optional[str] = Query(None, max_length=8)) -> Response:
+    """Bundle bytes for one version; immutable, so clients and CDNs cache it forever."""
+    _check_language(language)
+    bundle = ContentBundleService.get_version(db, version, language)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Unknown bundle version")
+    body, encoding = bundle.encoded(request.headers.get("accept-encoding", ""))
+    # Each encoding is a different representation, so it gets its own strong ETag
+    etag = f'"{bundle.version}-{encoding}"' if encoding else f'"{bundle.version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
@@ -1,39 +1,89 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Literal
 
 from fastapi import APIRouter, HTTPException, Query, Request
 
+from ..core.http_cache import cached
+from ..core.projection import parse_fields
 from ..dependencies import CurrentAdmin, DBSession
-from ..schemas import GuideCreate, GuideOut, GuideUpdate
+from ..schemas import GuideCreate, GuideOut, GuideRenderedOut, GuideUpdate
 from ..services import GuideService
 
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[GuideOut])
+@router.get("/", response_model=List[GuideOut], response_model_exclude_unset=True)
+@cached("guides", "translations")
 def list_guides(
     db: DBSession,
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: str | None = None,
     include_drafts: bool = False,
+    fields: str | None = Query(None, description="'summary' or comma-separated fields; omit for full rows"),
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
 ) -> list[GuideOut]:
+    try:
+        projection = parse_fields(fields, GuideOut, GuideService.SUMMARY_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if projection is not None or lang:
+        return GuideService.list_fields(db, projection or tuple(GuideOut.model_fields), offset=offset, limit=limit, status=status, include_drafts=include_drafts, language=lang)
     return GuideService.list(db, offset=offset, limit=limit, status=status, include_drafts=include_drafts)
 
 
 @router.get("/{guide_id}", response_model=GuideOut)
-def get_guide(guide_id: str, db: DBSession) -> GuideOut:
-    obj = GuideService.get(db, guide_id)
+@cached("guides", "translations")
+def get_guide(
+    guide_id: str,
+    db: DBSession,
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
+) -> GuideOut:
+    if lang:
+        obj = GuideService.get_localized(db, guide_id, tuple(GuideOut.model_fields), lang)
+    else:
+        obj = GuideService.get(db, guide_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Guide not found")
     return obj
 
 
+@router.get("/{guide_id}/rendered", response_model=GuideRenderedOut, response_model_exclude_none=True)
+@cached("guides")
+def get_guide_rendered(
+    guide_id: str,
+    db: DBSession,
+    format: Literal["html", "ast", "all"] = Query("all", description="which rendered form(s) to include"),
+) -> GuideRenderedOut:
+    """Server-rendered guide body: sanitized HTML and/or a block AST with heading anchors (`ast.toc`)."""
+    obj = GuideService.get(db, guide_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Guide not found")
+    # Read-only: guides not pre-rendered yet are rendered in memory until the periodic backfill stores them
+    rendered = GuideService.rendered(obj)
+    return GuideRenderedOut(
+        id=obj.id,
+        version=obj.version,
+        content_hash=rendered.content_hash,
+        reading_minutes=rendered.reading_minutes,
+        html=rendered.html if format in ("html", "all") else None,
+        ast=rendered.ast if format in ("ast", "all") else None,
+    )
+
+
 @router.get("/slug/{slug}", response_model=GuideOut)
-def get_guide_by_slug(slug: str, db: DBSession) -> GuideOut:
-    obj = GuideService.get_by_slug(db, slug)
+@cached("guides", "translations")
+def get_guide_by_slug(
+    slug: str,
+    db: DBSession,
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
+) -> GuideOut:
+    if lang:
+        obj = GuideService.get_by_slug_localized(db, slug, tuple(GuideOut.model_fields), lang)
+    else:
+        obj = GuideService.get_by_slug(db, slug)
     if not obj:
         raise HTTPException(status_code=404, detail="Guide not found")
     return obj
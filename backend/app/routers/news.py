@@ -1,34 +1,68 @@
 from __future__ import annotations
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from ..schemas.news import NewsOut, NewsCreate, NewsUpdate
-from ..services.news_service import NewsService
+from ..schemas.news import NewsOut, NewsCreate, NewsUpdate, NewsSearchHit, NewsSearchPage
+from ..services.news_service import NewsService, NewsUrlTaken
+from ..services.news_search import NewsSearch
 from ..dependencies import get_db, CurrentAdmin
+from ..core.config import get_settings
+from ..core.http_cache import cached
 
 router = APIRouter()
 
+_news_list_adapter = TypeAdapter(List[NewsOut])
+
 @router.get("/", response_model=List[NewsOut])
-def list_news(language: Optional[str] = None, status: Optional[str] = None, include_drafts: bool = False, limit: int = 50, db: Session = Depends(get_db)):
-  return NewsService.list_news(db, language=language, limit=limit, status=status, include_drafts=include_drafts)
+@cached("news", "translations", ttl_seconds=get_settings().NEWS_CACHE_TTL_SEC)
+def list_news(language: Optional[str] = None, status: Optional[str] = None, include_drafts: bool = False, limit: int = Query(50, ge=1, le=1000), cursor: Optional[str] = None, collapse: bool = False, lang: Optional[str] = Query(None, max_length=8), db: Session = Depends(get_db)):
+  # The next page's cursor travels in X-Next-Cursor so the body stays a plain list.
+  # collapse=true lists one story per near-duplicate cluster; lang= serves approved
+  # translations (base text as fallback), unlike language=, which filters stories.
+  try:
+    rows, next_cursor = NewsService.list_news_page(db, language=language, limit=limit, status=status, include_drafts=include_drafts, cursor=cursor, collapse=collapse, lang=lang)
+  except ValueError:
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+  body = _news_list_adapter.dump_json(_news_list_adapter.validate_python(rows, from_attributes=True))
+  return Response(content=body, media_type="application/json", headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+@router.get("/search", response_model=NewsSearchPage)
+def search_news(q: str = Query(..., min_length=1, max_length=200), language: Optional[str] = None, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None, db: Session = Depends(get_db)):
+  try:
+    hits, next_cursor = NewsSearch.search(db, q, language=language, limit=limit, cursor=cursor)
+  except ValueError:
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+  items = [
+    NewsSearchHit.model_validate({**NewsOut.model_validate(h["news"]).model_dump(), "rank": h["rank"], "headline": h["headline"]})
+    for h in hits
+  ]
+  return NewsSearchPage(items=items, next_cursor=next_cursor)
 
 @router.get("/{news_id}", response_model=NewsOut)
-def get_news(news_id: str, db: Session = Depends(get_db)):
-  news = NewsService.get(db, news_id)
+@cached("news", "translations", ttl_seconds=get_settings().NEWS_CACHE_TTL_SEC)
+def get_news(news_id: str, lang: Optional[str] = Query(None, max_length=8), db: Session = Depends(get_db)):
+  news = NewsService.get_localized(db, news_id, lang) if lang else NewsService.get(db, news_id)
   if not news:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="News not found")
   return news
 
 @router.post("/", response_model=NewsOut)
 def create_news(payload: NewsCreate, _: CurrentAdmin, db: Session = Depends(get_db)):
-  return NewsService.create(db, **payload.model_dump())
+  try:
+    return NewsService.create(db, **payload.model_dump())
+  except NewsUrlTaken as exc:
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
 
 @router.put("/{news_id}", response_model=NewsOut)
 def update_news(news_id: str, payload: NewsUpdate, _: CurrentAdmin, db: Session = Depends(get_db)):
   news = NewsService.get(db, news_id)
   if not news:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="News not found")
-  return NewsService.update(db, news, **payload.model_dump(exclude_unset=True))
+  try:
+    return NewsService.update(db, news, **payload.model_dump(exclude_unset=True))
+  except NewsUrlTaken as exc:
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
 
 @router.delete("/{news_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_news(news_id: str, _: CurrentAdmin, db: Session = Depends(get_db)):
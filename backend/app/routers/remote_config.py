@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
+from ..core.http_cache import cached
 from ..dependencies import CurrentAdmin
 
 from ..schemas import RemoteConfigOut
@@ -11,6 +12,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=RemoteConfigOut)
+@cached("remote_config")
 def get_remote_config() -> RemoteConfigOut:
     return RemoteConfigOut(**RemoteConfigService.get_config())
 
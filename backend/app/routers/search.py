@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..dependencies import DBSession
+from ..schemas.search import SearchHit, SearchResults
+from ..services.content_search import ENTITIES, ContentSearch
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResults)
+def search(
+    db: DBSession,
+    q: str = Query(..., min_length=1, max_length=200),
+    language: Optional[str] = Query(None, max_length=8),
+    types: Optional[str] = Query(None, description=f"comma-separated subset of: {', '.join(ENTITIES)}"),
+    limit: int = Query(20, ge=1, le=50),
+) -> SearchResults:
+    """Ranked search across published guides, checklists, templates and glossary terms."""
+    entities = None
+    if types:
+        entities = [t.strip() for t in types.split(",") if t.strip()]
+        unknown = set(entities) - set(ENTITIES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(sorted(unknown))}")
+    started = time.perf_counter()
+    hits = ContentSearch.search(db, q, language=language, entities=entities, limit=limit)
+    items = [
+        SearchHit(entity=doc.entity, id=doc.entity_id, language=doc.language, title=doc.title, subtitle=doc.subtitle, score=round(score, 4))
+        for doc, score in hits
+    ]
+    return SearchResults(items=items, took_ms=round((time.perf_counter() - started) * 1000, 2))
@@ -11,7 +11,7 @@ import asyncio
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from ..dependencies import CurrentUser
+from ..dependencies import CurrentUser, CurrentUserRecord
 from ..core.database import db_session
 from ..models.user import User
 from ..models.subscription import Subscription, SubscriptionEvent
@@ -128,7 +128,7 @@ class CheckoutOut(BaseModel):
 
 
 @router.post("/checkout", response_model=CheckoutOut)
-def create_checkout(payload: CheckoutIn, db: DBSession, user: CurrentUser) -> CheckoutOut:
+def create_checkout(payload: CheckoutIn, db: DBSession, user: CurrentUserRecord) -> CheckoutOut:
     if payload.plan not in {"monthly", "yearly"}:
         raise HTTPException(status_code=400, detail="Invalid plan")
     try:
@@ -146,7 +146,7 @@ def create_checkout(payload: CheckoutIn, db: DBSession, user: CurrentUser) -> Ch
 
 
 @router.post("/trial", response_model=CurrentOut)
-def start_trial(db: DBSession, user: CurrentUser) -> CurrentOut:
+def start_trial(db: DBSession, user: CurrentUserRecord) -> CurrentOut:
     # Allow trial only once (if already premium/trial then reject)
     if user.subscription_status in {"trial", "premium"}:
         raise HTTPException(status_code=400, detail="Trial already used or active subscription")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..dependencies import DBSession
+from ..schemas.sync import SyncPage
+from ..services.sync import SyncService
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncPage)
+def sync(
+    db: DBSession,
+    since: Optional[str] = Query(None, description="cursor from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=2000),
+) -> SyncPage:
+    """
+    Content changed since `since`: upserts for changed rows and tombstones for
+    deleted or unpublished ones. Keep calling with the returned cursor while
+    `has_more` is true. `retry_after` says when changes written moments ago
+    become available; until then a poll returns nothing new.
+    """
+    try:
+        return SyncService.changes_since(db, since, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -4,6 +4,8 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, Query, Request
 
+from ..core.http_cache import cached
+from ..core.projection import parse_fields
 from ..dependencies import CurrentAdmin, DBSession
 from ..schemas import TemplateCreate, TemplateOut, TemplateUpdate
 from ..services import TemplateService
@@ -13,20 +15,37 @@ from ..services.audit import log_audit
 router = APIRouter()
 
 
-@router.get("/", response_model=List[TemplateOut])
+@router.get("/", response_model=List[TemplateOut], response_model_exclude_unset=True)
+@cached("templates", "translations")
 def list_templates(
     db: DBSession,
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: str | None = None,
     include_drafts: bool = False,
+    fields: str | None = Query(None, description="'summary' or comma-separated fields; omit for full rows"),
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
 ) -> list[TemplateOut]:
+    try:
+        projection = parse_fields(fields, TemplateOut, TemplateService.SUMMARY_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if projection is not None or lang:
+        return TemplateService.list_fields(db, projection or tuple(TemplateOut.model_fields), offset=offset, limit=limit, status=status, include_drafts=include_drafts, language=lang)
     return TemplateService.list(db, offset=offset, limit=limit, status=status, include_drafts=include_drafts)
 
 
 @router.get("/{template_id}", response_model=TemplateOut)
-def get_template(template_id: str, db: DBSession) -> TemplateOut:
-    obj = TemplateService.get(db, template_id)
+@cached("templates", "translations")
+def get_template(
+    template_id: str,
+    db: DBSession,
+    lang: str | None = Query(None, max_length=8, description="Serve approved translations in this language, falling back to the base text"),
+) -> TemplateOut:
+    if lang:
+        obj = TemplateService.get_localized(db, template_id, tuple(TemplateOut.model_fields), lang)
+    else:
+        obj = TemplateService.get(db, template_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Template not found")
     return obj
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Literal, Optional
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from ..core.cache import bump_version
+from ..core.http_cache import cached
 from ..dependencies import DBSession, CurrentUser, require_roles, CurrentAdmin
 from ..models.translation import Translation
 from ..models.glossary import GlossaryTerm
+from ..schemas.translation import (
+    CoverageItems,
+    GlossarySuggestion,
+    TranslationBatchIn,
+    TranslationCoverage,
+    TranslationSuggestion,
+    TranslationSuggestions,
+)
+from ..services.glossary_index import GlossaryIndex
+from ..services.translation_memory import TranslationMemory
+from ..services.translations import COVERAGE_ENTITIES, COVERAGE_LANGUAGES, TranslationService
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Dict])
+@cached("translations")
 def list_translations(
     db: DBSession,
     entity: Optional[str] = None,
@@ -43,6 +58,7 @@ def list_translations(
 
 
 @router.get("/glossary", response_model=List[Dict])
+@cached("glossary_terms")
 def list_glossary(db: DBSession, q: Optional[str] = None, limit: int = 200) -> List[Dict]:
     query = db.query(GlossaryTerm)
     if q:
@@ -55,6 +71,84 @@ def list_glossary(db: DBSession, q: Optional[str] = None, limit: int = 200) -> L
     ]
 
 
+def _coverage_languages(languages: Optional[str]) -> List[str]:
+    if not languages:
+        return list(COVERAGE_LANGUAGES)
+    parsed = list(dict.fromkeys(lang.strip() for lang in languages.split(",") if lang.strip()))
+    if not parsed or len(parsed) > 10 or any(len(lang) > 8 for lang in parsed):
+        raise HTTPException(status_code=400, detail="languages must list 1-10 language codes")
+    return parsed
+
+
+# Not @cached: the response cache answers before dependencies run, which would
+# skip the role check. TranslationService caches the computation instead.
+@router.get("/coverage", response_model=TranslationCoverage, dependencies=[require_roles("translator", "editor")])
+def translation_coverage(
+    db: DBSession,
+    languages: Optional[str] = Query(None, max_length=100, description="comma-separated; default uk,ru,en"),
+) -> TranslationCoverage:
+    """Approved/pending/rejected/missing translation counts of published content per entity and language."""
+    return TranslationCoverage(**TranslationService.coverage(db, _coverage_languages(languages)))
+
+
+@router.get("/coverage/{entity}", response_model=CoverageItems, dependencies=[require_roles("translator", "editor")])
+def translation_coverage_items(
+    entity: str,
+    db: DBSession,
+    languages: Optional[str] = Query(None, max_length=100, description="comma-separated; default uk,ru,en"),
+    language: Optional[str] = Query(None, max_length=8),
+    status: Optional[Literal["approved", "pending", "rejected", "missing"]] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+) -> CoverageItems:
+    """Per-row drill-down of /coverage; `language` + `status` filter e.g. guides missing a ru translation."""
+    if entity not in COVERAGE_ENTITIES:
+        raise HTTPException(status_code=404, detail="Unknown entity")
+    if status and not language:
+        raise HTTPException(status_code=400, detail="status filter requires language")
+    items = TranslationService.coverage_items(
+        db, entity, _coverage_languages(languages), language=language, status=status, limit=limit, offset=offset
+    )
+    return CoverageItems(entity=entity, items=items)
+
+
+@router.get("/glossary/suggest", response_model=List[GlossarySuggestion])
+@cached("glossary_terms")
+def suggest_glossary(
+    db: DBSession,
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+) -> List[GlossarySuggestion]:
+    """Autocomplete over glossary terms and their uk/ru/en translations."""
+    return [GlossarySuggestion(**entry, matched=field) for entry, field in GlossaryIndex.suggest(db, prefix, limit)]
+
+
+@router.get("/suggest", response_model=TranslationSuggestions, dependencies=[require_roles("translator", "editor")])
+def suggest_translations(
+    db: DBSession,
+    q: str = Query(..., min_length=1, max_length=1000, description="source segment to translate"),
+    language: str = Query(..., max_length=8),
+    limit: int = Query(5, ge=1, le=20),
+    min_score: float = Query(0.5, ge=0.1, le=1.0),
+) -> TranslationSuggestions:
+    """Translation-memory matches: approved translations of similar source sentences."""
+    started = time.perf_counter()
+    matches = TranslationMemory.suggest(db, q, language, limit=limit, min_score=min_score)
+    items = [
+        TranslationSuggestion(
+            source=seg.source,
+            target=seg.target,
+            score=round(score, 4),
+            entity=seg.entity,
+            entity_id=seg.entity_id,
+            translation_id=seg.translation_id,
+            field=seg.field,
+        )
+        for seg, score in matches
+    ]
+    return TranslationSuggestions(items=items, took_ms=round((time.perf_counter() - started) * 1000, 2))
+
+
 @router.post("/", response_model=Dict, dependencies=[require_roles("translator", "editor")])
 def create_or_update_translation(payload: Dict, db: DBSession, user: CurrentUser) -> Dict:
     entity = payload.get("entity")
@@ -82,10 +176,17 @@ def create_or_update_translation(payload: Dict, db: DBSession, user: CurrentUser
         row = Translation(entity=entity, entity_id=entity_id, language=language, author_email=user.email, **fields)
         db.add(row)
     db.commit()
+    bump_version("translations")
     db.refresh(row)
     return {"id": row.id}
 
 
+@router.post("/batch", response_model=Dict, dependencies=[require_roles("translator", "editor")])
+def upsert_translations_batch(payload: TranslationBatchIn, db: DBSession, user: CurrentUser) -> Dict:
+    """Create or update up to 1000 translations in one transaction (same field rules as POST /)."""
+    return TranslationService.upsert_many(db, payload.items, user.email)
+
+
 @router.post("/{translation_id}/approve", dependencies=[require_roles("editor")])
 def approve_translation(translation_id: str, db: DBSession) -> Dict:
     row = db.query(Translation).filter(Translation.id == translation_id).first()
@@ -94,6 +195,7 @@ def approve_translation(translation_id: str, db: DBSession) -> Dict:
     row.status = "approved"
     db.add(row)
     db.commit()
+    bump_version("translations")
     return {"ok": True}
 
 
@@ -108,6 +210,7 @@ def create_glossary_term(payload: Dict, db: DBSession) -> Dict:
     )
     db.add(term)
     db.commit()
+    bump_version("glossary_terms")
     db.refresh(term)
     return {"id": term.id}
 
@@ -119,6 +222,7 @@ def delete_glossary_term(term_id: str, db: DBSession) -> Dict:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(t)
     db.commit()
+    bump_version("glossary_terms")
     return {"ok": True}
 
 
@@ -1,8 +1,8 @@
-from .guide import GuideCreate, GuideUpdate, GuideOut
+from .guide import GuideCreate, GuideUpdate, GuideOut, GuideRenderedOut
 from .checklist import ChecklistCreate, ChecklistUpdate, ChecklistOut
 from .template import TemplateCreate, TemplateUpdate, TemplateOut
 from .appointment import AppointmentCreate, AppointmentUpdate, AppointmentOut
-from .security import Token, TokenPair
+from .security import RefreshRequest, Token, TokenPair
 from .user import UserCreate, UserLogin, UserOut
 from .remote_config import RemoteConfigOut
 
@@ -10,6 +10,7 @@ __all__ = [
     "GuideCreate",
     "GuideUpdate",
     "GuideOut",
+    "GuideRenderedOut",
     "ChecklistCreate",
     "ChecklistUpdate",
     "ChecklistOut",
@@ -21,6 +22,7 @@ __all__ = [
     "AppointmentOut",
     "Token",
     "TokenPair",
+    "RefreshRequest",
     "UserCreate",
     "UserLogin",
     "UserOut",
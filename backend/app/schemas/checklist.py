@@ -27,5 +27,7 @@ class ChecklistUpdate(BaseModel):
 class ChecklistOut(ChecklistBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
+    # Set only on `lang=` reads: whether an approved translation was applied
+    translated: Optional[bool] = None
 
 
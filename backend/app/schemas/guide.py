@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -34,5 +34,22 @@ class GuideUpdate(BaseModel):
 class GuideOut(GuideBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
+    reading_minutes: Optional[int] = None
+    # Glossary mentions as [start, end, glossary term id] offsets into `content`;
+    # null when a translation replaced the content
+    term_spans: Optional[List[List[Any]]] = None
+    # Set only on `lang=` reads: whether an approved translation was applied
+    translated: Optional[bool] = None
+
+
+class GuideRenderedOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    version: int
+    content_hash: str
+    reading_minutes: int
+    # Omitted unless requested via `format`
+    html: Optional[str] = None
+    ast: Optional[Dict[str, Any]] = None
 
 
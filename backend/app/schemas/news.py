@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -27,20 +27,37 @@ class NewsUpdate(BaseModel):
     title: Optional[str] = None
     summary: Optional[str] = None
     content: Optional[str] = None
-    url: Optional[HttpUrl] = None
+    url: Optional[str] = None
     source: Optional[str] = None
     language: Optional[str] = None
     status: Optional[str] = None
     published_at: Optional[datetime] = None
-    image_url: Optional[HttpUrl] = None
+    image_url: Optional[str] = None
 
 
 class NewsOut(NewsBase):
     id: str
+    # Canonical story of this item's near-duplicate cluster (its own id for canonical items)
+    cluster_id: Optional[str] = None
+    # Glossary mentions as [start, end, glossary term id] offsets into `content`;
+    # null when a translation replaced the content
+    term_spans: Optional[List[List[Any]]] = None
     created_at: datetime
     updated_at: datetime
+    # Set only on `lang=` reads: whether an approved translation was applied
+    translated: Optional[bool] = None
 
     class Config:
         from_attributes = True
 
 
+
+class NewsSearchHit(NewsOut):
+    rank: float
+    # Matching fragment with terms wrapped in <mark>…</mark>
+    headline: Optional[str] = None
+
+
+class NewsSearchPage(BaseModel):
+    items: List[NewsSearchHit]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    entity: str
+    id: str
+    language: Optional[str] = None
+    title: str
+    subtitle: Optional[str] = None
+    score: float
+
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+    took_ms: float
@@ -15,3 +15,7 @@ class TokenPair(BaseModel):
     expires_in: int | None = None
 
 
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SyncPage(BaseModel):
+    # entity table name -> current representation of rows changed since the cursor
+    upserts: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    # entity table name -> ids deleted (or no longer published) since the cursor
+    deletes: Dict[str, List[str]] = Field(default_factory=dict)
+    cursor: str
+    has_more: bool = False
+    # Set when newer changes exist but are still settling: seconds until they can be served
+    retry_after: Optional[int] = None
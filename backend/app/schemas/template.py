@@ -25,5 +25,7 @@ class TemplateUpdate(BaseModel):
 class TemplateOut(TemplateBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
-
-
+    # Always present on full rows; omitted by summary projections
+    content: Optional[str] = None
+    # Set only on `lang=` reads: whether an approved translation was applied
+    translated: Optional[bool] = None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class TranslationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    entity: str
+    entity_id: str
+    language: str
+    status: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    content: Optional[str] = None
+    updated_at: datetime
+
+
+class TranslationUpsert(BaseModel):
+    entity: str = Field(..., max_length=50)
+    entity_id: str = Field(..., max_length=64)
+    language: str = Field(..., max_length=8)
+    # Omitted fields keep their stored values on update
+    status: Optional[Literal["pending", "approved", "rejected"]] = None
+    title: Optional[str] = Field(None, max_length=255)
+    description: Optional[str] = Field(None, max_length=500)
+    content: Optional[str] = None
+
+
+class TranslationBatchIn(BaseModel):
+    items: List[TranslationUpsert] = Field(..., min_length=1, max_length=1000)
+
+
+class TranslationSuggestion(BaseModel):
+    source: str
+    target: str
+    score: float
+    entity: str
+    entity_id: str
+    translation_id: str
+    field: str
+
+
+class TranslationSuggestions(BaseModel):
+    items: List[TranslationSuggestion]
+    took_ms: float
+
+
+class CoverageCell(BaseModel):
+    approved: int
+    pending: int
+    rejected: int
+    missing: int
+    # approved / total
+    ratio: float
+
+
+class EntityCoverage(BaseModel):
+    total: int
+    languages: Dict[str, CoverageCell]
+
+
+class TranslationCoverage(BaseModel):
+    languages: List[str]
+    entities: Dict[str, EntityCoverage]
+
+
+class CoverageItem(BaseModel):
+    id: str
+    title: str
+    # language -> approved | pending | rejected | missing
+    languages: Dict[str, str]
+
+
+class CoverageItems(BaseModel):
+    entity: str
+    items: List[CoverageItem]
+
+
+class GlossaryTermOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    term: str
+    uk: Optional[str] = None
+    ru: Optional[str] = None
+    en: Optional[str] = None
+    description: Optional[str] = None
+
+
+class GlossarySuggestion(GlossaryTermOut):
+    # Which field the prefix matched: term, uk, ru or en
+    matched: str
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+"""
+Readability-style extraction of the main article body from an HTML page.
+
+Parsing and scoring are CPU-bound, so importers submit pages through
+`submit_extraction`, which runs `extract_article` in a small process pool.
+The number of in-flight pages is bounded: a submitter blocks once the pool is
+saturated instead of queueing unbounded HTML in memory.
+
+This module only depends on the standard library so pool workers stay cheap.
+They are started by a fork server: the pool is created lazily from a
+threaded process (importer threads, the DB pool), which a plain fork would
+copy mid-lock. A pool that lost a worker is broken for good; it is dropped
+and the next submission starts a fresh one.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import html as _html
+from html.parser import HTMLParser
+import multiprocessing
+import re
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+
+# Subtrees that never contain article text
+DROP_TAGS = {
+  "script", "style", "noscript", "template", "iframe", "svg", "canvas", "object", "embed",
+  "form", "button", "input", "select", "textarea", "nav", "footer", "header", "aside",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+# Tags kept in the cleaned output; everything else is unwrapped to its children
+KEEP_TAGS = {
+  "p", "h2", "h3", "h4", "ul", "ol", "li", "blockquote", "pre", "code", "strong", "em", "b", "i",
+  "a", "img", "br", "figure", "figcaption", "table", "thead", "tbody", "tr", "th", "td",
+}
+HEADING_MAP = {"h1": "h2", "h5": "h4", "h6": "h4"}
+# Elements whose whitespace-only text is significant (it separates inline runs)
+TEXT_CONTAINERS = {"p", "li", "td", "th", "figcaption", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6", "a", "strong", "em", "b", "i", "code", "span"}
+# Tags that implicitly close an open element of the same kind
+SELF_NESTING = {"p", "li", "td", "th", "tr", "option"}
+
+POSITIVE_RE = re.compile(r"article|body|content|entry|main|page|post|text|story|blog", re.I)
+NEGATIVE_RE = re.compile(
+  r"comment|footer|sidebar|share|social|promo|related|sponsor|ad-|ads|banner|nav|menu|widget|subscribe|cookie|popup|breadcrumb|meta|author|tags",
+  re.I,
+)
+TAG_BASE_SCORE = {
+  "article": 10, "div": 5, "main": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+  "ol": -3, "ul": -3, "li": -3, "dl": -3, "dd": -3, "dt": -3,
+  "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+PARAGRAPH_TAGS = {"p", "pre", "td", "blockquote"}
+MIN_PARAGRAPH_CHARS = 25
+MIN_ARTICLE_CHARS = 200
+
+_WS_RE = re.compile(r"\s+")
+
+
+class _Node:
+  __slots__ = ("tag", "attrs", "children", "parent", "score", "text_len", "link_len")
+
+  def __init__(self, tag: str, attrs: dict, parent: Optional["_Node"]) -> None:
+    self.tag = tag
+    self.attrs = attrs
+    self.children: List[Union["_Node", str]] = []
+    self.parent = parent
+    self.score: Optional[float] = None
+    self.text_len = 0
+    self.link_len = 0
+
+
+class _TreeBuilder(HTMLParser):
+  """Builds a lenient element tree, skipping non-content subtrees."""
+
+  def __init__(self) -> None:
+    super().__init__(convert_charrefs=True)
+    self.root = _Node("#root", {}, None)
+    self._stack = [self.root]
+    self._skip_tag: Optional[str] = None
+    self._skip_depth = 0
+
+  def handle_starttag(self, tag, attrs):
+    if self._skip_tag is not None:
+      if tag == self._skip_tag:
+        self._skip_depth += 1
+      return
+    if tag in DROP_TAGS:
+      if tag not in VOID_TAGS:
+        self._skip_tag, self._skip_depth = tag, 1
+      return
+    if tag in SELF_NESTING and self._stack[-1].tag == tag:
+      self._stack.pop()
+    parent = self._stack[-1]
+    node = _Node(tag, {k: v for k, v in attrs if v is not None}, parent)
+    parent.children.append(node)
+    if tag not in VOID_TAGS:
+      self._stack.append(node)
+
+  def handle_startendtag(self, tag, attrs):
+    if self._skip_tag is not None or tag in DROP_TAGS:
+      return
+    self.handle_starttag(tag, attrs)
+    if tag not in VOID_TAGS:
+      self._stack.pop()
+
+  def handle_endtag(self, tag):
+    if self._skip_tag is not None:
+      if tag == self._skip_tag:
+        self._skip_depth -= 1
+        if self._skip_depth == 0:
+          self._skip_tag = None
+      return
+    # Close up to the matching element; stray end tags are ignored
+    for i in range(len(self._stack) - 1, 0, -1):
+      if self._stack[i].tag == tag:
+        del self._stack[i:]
+        return
+
+  def handle_data(self, data):
+    if self._skip_tag is None and data:
+      self._stack[-1].children.append(data)
+
+
+def _measure(node: _Node) -> None:
+  # Post-order text and link-text lengths, iterative to survive very deep markup
+  order: List[_Node] = []
+  todo = [node]
+  while todo:
+    n = todo.pop()
+    order.append(n)
+    todo.extend(c for c in n.children if isinstance(c, _Node))
+  for n in reversed(order):
+    text_len = link_len = 0
+    for c in n.children:
+      if isinstance(c, str):
+        text_len += len(c.strip())
+      else:
+        text_len += c.text_len
+        link_len += c.text_len if c.tag == "a" else c.link_len
+    n.text_len, n.link_len = text_len, link_len
+
+
+def _text(node: _Node) -> str:
+  parts: List[str] = []
+  todo: List[Union[_Node, str]] = [node]
+  while todo:
+    n = todo.pop()
+    if isinstance(n, str):
+      parts.append(n)
+    else:
+      todo.extend(reversed(n.children))
+  return _WS_RE.sub(" ", "".join(parts)).strip()
+
+
+def _class_weight(node: _Node) -> int:
+  weight = 0
+  for attr in ("class", "id"):
+    value = node.attrs.get(attr)
+    if value:
+      if NEGATIVE_RE.search(value):
+        weight -= 25
+      if POSITIVE_RE.search(value):
+        weight += 25
+  return weight
+
+
+def _init_score(node: _Node) -> None:
+  if node.score is None:
+    node.score = float(TAG_BASE_SCORE.get(node.tag, 0) + _class_weight(node))
+
+
+def _link_density(node: _Node) -> float:
+  return node.link_len / node.text_len if node.text_len else 0.0
+
+
+def _candidates(root: _Node) -> List[_Node]:
+  scored: List[_Node] = []
+  todo = [root]
+  while todo:
+    n = todo.pop()
+    todo.extend(c for c in n.children if isinstance(c, _Node))
+    if n.tag not in PARAGRAPH_TAGS or n.text_len < MIN_PARAGRAPH_CHARS:
+      continue
+    text = _text(n)
+    points = 1 + text.count(",") + min(len(text) // 100, 3)
+    parent = n.parent
+    if parent is None or parent.tag == "#root":
+      continue
+    _init_score(parent)
+    parent.score += points
+    scored.append(parent)
+    grandparent = parent.parent
+    if grandparent is not None and grandparent.tag != "#root":
+      _init_score(grandparent)
+      grandparent.score += points / 2
+      scored.append(grandparent)
+  return list({id(n): n for n in scored}.values())
+
+
+def _serialize(node: _Node, base_url: Optional[str], out: List[str]) -> None:
+  for child in node.children:
+    if isinstance(child, str):
+      if not child.strip() and node.tag not in TEXT_CONTAINERS:
+        continue
+      out.append(_html.escape(_WS_RE.sub(" ", child), quote=False))
+      continue
+    tag = HEADING_MAP.get(child.tag, child.tag)
+    if tag not in KEEP_TAGS:
+      _serialize(child, base_url, out)
+      continue
+    attrs = ""
+    if tag == "a":
+      href = child.attrs.get("href")
+      if href and base_url:
+        href = urljoin(base_url, href)
+      if href and href.startswith(("http://", "https://")):
+        attrs = f' href="{_html.escape(href)}"'
+    elif tag == "img":
+      src = child.attrs.get("src") or child.attrs.get("data-src")
+      if src and base_url:
+        src = urljoin(base_url, src)
+      if not src or not src.startswith(("http://", "https://")):
+        continue
+      attrs = f' src="{_html.escape(src)}"'
+      if child.attrs.get("alt"):
+        attrs += f' alt="{_html.escape(child.attrs["alt"])}"'
+    if tag in VOID_TAGS:
+      out.append(f"<{tag}{attrs}>")
+      continue
+    inner: List[str] = []
+    _serialize(child, base_url, inner)
+    body = "".join(inner).strip()
+    if body or tag in {"td", "th"}:
+      out.append(f"<{tag}{attrs}>{body}</{tag}>")
+
+
+def extract_article(html: str, base_url: Optional[str] = None) -> Optional[str]:
+  """
+  Return the cleaned main-content HTML of `html`, or None when no block of
+  text looks like an article (index pages, paywalls, empty documents).
+  """
+  builder = _TreeBuilder()
+  try:
+    builder.feed(html)
+    builder.close()
+  except Exception:
+    return None
+  root = builder.root
+  _measure(root)
+
+  candidates = _candidates(root)
+  if not candidates:
+    return None
+  for c in candidates:
+    c.score *= 1 - _link_density(c)
+  top = max(candidates, key=lambda c: c.score)
+
+  # Pull in siblings that belong to the same article (split bodies, lead paragraphs)
+  blocks: List[_Node] = [top]
+  if top.parent is not None:
+    threshold = max(10.0, top.score * 0.2)
+    blocks = []
+    for sibling in top.parent.children:
+      if not isinstance(sibling, _Node):
+        continue
+      if sibling is top or (sibling.score is not None and sibling.score >= threshold):
+        blocks.append(sibling)
+      elif sibling.tag == "p" and sibling.text_len > 80 and _link_density(sibling) < 0.25:
+        blocks.append(sibling)
+
+  out: List[str] = []
+  text_len = 0
+  for block in blocks:
+    holder = _Node("#root", {}, None)
+    holder.children = [block]
+    _serialize(holder, base_url, out)
+    text_len += block.text_len
+  if text_len < MIN_ARTICLE_CHARS:
+    return None
+  return "".join(out) or None
+
+
+def extract_article_timed(html: str, base_url: Optional[str] = None) -> Tuple[Optional[str], int]:
+  """Pool entry point: also returns the time spent in the worker, in ms."""
+  started = time.perf_counter()
+  content = extract_article(html, base_url)
+  return content, int((time.perf_counter() - started) * 1000)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_slots: Optional[threading.BoundedSemaphore] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+  global _pool, _pool_slots
+  with _pool_lock:
+    if _pool is None:
+      from ..core.config import get_settings
+
+      settings = get_settings()
+      _pool = ProcessPoolExecutor(max_workers=settings.ARTICLE_EXTRACT_WORKERS, mp_context=multiprocessing.get_context("forkserver"))
+      if _pool_slots is None:
+        _pool_slots = threading.BoundedSemaphore(settings.ARTICLE_EXTRACT_MAX_PENDING)
+    return _pool, _pool_slots
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+  global _pool
+  with _pool_lock:
+    if _pool is broken:
+      _pool = None
+  broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_extraction(html: str, base_url: Optional[str] = None) -> "Future[Tuple[Optional[str], int]]":
+  """
+  Queue a page for extraction in the process pool. Blocks the calling
+  (worker) thread while the pool already holds its maximum of pending pages.
+  """
+  pool, slots = _get_pool()
+  slots.acquire()
+  try:
+    try:
+      future = pool.submit(extract_article_timed, html, base_url)
+    except BrokenProcessPool:
+      _discard_pool(pool)
+      pool, _ = _get_pool()
+      future = pool.submit(extract_article_timed, html, base_url)
+  except Exception:
+    slots.release()
+    raise
+
+  def _done(done: Future) -> None:
+    slots.release()
+    # This page is lost, but the next one goes to a fresh pool
+    if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+      _discard_pool(pool)
+
+  future.add_done_callback(_done)
+  return future
+
+
+def shutdown_extraction_pool() -> None:
+  global _pool, _pool_slots
+  with _pool_lock:
+    if _pool is not None:
+      _pool.shutdown(wait=False, cancel_futures=True)
+    _pool, _pool_slots = None, None
@@ -1,21 +1,40 @@
 from __future__ import annotations
 
 from datetime import timedelta
+import hashlib
+import hmac
+from typing import Optional, Tuple
 
 from ..core.config import get_settings
 from ..core.security import create_access_token, get_password_hash, verify_password
 
 
+# (sha256 of the configured password, its bcrypt hash)
+_admin_hash: Optional[Tuple[bytes, str]] = None
+
+
+def _admin_password_hash(password: str) -> str:
+    # Hashed once per process (and again only if the configured password
+    # changes). Keyed by a digest, so the cache does not hold the plaintext.
+    global _admin_hash
+    key = hashlib.sha256(password.encode("utf-8")).digest()
+    cached = _admin_hash
+    if cached is not None and hmac.compare_digest(cached[0], key):
+        return cached[1]
+    hashed = get_password_hash(password)
+    _admin_hash = (key, hashed)
+    return hashed
+
+
 class AuthService:
     @staticmethod
     def authenticate_admin(email: str, password: str) -> str | None:
         settings = get_settings()
 
-        # Hash on first use to avoid storing plain admin password anywhere else
-        hashed = get_password_hash(settings.ADMIN_PASSWORD)
         if email.lower() != settings.ADMIN_EMAIL.lower():
             return None
-        if not verify_password(password, hashed):
+        # Avoid storing the plain admin password anywhere else
+        if not verify_password(password, _admin_password_hash(settings.ADMIN_PASSWORD)):
             return None
 
         token = create_access_token(
@@ -24,5 +43,3 @@ class AuthService:
             expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
         )
         return token
-
-
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+"""
+Chunked upsert imports for admin content.
+
+Records are normalized one at a time and written in chunks with a single
+INSERT ... ON CONFLICT DO UPDATE per chunk: guides are keyed by slug, news
+by url, templates and checklists by id. A key that already exists updates
+that row instead of failing the batch. Each chunk commits on its own. If a
+chunk is rejected, its rows are retried one by one so the error report can
+name the offending lines. Imported news stories are left unclustered (NULL
+cluster_id, listed as their own story) for the background backfill job, as
+per-row near-duplicate lookups would dominate a large import; a story whose
+url already exists leaves its old cluster first, since its text may change.
+
+`ndjson_lines` splits a request body into lines as it arrives. With it, an
+import holds at most one chunk in memory, however large the upload.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import re
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Literal, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..core.cache import bump_version
+from ..core.config import get_settings
+from ..core.database import upsert_insert
+from ..core.logging import get_logger
+from ..models import Checklist, Guide, Template
+from ..models.content_change import record_changes
+from ..models.news import News
+from ..schemas import ChecklistCreate, GuideCreate, TemplateCreate
+from .markdown_render import render
+from .news_dedup import NewsDedup
+
+
+log = get_logger(module="bulk_import")
+
+ImportKind = Literal["guides", "templates", "checklists", "news"]
+
+MAX_REPORTED_ERRORS = 100
+# Columns an upsert never overwrites on an existing row
+_IMMUTABLE = ("id", "created_at")
+
+
+def _slugify(s: str) -> str:
+    s = s.lower()
+    s = re.sub(r"[^a-z0-9\s-]", "", s)
+    s = re.sub(r"[\s-]+", "-", s).strip("-")
+    return s or "guide"
+
+
+def _row_id(raw: Dict[str, Any]) -> str:
+    value = raw.get("id")
+    if value is None:
+        return str(uuid4())
+    if not isinstance(value, str) or not 0 < len(value) <= 36:
+        raise ValueError("id must be a string of at most 36 characters")
+    return value
+
+
+def guide_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        # Backend shape first
+        data = GuideCreate(**raw)
+        values = data.model_dump(exclude={"status"})
+        values["status"] = data.status or "published"
+    except Exception:
+        # Fallback to the iOS seed shape
+        title = raw.get("title") or raw.get("name") or "Untitled"
+        values = {
+            "title": title,
+            "slug": raw.get("slug") or _slugify(title),
+            "description": raw.get("subtitle") or raw.get("description"),
+            "content": raw.get("bodyMarkdown") or raw.get("content"),
+            "category": raw.get("category") or "documents",
+            "image_url": raw.get("heroImage") or raw.get("image_url"),
+            "is_published": bool(raw.get("is_published", True)),
+            "status": "published",
+            "version": int(raw.get("version", 1)),
+        }
+    rendered = render(values["content"])
+    values.update(
+        id=str(uuid4()),
+        content_html=rendered.html,
+        content_ast=rendered.ast,
+        content_hash=rendered.content_hash,
+        reading_minutes=rendered.reading_minutes,
+        # An update replaces the content, so old offsets must go; the periodic
+        # glossary backfill annotates rows without a version
+        term_spans=None,
+        term_spans_version=None,
+    )
+    return values
+
+
+def template_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        data = TemplateCreate(**raw)
+        name, category, content, status = data.name, data.category, data.content, data.status
+    except Exception:
+        name = raw.get("name") or raw.get("title") or "Untitled"
+        category = raw.get("category") or "general"
+        content = raw.get("content") or ""
+        status = None
+    return {"id": _row_id(raw), "name": name, "category": category, "content": content, "status": status or "published"}
+
+
+def checklist_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        data = ChecklistCreate(**raw)
+        title, description, items, is_published, status = data.title, data.description, data.items, data.is_published, data.status
+    except Exception:
+        title = raw.get("title") or "Checklist"
+        description = raw.get("description") or ""
+        # iOS shape: steps: [{ title: ... }]
+        if isinstance(raw.get("steps"), list):
+            items = [str(step.get("title") or step.get("description") or "Step") for step in raw["steps"]]
+        else:
+            items = raw.get("items") or []
+        is_published = bool(raw.get("is_published", True))
+        status = None
+    return {
+        "id": _row_id(raw),
+        "title": title,
+        "description": description,
+        "items": items,
+        "is_published": is_published,
+        "status": status or "published",
+    }
+
+
+def news_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    url = raw.get("url")
+    if not url or not isinstance(url, str):
+        raise ValueError("url is required")
+    published_at = raw.get("published_at") or raw.get("date")
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid4()),
+        "title": raw.get("title") or "Untitled",
+        "summary": raw.get("summary") or "",
+        "content": raw.get("content"),
+        "url": url,
+        "source": raw.get("source") or "Sweezy",
+        "language": raw.get("language") or "uk",
+        "status": raw.get("status") or "published",
+        "published_at": datetime.fromisoformat(published_at) if isinstance(published_at, str) else now,
+        "image_url": raw.get("image_url"),
+        # Annotated by the periodic glossary backfill, as in guide_row
+        "term_spans": None,
+        "term_spans_version": None,
+        # Fingerprinted and clustered by the periodic dedup backfill
+        "simhash": None,
+        "cluster_id": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+@dataclass(frozen=True)
+class _Spec:
+    model: Any
+    key: str
+    build: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+_SPECS: Dict[str, _Spec] = {
+    "guides": _Spec(Guide, "slug", guide_row),
+    "templates": _Spec(Template, "id", template_row),
+    "checklists": _Spec(Checklist, "id", checklist_row),
+    "news": _Spec(News, "url", news_row),
+}
+
+
+def _describe(exc: Exception) -> str:
+    # DB errors carry the statement and parameters; the driver message is enough
+    message = str(getattr(exc, "orig", None) or exc)
+    return f"{type(exc).__name__}: {message}"[:300]
+
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def fail(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class BulkImporter:
+    """
+    Feed records with `add`/`add_line`; whenever one returns True, call
+    `flush` before adding more. `finish` writes the remainder. Lines are
+    1-based positions in the input, used in the error report.
+    """
+
+    def __init__(self, db: Session, kind: ImportKind, chunk_size: Optional[int] = None) -> None:
+        self.db = db
+        self.kind = kind
+        self.spec = _SPECS[kind]
+        self.chunk_size = max(1, chunk_size or get_settings().IMPORT_CHUNK_SIZE)
+        self.report = ImportReport()
+        self._pending: Dict[Any, Tuple[int, Dict[str, Any]]] = {}
+        # A row whose key is already pending: ON CONFLICT cannot touch one row
+        # twice in a statement, so it waits for the next chunk and wins.
+        self._carry: Optional[Tuple[int, Dict[str, Any]]] = None
+
+    def add(self, line: int, raw: Any) -> bool:
+        self.report.received += 1
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError("expected a JSON object")
+            row = self.spec.build(raw)
+        except Exception as exc:
+            self.report.fail(line, _describe(exc))
+            return False
+        key = row[self.spec.key]
+        if key in self._pending:
+            self._carry = (line, row)
+            return True
+        self._pending[key] = (line, row)
+        return len(self._pending) >= self.chunk_size
+
+    def add_line(self, line: int, data: Optional[bytes]) -> bool:
+        """Add one NDJSON line; `data` is None for a line that exceeded the size limit."""
+        if data is None:
+            self.report.received += 1
+            self.report.fail(line, "line too long")
+            return False
+        if not data.strip():
+            return False
+        try:
+            raw = json.loads(data)
+        except ValueError as exc:
+            self.report.received += 1
+            self.report.fail(line, f"invalid JSON: {exc}")
+            return False
+        return self.add(line, raw)
+
+    def flush(self) -> None:
+        batch = list(self._pending.values())
+        self._pending.clear()
+        if self._carry is not None:
+            line, row = self._carry
+            self._pending[row[self.spec.key]] = (line, row)
+            self._carry = None
+        if not batch:
+            return
+        try:
+            created = self._write([row for _, row in batch])
+            self.db.commit()
+            self.report.created += created
+            self.report.updated += len(batch) - created
+        except Exception:
+            self.db.rollback()
+            # Isolate the rows the database rejected
+            for line, row in batch:
+                try:
+                    created = self._write([row])
+                    self.db.commit()
+                except Exception as exc:
+                    self.db.rollback()
+                    self.report.fail(line, _describe(exc))
+                    continue
+                self.report.created += created
+                self.report.updated += 1 - created
+        bump_version(self.spec.model.__tablename__)
+
+    def finish(self) -> ImportReport:
+        while self._pending:
+            self.flush()
+        log.info("bulk_import_finished", kind=self.kind, **{k: v for k, v in self.report.as_dict().items() if k != "errors"})
+        return self.report
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """Upsert one chunk in the current transaction. Returns how many rows were new."""
+        model, key = self.spec.model, self.spec.key
+        key_column = getattr(model, key)
+        existing = dict(self.db.execute(select(key_column, model.id).where(key_column.in_([r[key] for r in rows]))).all())
+        for row in rows:
+            if row[key] in existing:
+                row["id"] = existing[row[key]]
+        if model is News and existing:
+            NewsDedup.detach_many(self.db, existing.values())
+            self.db.flush()
+        self._upsert(rows, existing)
+        record_changes(self.db, model.__tablename__, [row["id"] for row in rows])
+        return len(rows) - sum(1 for row in rows if row[key] in existing)
+
+    def _upsert(self, rows: List[Dict[str, Any]], existing: Dict[Any, str]) -> None:
+        model, key = self.spec.model, self.spec.key
+        stmt = upsert_insert(self.db, model.__table__)
+        if stmt is not None:
+            set_ = {c: stmt.excluded[c] for c in rows[0] if c != key and c not in _IMMUTABLE}
+            set_.setdefault("updated_at", func.now())
+            self.db.execute(stmt.on_conflict_do_update(index_elements=[key], set_=set_), rows)
+            return
+        # No ON CONFLICT: update the keys found above and insert the rest. Not
+        # safe against a concurrent insert of the same key, which then fails the chunk.
+        updates = [row for row in rows if row[key] in existing]
+        inserts = [row for row in rows if row[key] not in existing]
+        if updates:
+            self.db.execute(update(model), [{k: v for k, v in row.items() if k != "created_at"} for row in updates])
+        if inserts:
+            self.db.execute(insert(model), inserts)
+
+
+def import_items(db: Session, kind: ImportKind, items: Iterable[Any]) -> ImportReport:
+    """Import an in-memory list of records (the JSON `{"items": [...]}` endpoints)."""
+    importer = BulkImporter(db, kind)
+    for line, raw in enumerate(items, start=1):
+        if importer.add(line, raw):
+            importer.flush()
+    return importer.finish()
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into numbered lines without buffering more than one
+    line. A line over `max_line_bytes` is discarded and yielded as None.
+    """
+    buffer = bytearray()
+    overflow = False
+    line = 0
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            line += 1
+            if not overflow:
+                buffer += chunk[start:end]
+            yield line, None if overflow or len(buffer) > max_line_bytes else bytes(buffer)
+            buffer.clear()
+            overflow = False
+            start = end + 1
+        if not overflow:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                overflow = True
+                buffer.clear()
+    if buffer or overflow:
+        yield line + 1, None if overflow else bytes(buffer)
@@ -1,34 +1,56 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from ..core.cache import bump_version
 from ..models import Checklist
 from ..schemas import ChecklistCreate, ChecklistUpdate
+from .localization import localized_select
 
 
 class ChecklistService:
+    # List-screen projection: everything but the items list
+    SUMMARY_FIELDS = ("id", "title", "description", "is_published", "status")
+
     @staticmethod
-    def list(db: Session, *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False) -> List[Checklist]:
-        stmt = select(Checklist)
+    def _visible(stmt: Select, status: str | None, include_drafts: bool) -> Select:
         if status:
             stmt = stmt.where(getattr(Checklist, "status", None) == status)  # type: ignore[attr-defined]
         elif not include_drafts and hasattr(Checklist, "status"):
             stmt = stmt.where(Checklist.status == "published")  # type: ignore[attr-defined]
+        return stmt
+
+    @staticmethod
+    def list(db: Session, *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False) -> List[Checklist]:
+        stmt = ChecklistService._visible(select(Checklist), status, include_drafts)
         stmt = stmt.offset(offset).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
+    @staticmethod
+    def list_fields(db: Session, fields: Sequence[str], *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False, language: str | None = None) -> List[Dict[str, Any]]:
+        """`list` selecting only the `fields` columns (see core.projection), translated into `language` if given; rows come back as dicts."""
+        stmt = ChecklistService._visible(localized_select(Checklist, fields, language), status, include_drafts)
+        stmt = stmt.offset(offset).limit(limit)
+        return [dict(row._mapping) for row in db.execute(stmt)]
+
     @staticmethod
     def get(db: Session, checklist_id: str) -> Optional[Checklist]:
         return db.get(Checklist, checklist_id)
 
+    @staticmethod
+    def get_localized(db: Session, checklist_id: str, fields: Sequence[str], language: str) -> Optional[Dict[str, Any]]:
+        row = db.execute(localized_select(Checklist, fields, language).where(Checklist.id == checklist_id)).first()
+        return dict(row._mapping) if row else None
+
     @staticmethod
     def create(db: Session, data: ChecklistCreate) -> Checklist:
         obj = Checklist(**data.model_dump())
         db.add(obj)
         db.commit()
+        bump_version("checklists")
         db.refresh(obj)
         return obj
 
@@ -38,6 +60,7 @@ class ChecklistService:
             setattr(checklist, key, value)
         db.add(checklist)
         db.commit()
+        bump_version("checklists")
         db.refresh(checklist)
         return checklist
 
@@ -45,5 +68,6 @@ class ChecklistService:
     def delete(db: Session, checklist: Checklist) -> None:
         db.delete(checklist)
         db.commit()
+        bump_version("checklists")
 
 
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+"""
+Prebuilt bundle of all published reference content.
+
+Guides, checklists, templates and the glossary are serialized into one JSON
+document (optionally with a language's approved translations merged in) and
+stored precompressed. Each section is fingerprinted by the newest settled
+`content_changes` sequence of the tables it reads, so a rebuild only
+re-serializes the sections that changed. The bundle version is a hash of the
+serialized sections: output is deterministic, so workers holding the same
+rows derive the same version and bytes without coordinating.
+
+Fingerprints only cover settled changes while rows are read live, so one
+worker can advertise a version that another has not built yet. A download of
+an unknown version re-reads every section (at most every REREAD_INTERVAL_SEC)
+and serves the result if it is that version.
+"""
+
+from dataclasses import dataclass, field
+import gzip
+from hashlib import sha256
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import Checklist, Guide, Template
+from ..models.content_change import ContentChange
+from ..models.glossary import GlossaryTerm
+from ..models.translation import Translation
+from ..schemas import ChecklistOut, GuideOut, TemplateOut
+from ..schemas.translation import GlossaryTermOut
+from .sync import settle_cutoff
+from .translations import COVERAGE_LANGUAGES
+
+try:  # optional: brotli is served only when the package is installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+BUNDLE_FORMAT = 1
+# Older versions stay downloadable for a while so clients mid-update don't 404
+VERSIONS_KEPT = 4
+# Minimum seconds between full re-reads triggered by unknown versions
+REREAD_INTERVAL_SEC = 1.0
+# One bundle state per app language (plus the untranslated base); each is
+# rebuilt and kept in memory, so callers cannot add languages
+LANGUAGES = COVERAGE_LANGUAGES
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    model: Any
+    schema: Any
+    # Translation entity merged into rows (None: not translatable)
+    translation_entity: Optional[str]
+    # Translation.title is stored under this attribute
+    title_field: str = "title"
+    published_only: bool = True
+
+
+SECTIONS: Tuple[Section, ...] = (
+    Section("guides", Guide, GuideOut, "guides"),
+    Section("checklists", Checklist, ChecklistOut, "checklists"),
+    Section("templates", Template, TemplateOut, "templates", title_field="name"),
+    Section("glossary", GlossaryTerm, GlossaryTermOut, None, published_only=False),
+)
+_TABLES = {"guides": "guides", "checklists": "checklists", "templates": "templates", "glossary": "glossary_terms"}
+
+
+@dataclass(frozen=True)
+class Bundle:
+    version: str
+    language: Optional[str]
+    raw: bytes
+    gzip: bytes
+    br: Optional[bytes]
+    counts: Dict[str, int]
+
+    def encoded(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Best stored representation for an Accept-Encoding header."""
+        accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+        if self.br is not None and "br" in accepted:
+            return self.br, "br"
+        if "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.raw, None
+
+
+@dataclass
+class _LanguageState:
+    fingerprints: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+    fragments: Dict[str, Tuple[bytes, int]] = field(default_factory=dict)
+    current: Optional[Bundle] = None
+    versions: Dict[str, Bundle] = field(default_factory=dict)
+    built_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _section_rows(db: Session, section: Section, language: Optional[str]) -> List[Dict[str, Any]]:
+    stmt = select(section.model).order_by(section.model.id.asc())
+    if section.published_only:
+        stmt = stmt.where(section.model.status == "published")
+    rows = [section.schema.model_validate(obj).model_dump(mode="json") for obj in db.execute(stmt).scalars()]
+    if language and section.translation_entity and rows:
+        translated = {
+            t.entity_id: t
+            for t in db.execute(
+                select(Translation).where(
+                    Translation.entity == section.translation_entity,
+                    Translation.language == language,
+                    Translation.status == "approved",
+                )
+            ).scalars()
+        }
+        for row in rows:
+            t = translated.get(row["id"])
+            if t is None:
+                continue
+            if t.title:
+                row[section.title_field] = t.title
+            if t.description and "description" in row:
+                row["description"] = t.description
+            if t.content and "content" in row:
+                row["content"] = t.content
+            row["language"] = language
+    return rows
+
+
+class ContentBundleService:
+    _states: Dict[Optional[str], _LanguageState] = {}
+    _states_lock = threading.Lock()
+
+    @staticmethod
+    def _state(language: Optional[str]) -> _LanguageState:
+        if language is not None and language not in LANGUAGES:
+            raise ValueError(f"Unsupported language: {language}")
+        with ContentBundleService._states_lock:
+            return ContentBundleService._states.setdefault(language, _LanguageState())
+
+    @staticmethod
+    def _fingerprints(db: Session, language: Optional[str]) -> Dict[str, Tuple[int, ...]]:
+        tables = list(_TABLES.values()) + (["translations"] if language else [])
+        latest = dict(
+            db.execute(
+                select(ContentChange.entity, func.max(ContentChange.seq))
+                .where(ContentChange.entity.in_(tables))
+                # Same settle rule as /sync: a late commit of a lower seq
+                # happens before the change above it counts
+                .where(ContentChange.changed_at <= settle_cutoff())
+                .group_by(ContentChange.entity)
+            ).all()
+        )
+        result: Dict[str, Tuple[int, ...]] = {}
+        for section in SECTIONS:
+            parts = [latest.get(_TABLES[section.name]) or 0]
+            if language and section.translation_entity:
+                # Any translation change may touch this section; cheap and safe
+                parts.append(latest.get("translations") or 0)
+            result[section.name] = tuple(parts)
+        return result
+
+    @staticmethod
+    def current(db: Session, language: Optional[str] = None) -> Bundle:
+        """
+        Return the up-to-date bundle, rebuilding only the sections that changed.
+        Raises ValueError for a language outside LANGUAGES.
+        """
+        state = ContentBundleService._state(language)
+        fingerprints = ContentBundleService._fingerprints(db, language)
+        if state.current is not None and state.fingerprints == fingerprints:
+            return state.current
+        with state.lock:
+            if state.current is not None and state.fingerprints == fingerprints:
+                return state.current
+            stale = [
+                s for s in SECTIONS if s.name not in state.fragments or state.fingerprints.get(s.name) != fingerprints[s.name]
+            ]
+            return ContentBundleService._rebuild(db, state, language, fingerprints, stale)
+
+    @staticmethod
+    def _rebuild(
+        db: Session,
+        state: _LanguageState,
+        language: Optional[str],
+        fingerprints: Dict[str, Tuple[int, ...]],
+        sections: List[Section],
+    ) -> Bundle:
+        """Re-serialize `sections` from the rows as they are now. The caller holds state.lock."""
+        for section in sections:
+            rows = _section_rows(db, section, language)
+            fragment = json.dumps(rows, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            state.fragments[section.name] = (fragment, len(rows))
+        state.built_at = time.monotonic()
+
+        digest = sha256(json.dumps([BUNDLE_FORMAT, language]).encode("utf-8"))
+        for s in SECTIONS:
+            digest.update(b"\n" + state.fragments[s.name][0])
+        version = digest.hexdigest()[:16]
+        if state.current is not None and state.current.version == version:
+            state.fingerprints = fingerprints
+            return state.current
+        bundle = state.versions.get(version)
+        if bundle is None:
+            header = json.dumps({"format": BUNDLE_FORMAT, "version": version, "language": language}, separators=(",", ":"))
+            body = b"".join(
+                [header[:-1].encode("utf-8")]
+                + [b',"' + s.name.encode("ascii") + b'":' + state.fragments[s.name][0] for s in SECTIONS]
+                + [b"}"]
+            )
+            bundle = Bundle(
+                version=version,
+                language=language,
+                raw=body,
+                # mtime=0 keeps the bytes identical across workers and rebuilds
+                gzip=gzip.compress(body, compresslevel=9, mtime=0),
+                br=brotli.compress(body, quality=11) if brotli is not None else None,
+                counts={s.name: state.fragments[s.name][1] for s in SECTIONS},
+            )
+        state.current = bundle
+        state.fingerprints = fingerprints
+        state.versions.pop(version, None)
+        state.versions[version] = bundle
+        while len(state.versions) > VERSIONS_KEPT:
+            state.versions.pop(next(iter(state.versions)))
+        return bundle
+
+    @staticmethod
+    def get_version(db: Session, version: str, language: Optional[str] = None) -> Optional[Bundle]:
+        current = ContentBundleService.current(db, language)
+        if current.version == version:
+            return current
+        state = ContentBundleService._state(language)
+        bundle = state.versions.get(version)
+        if bundle is not None:
+            return bundle
+        # Possibly built by a worker that read rows this one has not re-read
+        with state.lock:
+            if time.monotonic() - state.built_at >= REREAD_INTERVAL_SEC:
+                fingerprints = ContentBundleService._fingerprints(db, language)
+                ContentBundleService._rebuild(db, state, language, fingerprints, list(SECTIONS))
+            return state.versions.get(version)
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+"""
+In-process full-text search across guides, checklists, templates and the
+glossary.
+
+Published rows and their approved translations are tokenized into an
+inverted index held in memory and ranked with BM25. Fields are weighted by
+scaling term frequencies (title counts more than body). Every query token
+must match; tokens of PREFIX_MIN_CHARS or more (and the last token, which
+the user may still be typing) also match indexed terms they prefix, at a
+discount. That covers Ukrainian/Russian/German inflection without a
+stemmer.
+
+The index follows writes through the `content_changes` feed: before a search
+it applies changes newer than the last sequence it saw, re-indexing the
+affected rows, so every worker converges without a broadcast. The feed is
+polled immediately after a local write (cache versions moved) and otherwise
+at most every REFRESH_INTERVAL_SEC (see ChangeFollower in services/sync.py).
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.logging import get_logger
+from ..models import Checklist, Guide, Template
+from ..models.glossary import GlossaryTerm
+from ..models.translation import Translation
+from .sync import ChangeFollower
+
+
+log = get_logger(module="content_search")
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.5
+PREFIX_WEIGHT = 0.7
+PREFIX_MIN_CHARS = 3
+MAX_EXPANSIONS = 64
+EXPANSION_BUDGET = 20000
+SCORE_CACHE_TERMS = 4096
+SUBTITLE_CHARS = 160
+
+ENTITIES = ("guides", "checklists", "templates", "glossary_terms")
+_TRANSLATABLE = ("guides", "checklists", "templates")
+
+_APOSTROPHES = str.maketrans("", "", "'’ʼ`")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_WS_RE = re.compile(r"\s+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Unicode-aware tokens: NFKC, casefolded, apostrophes joined (Ukrainian "м'ясо"), ё folded to е."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_APOSTROPHES).replace("ё", "е")
+    return _TOKEN_RE.findall(text)
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    entity: str
+    entity_id: str
+    # None for the base row, else the language of the translation it came from
+    language: Optional[str]
+    title: str
+    subtitle: Optional[str]
+    # (text, weight) pairs
+    fields: Tuple[Tuple[str, float], ...]
+
+
+class SearchIndex:
+    """BM25 inverted index; documents are grouped by (entity, entity_id) for replacement."""
+
+    def __init__(self) -> None:
+        self._docs: List[Optional[SearchDocument]] = []
+        self._doc_len: List[float] = []
+        self._doc_terms: List[Tuple[str, ...]] = []
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._groups: Dict[Tuple[str, str], List[int]] = {}
+        self._free: List[int] = []
+        self._total_len = 0.0
+        self._count = 0
+        self._vocab: Optional[List[str]] = []
+        # Both derive from every document's length, so any add/remove resets them
+        self._norms: Optional[List[float]] = None
+        self._score_cache: Dict[str, Dict[int, float]] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, doc: SearchDocument) -> None:
+        tf: Dict[str, float] = {}
+        length = 0.0
+        for text, weight in doc.fields:
+            for token in tokenize(text):
+                tf[token] = tf.get(token, 0.0) + weight
+                length += weight
+        if self._free:
+            idx = self._free.pop()
+            self._docs[idx], self._doc_len[idx], self._doc_terms[idx] = doc, length, tuple(tf)
+        else:
+            idx = len(self._docs)
+            self._docs.append(doc)
+            self._doc_len.append(length)
+            self._doc_terms.append(tuple(tf))
+        for term, freq in tf.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                self._vocab = None
+            posting[idx] = freq
+        self._groups.setdefault((doc.entity, doc.entity_id), []).append(idx)
+        self._total_len += length
+        self._count += 1
+        self._invalidate()
+
+    def remove_group(self, entity: str, entity_id: str) -> None:
+        for idx in self._groups.pop((entity, entity_id), []):
+            for term in self._doc_terms[idx]:
+                posting = self._postings[term]
+                del posting[idx]
+                if not posting:
+                    del self._postings[term]
+                    self._vocab = None
+            self._total_len -= self._doc_len[idx]
+            self._docs[idx], self._doc_len[idx], self._doc_terms[idx] = None, 0.0, ()
+            self._free.append(idx)
+            self._count -= 1
+            self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._norms = None
+        if self._score_cache:
+            self._score_cache = {}
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        """BM25 contribution of `term` per document, cached until the index changes."""
+        cached = self._score_cache.get(term)
+        if cached is not None:
+            return cached
+        if self._norms is None:
+            avgdl = self._total_len / self._count if self._count else 1.0
+            self._norms = [K1 * (1 - B + B * length / (avgdl or 1.0)) for length in self._doc_len]
+        norms = self._norms
+        posting = self._postings[term]
+        idf = (K1 + 1) * math.log(1 + (self._count - len(posting) + 0.5) / (len(posting) + 0.5))
+        scores = {idx: idf * freq / (freq + norms[idx]) for idx, freq in posting.items()}
+        if len(self._score_cache) >= SCORE_CACHE_TERMS:
+            self._score_cache.clear()
+        self._score_cache[term] = scores
+        return scores
+
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        terms = [(token, 1.0)] if token in self._postings else []
+        if not prefix:
+            return terms
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        expansions = []
+        i = bisect_left(self._vocab, token)
+        while i < len(self._vocab) and self._vocab[i].startswith(token):
+            if self._vocab[i] != token:
+                expansions.append(self._vocab[i])
+            i += 1
+        # Most common completions first, bounded by count and by total postings
+        # scanned, so a one- or two-letter prefix cannot touch the whole index
+        expansions = heapq.nlargest(MAX_EXPANSIONS, expansions, key=lambda t: len(self._postings[t]))
+        budget = EXPANSION_BUDGET - sum(len(self._postings[t]) for t, _ in terms)
+        for term in expansions:
+            if budget <= 0 and terms:
+                break
+            terms.append((term, PREFIX_WEIGHT))
+            budget -= len(self._postings[term])
+        return terms
+
+    def search(
+        self,
+        query: str,
+        *,
+        language: Optional[str] = None,
+        entities: Optional[Iterable[str]] = None,
+        limit: int = 20,
+    ) -> List[Tuple[SearchDocument, float]]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._count:
+            return []
+        allowed = set(entities) if entities else None
+
+        expanded = [self._expand(t, len(t) >= PREFIX_MIN_CHARS or i == len(tokens) - 1) for i, t in enumerate(tokens)]
+        # Most selective token first so later tokens only score surviving docs
+        expanded.sort(key=lambda terms: sum(len(self._postings[t]) for t, _ in terms))
+        totals: Optional[Dict[int, float]] = None
+        for terms in expanded:
+            scores: Dict[int, float] = {}
+            for term, weight in terms:
+                term_scores = self._term_scores(term)
+                if totals is not None and len(totals) < len(term_scores):
+                    pairs = ((idx, term_scores[idx]) for idx in totals if idx in term_scores)
+                else:
+                    pairs = term_scores.items()
+                for idx, score in pairs:
+                    if totals is not None and idx not in totals:
+                        continue
+                    score *= weight
+                    if score > scores.get(idx, 0.0):
+                        scores[idx] = score
+            totals = scores if totals is None else {idx: totals[idx] + s for idx, s in scores.items()}
+            if not totals:
+                return []
+
+        # One hit per row: the best of the base document and its translations,
+        # preferring the requested language on ties
+        best: Dict[Tuple[str, str], Tuple[float, bool, int]] = {}
+        for idx, score in totals.items():
+            doc = self._docs[idx]
+            if allowed is not None and doc.entity not in allowed:
+                continue
+            if language is not None and doc.language not in (None, language):
+                continue
+            key = (doc.entity, doc.entity_id)
+            candidate = (score, doc.language is not None, idx)
+            if key not in best or candidate > best[key]:
+                best[key] = candidate
+        top = heapq.nlargest(limit, best.values())
+        return [(self._docs[idx], score) for score, _, idx in top]
+
+
+def _subtitle(*texts: Optional[str]) -> Optional[str]:
+    for text in texts:
+        if text and text.strip():
+            text = _WS_RE.sub(" ", text).strip()
+            return text if len(text) <= SUBTITLE_CHARS else text[: SUBTITLE_CHARS - 1].rstrip() + "…"
+    return None
+
+
+def _base_document(entity: str, row) -> SearchDocument:
+    if entity == "guides":
+        return SearchDocument(
+            entity, row.id, None, row.title, _subtitle(row.description, row.content),
+            ((row.title, TITLE_WEIGHT), (row.description or "", DESCRIPTION_WEIGHT), (row.content or "", 1.0)),
+        )
+    if entity == "checklists":
+        items = " ".join(str(i) for i in (row.items or []))
+        return SearchDocument(
+            entity, row.id, None, row.title, _subtitle(row.description),
+            ((row.title, TITLE_WEIGHT), (row.description or "", DESCRIPTION_WEIGHT), (items, 1.0)),
+        )
+    if entity == "templates":
+        return SearchDocument(
+            entity, row.id, None, row.name, _subtitle(row.category),
+            ((row.name, TITLE_WEIGHT), (row.category or "", DESCRIPTION_WEIGHT), (row.content or "", 1.0)),
+        )
+    names = " ".join(v for v in (row.uk, row.ru, row.en) if v)
+    return SearchDocument(
+        entity, row.id, None, row.term, _subtitle(row.description, names),
+        ((row.term, TITLE_WEIGHT), (names, TITLE_WEIGHT), (row.description or "", 1.0)),
+    )
+
+
+def _translated_document(base: SearchDocument, t: Translation) -> SearchDocument:
+    title = t.title or base.title
+    return SearchDocument(
+        base.entity, base.entity_id, t.language, title, _subtitle(t.description, t.content) or base.subtitle,
+        ((title, TITLE_WEIGHT), (t.description or "", DESCRIPTION_WEIGHT), (t.content or "", 1.0)),
+    )
+
+
+_MODELS = {"guides": Guide, "checklists": Checklist, "templates": Template, "glossary_terms": GlossaryTerm}
+
+
+def _visible_rows(db: Session, entity: str, ids: Optional[Sequence[str]] = None) -> list:
+    model = _MODELS[entity]
+    stmt = select(model)
+    if entity != "glossary_terms":
+        stmt = stmt.where(model.status == "published")
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(ids))
+    return list(db.execute(stmt).scalars())
+
+
+def _approved_translations(db: Session, entity: str, ids: Optional[Sequence[str]] = None) -> Dict[str, List[Translation]]:
+    stmt = select(Translation).where(Translation.entity == entity, Translation.status == "approved")
+    if ids is not None:
+        stmt = stmt.where(Translation.entity_id.in_(ids))
+    grouped: Dict[str, List[Translation]] = {}
+    for t in db.execute(stmt).scalars():
+        grouped.setdefault(t.entity_id, []).append(t)
+    return grouped
+
+
+def _index_rows(index: SearchIndex, db: Session, entity: str, ids: Optional[Sequence[str]] = None) -> None:
+    rows = _visible_rows(db, entity, ids)
+    translations = _approved_translations(db, entity, [r.id for r in rows] if ids is not None else None) if entity in _TRANSLATABLE else {}
+    for row in rows:
+        base = _base_document(entity, row)
+        index.add(base)
+        for t in translations.get(row.id, ()):
+            index.add(_translated_document(base, t))
+
+
+class ContentSearch:
+    _index: Optional[SearchIndex] = None
+    # translation id -> (entity, entity_id), to re-index after a translation is deleted
+    _translation_groups: Dict[str, Tuple[str, str]] = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Build a fresh index from the database and swap it in. Returns the document count."""
+        return _follower.rebuild(db)
+
+    @staticmethod
+    def refresh(db: Session, *, force: bool = False) -> None:
+        """Apply content changes committed since the last refresh (any worker's)."""
+        _follower.refresh(db, force=force)
+
+    @staticmethod
+    def _build(db: Session) -> int:
+        started = time.perf_counter()
+        index = SearchIndex()
+        for entity in ENTITIES:
+            _index_rows(index, db, entity)
+        groups = {
+            t_id: (entity, entity_id)
+            for t_id, entity, entity_id in db.execute(
+                select(Translation.id, Translation.entity, Translation.entity_id).where(Translation.entity.in_(_TRANSLATABLE))
+            )
+        }
+        with ContentSearch._lock:
+            ContentSearch._index = index
+            ContentSearch._translation_groups = groups
+        log.info("search_index_built", documents=len(index), duration_ms=int((time.perf_counter() - started) * 1000))
+        return len(index)
+
+    @staticmethod
+    def _apply(db: Session, changes: list) -> None:
+        index = ContentSearch._index
+        groups: Set[Tuple[str, str]] = set()
+        translation_ids = [c.entity_id for c in changes if c.entity == "translations"]
+        if translation_ids:
+            for t_id, entity, entity_id in db.execute(
+                select(Translation.id, Translation.entity, Translation.entity_id).where(Translation.id.in_(translation_ids))
+            ):
+                ContentSearch._translation_groups[t_id] = (entity, entity_id)
+        for change in changes:
+            if change.entity in ENTITIES:
+                groups.add((change.entity, change.entity_id))
+            elif change.entity == "translations":
+                group = ContentSearch._translation_groups.get(change.entity_id)
+                if group is not None and group[0] in _TRANSLATABLE:
+                    groups.add(group)
+        by_entity: Dict[str, List[str]] = {}
+        for entity, entity_id in groups:
+            index.remove_group(entity, entity_id)
+            by_entity.setdefault(entity, []).append(entity_id)
+        for entity, ids in by_entity.items():
+            _index_rows(index, db, entity, ids)
+
+    @staticmethod
+    def search(
+        db: Session,
+        q: str,
+        *,
+        language: Optional[str] = None,
+        entities: Optional[Iterable[str]] = None,
+        limit: int = 20,
+    ) -> List[Tuple[SearchDocument, float]]:
+        ContentSearch.refresh(db)
+        with ContentSearch._lock:
+            return ContentSearch._index.search(q, language=language, entities=entities, limit=limit)
+
+
+_follower = ChangeFollower(ENTITIES + ("translations",), ContentSearch._build, ContentSearch._apply, lock=ContentSearch._lock)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+"""
+Glossary term annotation for guide and news content.
+
+An Aho-Corasick automaton over every glossary term and its uk/ru/en
+translations finds all of them in one pass over the text, however many
+terms there are. Matching is case-insensitive and only whole words count.
+Where matches overlap, the leftmost one wins, and the longest one among
+those that start at the same place.
+
+Spans are stored with the row as `term_spans`, a list of
+[start, end, glossary term id] character offsets into `content`, together
+with `term_spans_version`: the glossary's latest settled content_changes
+sequence number at the time of annotation (see services.sync.settled_seq; a
+term whose change is not settled yet may still be joined by one committed
+late under a lower sequence). Writes annotate the row straight away.
+When the glossary changes, the automaton is rebuilt once, and the periodic
+`backfill` re-annotates rows carrying an older version.
+"""
+
+from collections import deque
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..core.cache import bump_version
+from ..core.logging import get_logger
+from ..models.content_change import ContentChange, record_changes
+from ..models.glossary import GlossaryTerm
+from .sync import settle_cutoff
+
+
+log = get_logger(module="glossary_annotator")
+
+FIELDS = ("term", "uk", "ru", "en")
+MIN_TERM_CHARS = 2
+
+# Length-preserving folds, so offsets in the folded text are offsets in the original
+_APOSTROPHES = str.maketrans("’ʼ`", "'''")
+
+
+def fold(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lowercase to two ("İ"); keep those as they are
+        lowered = "".join(low if len(low) == 1 else ch for ch, low in ((ch, ch.lower()) for ch in text))
+    return lowered.translate(_APOSTROPHES)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: (length, value) of every pattern ending here, own and via fail links
+        self._out: List[Tuple[Tuple[int, Any], ...]] = [()]
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def add(self, pattern: str, value: Any) -> None:
+        """Add a (folded) pattern. The first value added for a pattern is kept."""
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        if not self._out[node]:
+            self._out[node] = ((len(pattern), value),)
+        self._built = False
+
+    def build(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                out[child] = out[child] + out[fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """(start, end, value) of every pattern occurrence in `text`, in order of end."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            # The root is never a child, so None means "back to the root"
+            state = nxt or 0
+            if out[state]:
+                end = i + 1
+                for length, value in out[state]:
+                    yield end - length, end, value
+
+
+class GlossaryAutomaton:
+    def __init__(self, terms: List[Tuple[str, Dict[str, Optional[str]]]]) -> None:
+        """`terms`: (term id, {field: text}) pairs; earlier terms win shared patterns."""
+        self._ac = AhoCorasick()
+        for term_id, fields in terms:
+            for name in FIELDS:
+                text = (fields.get(name) or "").strip()
+                if len(text) >= MIN_TERM_CHARS:
+                    self._ac.add(fold(text), term_id)
+        self._ac.build()
+
+    def annotate(self, text: Optional[str]) -> List[List[Any]]:
+        if not text:
+            return []
+        folded = fold(text)
+        size = len(folded)
+        matches = [
+            (start, end, term_id)
+            for start, end, term_id in self._ac.iter(folded)
+            if not (start and _is_word(folded[start - 1])) and not (end < size and _is_word(folded[end]))
+        ]
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        spans: List[List[Any]] = []
+        last_end = 0
+        for start, end, term_id in matches:
+            if start >= last_end:
+                spans.append([start, end, term_id])
+                last_end = end
+        return spans
+
+
+class GlossaryAnnotator:
+    _automaton: Optional[GlossaryAutomaton] = None
+    _version: Optional[int] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def glossary_version(db: Session) -> int:
+        return db.execute(
+            select(func.max(ContentChange.seq)).where(ContentChange.entity == "glossary_terms", ContentChange.changed_at <= settle_cutoff())
+        ).scalar() or 0
+
+    @staticmethod
+    def current(db: Session) -> Tuple[int, GlossaryAutomaton]:
+        """The automaton for the current glossary, rebuilt only when the settled glossary version moves."""
+        version = GlossaryAnnotator.glossary_version(db)
+        with GlossaryAnnotator._lock:
+            if GlossaryAnnotator._automaton is None or GlossaryAnnotator._version != version:
+                started = time.perf_counter()
+                rows = db.execute(
+                    select(GlossaryTerm.id, *[getattr(GlossaryTerm, f) for f in FIELDS]).order_by(GlossaryTerm.term.asc())
+                ).all()
+                GlossaryAnnotator._automaton = GlossaryAutomaton([(r.id, r._mapping) for r in rows])
+                GlossaryAnnotator._version = version
+                log.info("glossary_automaton_built", terms=len(rows), version=version, duration_ms=int((time.perf_counter() - started) * 1000))
+            return GlossaryAnnotator._version, GlossaryAnnotator._automaton
+
+    @staticmethod
+    def annotate(db: Session, row: Any) -> None:
+        """Set `term_spans` on a guide or news row about to be written."""
+        version, automaton = GlossaryAnnotator.current(db)
+        row.term_spans = automaton.annotate(row.content)
+        row.term_spans_version = version
+
+    @staticmethod
+    def backfill(db: Session, model: Any, batch_size: int = 200) -> int:
+        """Re-annotate one batch of rows annotated against an older glossary (or never). Returns rows processed."""
+        version, automaton = GlossaryAnnotator.current(db)
+        rows = db.execute(
+            select(model.id, model.content, model.term_spans)
+            .where(or_(model.term_spans_version.is_(None), model.term_spans_version < version))
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return 0
+        values, changed = [], []
+        for row in rows:
+            spans = automaton.annotate(row.content)
+            values.append({"id": row.id, "term_spans": spans, "term_spans_version": version})
+            if spans != (row.term_spans or []):
+                changed.append(row.id)
+        db.execute(update(model), values)
+        # Only rows whose spans moved are news to sync clients
+        record_changes(db, model.__tablename__, changed)
+        db.commit()
+        if changed:
+            bump_version(model.__tablename__)
+        return len(rows)
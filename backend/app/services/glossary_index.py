@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+"""
+Glossary autocomplete.
+
+Every glossary entry is indexed under its term and its uk/ru/en
+translations. Each field contributes one key per word start ("residence
+permit" is found by "res" and by "perm"), normalized like search tokens.
+Keys live in one sorted list, so a prefix lookup is a bisect plus a short
+forward scan.
+
+Ranking: a field equal to the prefix, then a field starting with it, then a
+later word starting with it; within a kind, `term` before translations,
+shorter fields first.
+
+Like ContentSearch, the index follows glossary writes through the
+`content_changes` feed with a ChangeFollower, updating only the entries
+that changed.
+"""
+
+from bisect import bisect_left, insort
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.logging import get_logger
+from ..models.glossary import GlossaryTerm
+from .content_search import tokenize
+from .sync import ChangeFollower
+
+
+log = get_logger(module="glossary_index")
+
+FIELDS = ("term", "uk", "ru", "en")
+# Matching keys looked at per lookup before ranking
+MAX_SCAN = 256
+
+_EXACT, _FIELD_PREFIX, _WORD_PREFIX = 0, 1, 2
+
+# (key, term id, field position, word position)
+_Key = Tuple[str, str, int, int]
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(tokenize(text))
+
+
+class GlossaryPrefixIndex:
+    def __init__(self) -> None:
+        self._keys: List[_Key] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._term_keys: Dict[str, List[_Key]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Index a glossary row given as a dict of id, description and FIELDS, replacing any previous version."""
+        term_id = entry["id"]
+        self.remove(term_id)
+        keys: List[_Key] = []
+        for pos, name in enumerate(FIELDS):
+            tokens = tokenize(entry.get(name))
+            for word in range(len(tokens)):
+                keys.append((" ".join(tokens[word:]), term_id, pos, word))
+        for key in keys:
+            insort(self._keys, key)
+        self._entries[term_id] = entry
+        self._term_keys[term_id] = keys
+
+    def remove(self, term_id: str) -> None:
+        for key in self._term_keys.pop(term_id, ()):
+            i = bisect_left(self._keys, key)
+            del self._keys[i]
+        self._entries.pop(term_id, None)
+
+    def load(self, entries: Sequence[Dict[str, Any]]) -> None:
+        """Bulk-build; one sort instead of an insort per key."""
+        for entry in entries:
+            keys = [
+                (" ".join(tokens[word:]), entry["id"], pos, word)
+                for pos, name in enumerate(FIELDS)
+                for tokens in (tokenize(entry.get(name)),)
+                for word in range(len(tokens))
+            ]
+            self._keys.extend(keys)
+            self._entries[entry["id"]] = entry
+            self._term_keys[entry["id"]] = keys
+        self._keys.sort()
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[Dict[str, Any], str]]:
+        """Best entries for `prefix` as (entry, matched field) pairs."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        keys, entries = self._keys, self._entries
+        best: Dict[str, Tuple[Tuple[int, int, int, str], str]] = {}
+        i = bisect_left(keys, (prefix,))
+        end = min(len(keys), i + MAX_SCAN)
+        while i < end and keys[i][0].startswith(prefix):
+            key, term_id, pos, word = keys[i]
+            i += 1
+            if word:
+                kind = _WORD_PREFIX
+            else:
+                kind = _EXACT if key == prefix else _FIELD_PREFIX
+            rank = (kind, pos, len(entries[term_id][FIELDS[pos]]), key)
+            current = best.get(term_id)
+            if current is None or rank < current[0]:
+                best[term_id] = (rank, FIELDS[pos])
+        ranked = sorted(best.items(), key=lambda item: item[1][0])[:limit]
+        return [(entries[term_id], field) for term_id, (_, field) in ranked]
+
+
+def _entry(row: GlossaryTerm) -> Dict[str, Any]:
+    return {"id": row.id, "term": row.term, "uk": row.uk, "ru": row.ru, "en": row.en, "description": row.description}
+
+
+class GlossaryIndex:
+    _index: Optional[GlossaryPrefixIndex] = None
+    _lock = threading.RLock()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Build a fresh index from the database and swap it in. Returns the entry count."""
+        return _follower.rebuild(db)
+
+    @staticmethod
+    def refresh(db: Session, *, force: bool = False) -> None:
+        """Apply glossary changes committed since the last refresh (any worker's)."""
+        _follower.refresh(db, force=force)
+
+    @staticmethod
+    def _build(db: Session) -> int:
+        started = time.perf_counter()
+        index = GlossaryPrefixIndex()
+        index.load([_entry(row) for row in db.execute(select(GlossaryTerm)).scalars()])
+        with GlossaryIndex._lock:
+            GlossaryIndex._index = index
+        log.info("glossary_index_built", terms=len(index), duration_ms=int((time.perf_counter() - started) * 1000))
+        return len(index)
+
+    @staticmethod
+    def _apply(db: Session, changes: list) -> None:
+        ids = {c.entity_id for c in changes}
+        rows = {row.id: row for row in db.execute(select(GlossaryTerm).where(GlossaryTerm.id.in_(ids))).scalars()}
+        for term_id in ids:
+            if term_id in rows:
+                GlossaryIndex._index.add(_entry(rows[term_id]))
+            else:
+                GlossaryIndex._index.remove(term_id)
+
+    @staticmethod
+    def suggest(db: Session, prefix: str, limit: int = 10) -> List[Tuple[Dict[str, Any], str]]:
+        GlossaryIndex.refresh(db)
+        with GlossaryIndex._lock:
+            return GlossaryIndex._index.suggest(prefix, limit)
+
+
+_follower = ChangeFollower(("glossary_terms",), GlossaryIndex._build, GlossaryIndex._apply, lock=GlossaryIndex._lock)
@@ -1,18 +1,60 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from ..core.cache import bump_version
 from ..models import Guide
 from ..schemas import GuideCreate, GuideUpdate
+from .glossary_annotator import GlossaryAnnotator
+from .localization import localized_select
+from .markdown_render import RenderedMarkdown, content_hash, render
 
 
 class GuideService:
+    # List-screen projection: everything but the content body
+    SUMMARY_FIELDS = ("id", "title", "slug", "description", "category", "image_url", "is_published", "status", "version", "reading_minutes")
+
     @staticmethod
-    def list(db: Session, *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False) -> List[Guide]:
-        stmt = select(Guide)
+    def render(guide: Guide) -> bool:
+        """Refresh the pre-rendered content if the Markdown source changed. Returns True if it re-rendered."""
+        if guide.content_hash is not None and guide.content_hash == content_hash(guide.content):
+            return False
+        rendered = render(guide.content)
+        guide.content_html = rendered.html
+        guide.content_ast = rendered.ast
+        guide.content_hash = rendered.content_hash
+        guide.reading_minutes = rendered.reading_minutes
+        return True
+
+    @staticmethod
+    def rendered(guide: Guide) -> RenderedMarkdown:
+        """The pre-rendered content, rendered in memory for guides the backfill has not reached yet. Never writes."""
+        if guide.content_hash is not None and guide.content_hash == content_hash(guide.content):
+            return RenderedMarkdown(
+                html=guide.content_html or "",
+                ast=guide.content_ast or {},
+                content_hash=guide.content_hash,
+                reading_minutes=guide.reading_minutes or 0,
+            )
+        return render(guide.content)
+
+    @staticmethod
+    def backfill_rendered(db: Session, batch_size: int = 200) -> int:
+        """Pre-render one batch of guides written before pre-rendering existed. Returns rows processed."""
+        guides = list(db.execute(select(Guide).where(Guide.content_hash.is_(None)).limit(batch_size)).scalars().all())
+        if not guides:
+            return 0
+        for guide in guides:
+            GuideService.render(guide)
+        db.commit()
+        bump_version("guides")
+        return len(guides)
+
+    @staticmethod
+    def _visible(stmt: Select, status: str | None, include_drafts: bool) -> Select:
         if status:
             stmt = stmt.where(getattr(Guide, "status", None) == status)  # type: ignore[attr-defined]
         elif not include_drafts:
@@ -21,23 +63,48 @@ class GuideService:
                 stmt = stmt.where(Guide.status == "published")  # type: ignore[attr-defined]
             else:
                 stmt = stmt.where(Guide.is_published == True)  # noqa: E712
+        return stmt
+
+    @staticmethod
+    def list(db: Session, *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False) -> List[Guide]:
+        stmt = GuideService._visible(select(Guide), status, include_drafts)
         stmt = stmt.offset(offset).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
+    @staticmethod
+    def list_fields(db: Session, fields: Sequence[str], *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False, language: str | None = None) -> List[Dict[str, Any]]:
+        """`list` selecting only the `fields` columns (see core.projection), translated into `language` if given; rows come back as dicts."""
+        stmt = GuideService._visible(localized_select(Guide, fields, language), status, include_drafts)
+        stmt = stmt.offset(offset).limit(limit)
+        return [dict(row._mapping) for row in db.execute(stmt)]
+
     @staticmethod
     def get(db: Session, guide_id: str) -> Optional[Guide]:
         return db.get(Guide, guide_id)
 
+    @staticmethod
+    def get_localized(db: Session, guide_id: str, fields: Sequence[str], language: str) -> Optional[Dict[str, Any]]:
+        row = db.execute(localized_select(Guide, fields, language).where(Guide.id == guide_id)).first()
+        return dict(row._mapping) if row else None
+
     @staticmethod
     def get_by_slug(db: Session, slug: str) -> Optional[Guide]:
         stmt = select(Guide).where(Guide.slug == slug)
         return db.execute(stmt).scalar_one_or_none()
 
+    @staticmethod
+    def get_by_slug_localized(db: Session, slug: str, fields: Sequence[str], language: str) -> Optional[Dict[str, Any]]:
+        row = db.execute(localized_select(Guide, fields, language).where(Guide.slug == slug)).first()
+        return dict(row._mapping) if row else None
+
     @staticmethod
     def create(db: Session, data: GuideCreate) -> Guide:
         obj = Guide(**data.model_dump())
+        GuideService.render(obj)
+        GlossaryAnnotator.annotate(db, obj)
         db.add(obj)
         db.commit()
+        bump_version("guides")
         db.refresh(obj)
         return obj
 
@@ -45,8 +112,11 @@ class GuideService:
     def update(db: Session, guide: Guide, data: GuideUpdate) -> Guide:
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(guide, key, value)
+        GuideService.render(guide)
+        GlossaryAnnotator.annotate(db, guide)
         db.add(guide)
         db.commit()
+        bump_version("guides")
         db.refresh(guide)
         return guide
 
@@ -54,5 +124,6 @@ class GuideService:
     def delete(db: Session, guide: Guide) -> None:
         db.delete(guide)
         db.commit()
+        bump_version("guides")
 
 
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+"""
+Incremental parser for the <head> of an HTML page.
+
+Single-article imports only need OpenGraph/meta tags, the <title> and
+alternate feed links, all of which live in <head>. `read_head` feeds the
+response body chunk by chunk and stops at </head> (or <body>, or a byte cap),
+so the rest of the page is never downloaded.
+"""
+
+import codecs
+from html.parser import HTMLParser
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Large network chunks are fed in slices so parsing stops soon after </head>
+FEED_SLICE = 8192
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.I)
+FEED_LINK_TYPES = {"application/rss+xml", "application/atom+xml"}
+
+
+class HeadMetaParser(HTMLParser):
+  """Collects meta, link and title tags in one pass; sets `done` once the head ends."""
+
+  def __init__(self) -> None:
+    super().__init__(convert_charrefs=True)
+    # property/name/itemprop (lowercased) -> content; the first occurrence wins
+    self.meta: Dict[str, str] = {}
+    self.links: List[Dict[str, str]] = []
+    self.title: Optional[str] = None
+    self.done = False
+    self._title_parts: Optional[List[str]] = None
+
+  def handle_starttag(self, tag, attrs):
+    if self.done:
+      return
+    if tag == "body":
+      self.done = True
+      return
+    a = {k.lower(): v for k, v in attrs if v is not None}
+    if tag == "meta":
+      key = (a.get("property") or a.get("name") or a.get("itemprop") or "").strip().lower()
+      content = a.get("content")
+      if key and content is not None and key not in self.meta:
+        self.meta[key] = content.strip()
+    elif tag == "link" and a.get("href"):
+      self.links.append(a)
+    elif tag == "title" and self.title is None:
+      self._title_parts = []
+
+  def handle_endtag(self, tag):
+    if tag == "title" and self._title_parts is not None:
+      self.title = " ".join("".join(self._title_parts).split()) or None
+      self._title_parts = None
+    elif tag == "head":
+      self.done = True
+
+  def handle_data(self, data):
+    if self._title_parts is not None:
+      self._title_parts.append(data)
+
+  def first(self, *keys: str) -> Optional[str]:
+    """Value of the first of `keys` present with non-empty content."""
+    for key in keys:
+      value = self.meta.get(key)
+      if value:
+        return value
+    return None
+
+  def feed_links(self) -> List[str]:
+    """hrefs of <link rel="alternate"> RSS/Atom feeds, in document order."""
+    return [
+      link["href"]
+      for link in self.links
+      if "alternate" in (link.get("rel") or "").lower().split()
+      and (link.get("type") or "").lower() in FEED_LINK_TYPES
+    ]
+
+
+def sniff_charset(prefix: bytes) -> Optional[str]:
+  m = _CHARSET_RE.search(prefix)
+  if not m:
+    return None
+  name = m.group(1).decode("ascii", errors="ignore")
+  try:
+    return codecs.lookup(name).name
+  except LookupError:
+    return None
+
+
+def read_head(chunks: Iterable[bytes], *, encoding: Optional[str] = None, max_bytes: int = 256 * 1024) -> Tuple[HeadMetaParser, int]:
+  """
+  Parse the document head from an iterable of body chunks, consuming no more
+  of it than needed. Returns the parser and the number of bytes read.
+  """
+  parser = HeadMetaParser()
+  decoder = None
+  read = 0
+  for chunk in chunks:
+    if not chunk:
+      continue
+    if decoder is None:
+      charset = encoding or sniff_charset(chunk[:2048]) or "utf-8"
+      try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+      except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    chunk = chunk[: max_bytes - read]
+    for i in range(0, len(chunk), FEED_SLICE):
+      piece = chunk[i:i + FEED_SLICE]
+      read += len(piece)
+      parser.feed(decoder.decode(piece))
+      if parser.done:
+        break
+    if parser.done or read >= max_bytes:
+      break
+  if decoder is not None and not parser.done:
+    parser.feed(decoder.decode(b"", final=True))
+  # Flush a pending title when the head was cut short
+  parser.handle_endtag("title")
+  return parser, read
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+"""
+Translated reads (`?lang=`) for content endpoints.
+
+The approved `Translation` for (entity, entity_id, language) is LEFT JOINed
+in the same statement as the content row. Each translatable column becomes
+COALESCE(translation, base), so untranslated rows, and fields a translation
+leaves empty, fall back to the base language. Rows come back as dicts like
+`list_fields` projections, with `translated` telling whether a translation
+was applied.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Select, and_, case, func, null, select
+from sqlalchemy.orm import aliased
+
+from ..models.translation import Translation
+
+
+# Per table: content column -> Translation column that overrides it
+TRANSLATED_COLUMNS: Dict[str, Dict[str, str]] = {
+    "guides": {"title": "title", "description": "description", "content": "content"},
+    "checklists": {"title": "title", "description": "description"},
+    "templates": {"name": "title", "content": "content"},
+    "news": {"title": "title", "summary": "description", "content": "content"},
+}
+
+TRANSLATED_FLAG = "translated"
+
+# Offsets into the base `content`; meaningless once a translation replaces it
+CONTENT_DERIVED = ("term_spans",)
+
+
+def localized_select(model: Any, fields: Sequence[str], language: Optional[str] = None) -> Select:
+    """
+    select() of `fields` from `model`, translated into `language` when given.
+    Names that are not columns of `model` (e.g. `translated` without a
+    language) are skipped.
+    """
+    columns = model.__table__.columns
+    if not language:
+        return select(*[getattr(model, f) for f in fields if f in columns])
+    table = model.__table__.name
+    translation = aliased(Translation)
+    overrides = TRANSLATED_COLUMNS[table]
+    selected = []
+    for f in fields:
+        if f not in columns:
+            continue
+        if f in overrides:
+            # An empty translated field counts as missing
+            translated = func.nullif(getattr(translation, overrides[f]), "")
+            selected.append(func.coalesce(translated, getattr(model, f)).label(f))
+        elif f in CONTENT_DERIVED and "content" in overrides:
+            replaced = func.nullif(translation.content, "").is_not(None)
+            selected.append(case((replaced, null()), else_=getattr(model, f)).label(f))
+        else:
+            selected.append(getattr(model, f))
+    selected.append(translation.id.is_not(None).label(TRANSLATED_FLAG))
+    return (
+        select(*selected)
+        .select_from(model)
+        .outerjoin(
+            translation,
+            and_(
+                translation.entity == table,
+                translation.entity_id == model.id,
+                translation.language == language,
+                translation.status == "approved",
+            ),
+        )
+    )
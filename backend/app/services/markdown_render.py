@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+"""
+Markdown rendering for guide bodies.
+
+Guides are written in a small Markdown subset: ATX headings, paragraphs,
+bullet and numbered lists, blockquotes, fenced code, horizontal rules and
+the inline forms **strong**, *emphasis*, `code`, [links](url) and
+![images](url). `render` turns a document into:
+
+- a compact block AST clients can lay out natively,
+- HTML, which is safe by construction: all text is escaped, no raw HTML is
+  passed through, and only http(s)/mailto links and http(s) images survive,
+- heading anchors (a table of contents) and an estimated reading time.
+
+Rendering happens when a guide is written, keyed by a hash of the source,
+so clients never parse Markdown themselves.
+"""
+
+from dataclasses import dataclass
+from hashlib import sha256
+import html
+import math
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+
+AST_VERSION = 1
+WORDS_PER_MINUTE = 200
+
+# A closing run of #s only counts after whitespace, so "# Learn C#" keeps its "#"
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_FENCE_RE = re.compile(r"^(`{3,}|~{3,})\s*([\w+-]*)\s*$")
+_HR_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_BULLET_RE = re.compile(r"^\s{0,3}[-*+]\s+(.*)$")
+_ORDERED_RE = re.compile(r"^\s{0,3}(\d{1,9})[.)]\s+(.*)$")
+_QUOTE_RE = re.compile(r"^\s{0,3}>\s?(.*)$")
+_INLINE_RE = re.compile(
+    r"(?P<code>`+)(?P<code_text>.+?)(?P=code)"
+    r"|!\[(?P<img_alt>[^\]]*)\]\((?P<img_src>[^)\s]+)(?:\s+\"[^\"]*\")?\)"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_href>[^)\s]+)(?:\s+\"[^\"]*\")?\)"
+    r"|(?P<strong>\*\*|__)(?P<strong_text>.+?)(?P=strong)"
+    r"|(?<![\w*])(?P<em>[*_])(?P<em_text>[^*_\s](?:.*?[^*_\s])?)(?P=em)(?![\w*])"
+)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SAFE_LINK = ("http://", "https://", "mailto:")
+_SAFE_IMAGE = ("http://", "https://")
+
+
+@dataclass(frozen=True)
+class RenderedMarkdown:
+    html: str
+    ast: Dict[str, Any]
+    content_hash: str
+    reading_minutes: int
+
+
+def content_hash(source: Optional[str]) -> str:
+    return sha256((source or "").encode("utf-8")).hexdigest()
+
+
+def _inline(text: str) -> List[Any]:
+    """Inline spans: plain strings, or [kind, ...] lists ("b", "i", "code", "a", "img")."""
+    spans: List[Any] = []
+    pos = 0
+    for m in _INLINE_RE.finditer(text):
+        if m.start() > pos:
+            spans.append(text[pos:m.start()])
+        if m.group("code"):
+            spans.append(["code", m.group("code_text").strip()])
+        elif m.group("img_src") is not None:
+            src = m.group("img_src")
+            if src.lower().startswith(_SAFE_IMAGE):
+                spans.append(["img", src, m.group("img_alt")])
+            else:
+                spans.append(m.group("img_alt"))
+        elif m.group("link_href") is not None:
+            href = m.group("link_href")
+            children = _inline(m.group("link_text"))
+            spans.append(["a", href, children] if href.lower().startswith(_SAFE_LINK) else ["span", children])
+        elif m.group("strong"):
+            spans.append(["b", _inline(m.group("strong_text"))])
+        else:
+            spans.append(["i", _inline(m.group("em_text"))])
+        pos = m.end()
+    if pos < len(text):
+        spans.append(text[pos:])
+    return [s for s in spans if s != ""]
+
+
+def _inline_html(spans: List[Any]) -> str:
+    out: List[str] = []
+    for span in spans:
+        if isinstance(span, str):
+            out.append(html.escape(span, quote=False))
+            continue
+        kind = span[0]
+        if kind == "code":
+            out.append(f"<code>{html.escape(span[1], quote=False)}</code>")
+        elif kind == "img":
+            out.append(f'<img src="{html.escape(span[1])}" alt="{html.escape(span[2])}">')
+        elif kind == "a":
+            out.append(f'<a href="{html.escape(span[1])}" rel="nofollow noopener">{_inline_html(span[2])}</a>')
+        elif kind == "b":
+            out.append(f"<strong>{_inline_html(span[1])}</strong>")
+        elif kind == "i":
+            out.append(f"<em>{_inline_html(span[1])}</em>")
+        else:
+            out.append(_inline_html(span[1]))
+    return "".join(out)
+
+
+def _inline_text(spans: List[Any]) -> str:
+    parts: List[str] = []
+    for span in spans:
+        if isinstance(span, str):
+            parts.append(span)
+        elif span[0] == "code":
+            parts.append(span[1])
+        elif span[0] == "img":
+            parts.append(span[2])
+        elif span[0] == "a":
+            parts.append(_inline_text(span[2]))
+        else:
+            parts.append(_inline_text(span[1]))
+    return "".join(parts)
+
+
+def _parse_blocks(lines: List[str]) -> List[Dict[str, Any]]:
+    blocks: List[Dict[str, Any]] = []
+    paragraph: List[str] = []
+    i = 0
+
+    def flush_paragraph() -> None:
+        if paragraph:
+            blocks.append({"t": "p", "c": _inline(" ".join(s.strip() for s in paragraph))})
+            paragraph.clear()
+
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            flush_paragraph()
+            i += 1
+            continue
+        fence = _FENCE_RE.match(line.strip())
+        if fence:
+            flush_paragraph()
+            marker, code = fence.group(1), []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            blocks.append({"t": "code", "lang": fence.group(2) or None, "text": "\n".join(code)})
+            i += 1
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            flush_paragraph()
+            blocks.append({"t": "h", "l": len(heading.group(1)), "c": _inline(heading.group(2))})
+            i += 1
+            continue
+        if _HR_RE.match(line):
+            flush_paragraph()
+            blocks.append({"t": "hr"})
+            i += 1
+            continue
+        if _QUOTE_RE.match(line):
+            flush_paragraph()
+            quoted = []
+            while i < len(lines) and _QUOTE_RE.match(lines[i]):
+                quoted.append(_QUOTE_RE.match(lines[i]).group(1))
+                i += 1
+            blocks.append({"t": "quote", "c": _parse_blocks(quoted)})
+            continue
+        bullet, ordered = _BULLET_RE.match(line), _ORDERED_RE.match(line)
+        if bullet or ordered:
+            flush_paragraph()
+            item_re = _BULLET_RE if bullet else _ORDERED_RE
+            items: List[List[str]] = []
+            while i < len(lines):
+                m = item_re.match(lines[i])
+                if m:
+                    items.append([m.group(m.lastindex)])
+                elif lines[i].strip() and lines[i][:1].isspace() and items:
+                    # Indented continuation of the previous item
+                    items[-1].append(lines[i].strip())
+                else:
+                    break
+                i += 1
+            block: Dict[str, Any] = {"t": "ul" if bullet else "ol", "items": [_inline(" ".join(item)) for item in items]}
+            if ordered and int(ordered.group(1)) != 1:
+                block["start"] = int(ordered.group(1))
+            blocks.append(block)
+            continue
+        paragraph.append(line)
+        i += 1
+    flush_paragraph()
+    return blocks
+
+
+def _slug(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return "-".join(_WORD_RE.findall(text)) or "section"
+
+
+def _assign_anchors(blocks: List[Dict[str, Any]], toc: List[Dict[str, Any]], used: Dict[str, int]) -> None:
+    for block in blocks:
+        if block["t"] == "h":
+            text = _inline_text(block["c"])
+            anchor = _slug(text)
+            if anchor in used:
+                used[anchor] += 1
+                anchor = f"{anchor}-{used[anchor]}"
+            else:
+                used[anchor] = 1
+            block["id"] = anchor
+            toc.append({"l": block["l"], "text": text, "id": anchor})
+        elif block["t"] == "quote":
+            _assign_anchors(block["c"], toc, used)
+
+
+def _blocks_html(blocks: List[Dict[str, Any]]) -> str:
+    out: List[str] = []
+    for block in blocks:
+        kind = block["t"]
+        if kind == "h":
+            out.append(f'<h{block["l"]} id="{html.escape(block["id"])}">{_inline_html(block["c"])}</h{block["l"]}>')
+        elif kind == "p":
+            out.append(f"<p>{_inline_html(block['c'])}</p>")
+        elif kind in ("ul", "ol"):
+            start = f' start="{block["start"]}"' if block.get("start") else ""
+            items = "".join(f"<li>{_inline_html(item)}</li>" for item in block["items"])
+            out.append(f"<{kind}{start}>{items}</{kind}>")
+        elif kind == "quote":
+            out.append(f"<blockquote>{_blocks_html(block['c'])}</blockquote>")
+        elif kind == "code":
+            lang = f' class="language-{html.escape(block["lang"])}"' if block.get("lang") else ""
+            out.append(f"<pre><code{lang}>{html.escape(block['text'], quote=False)}</code></pre>")
+        elif kind == "hr":
+            out.append("<hr>")
+    return "\n".join(out)
+
+
+def render(source: Optional[str]) -> RenderedMarkdown:
+    text = (source or "").replace("\r\n", "\n").replace("\r", "\n")
+    blocks = _parse_blocks(text.split("\n"))
+    toc: List[Dict[str, Any]] = []
+    _assign_anchors(blocks, toc, {})
+    words = len(_WORD_RE.findall(text))
+    return RenderedMarkdown(
+        html=_blocks_html(blocks),
+        ast={"v": AST_VERSION, "blocks": blocks, "toc": toc},
+        content_hash=content_hash(source),
+        reading_minutes=max(1, math.ceil(words / WORDS_PER_MINUTE)) if words else 0,
+    )
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+"""
+Near-duplicate detection for news via simhash.
+
+Every story gets a 64-bit simhash over word bigrams of its normalized
+title+summary. Stories whose fingerprints differ in at most MAX_DISTANCE bits
+are the same story (syndicated copies, suffixed titles, trimmed teasers).
+Title+summary is short text, so the threshold is looser than the ~3 bits
+used for whole web pages; unrelated stories sit 20+ bits apart.
+
+Candidates come from an LSH index in `news_simhash_buckets`: the hash is
+split into BANDS bands of BAND_BITS bits, and two hashes within MAX_DISTANCE
+(< BANDS) bits must agree exactly on at least one band. Only canonical
+stories are indexed, so clusters stay star-shaped around their first story.
+"""
+
+from datetime import datetime, timedelta
+from hashlib import blake2b
+import html as _html
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models.news import News, NewsSimhashBucket
+
+
+BANDS = 8
+BAND_BITS = 8
+MAX_DISTANCE = 7
+MIN_TOKENS = 5
+SHINGLE = 2
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_MASK64 = (1 << 64) - 1
+
+
+def normalize(text: str) -> List[str]:
+  text = _html.unescape(_TAG_RE.sub(" ", text or ""))
+  text = unicodedata.normalize("NFKC", text).casefold()
+  return _TOKEN_RE.findall(text)
+
+
+def _feature_hash(feature: str) -> int:
+  return int.from_bytes(blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(title: str, summary: str = "") -> Optional[int]:
+  """
+  Signed 64-bit simhash (fits a BIGINT column), or None when the text is too
+  short to fingerprint without false matches.
+  """
+  tokens = normalize(f"{title} {summary}")
+  if len(tokens) < MIN_TOKENS:
+    return None
+  features = [" ".join(tokens[i:i + SHINGLE]) for i in range(len(tokens) - SHINGLE + 1)]
+  weights = [0] * 64
+  for feature in features:
+    h = _feature_hash(feature)
+    for bit in range(64):
+      weights[bit] += 1 if h >> bit & 1 else -1
+  value = 0
+  for bit in range(64):
+    if weights[bit] > 0:
+      value |= 1 << bit
+  return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming(a: int, b: int) -> int:
+  return bin((a ^ b) & _MASK64).count("1")
+
+
+def bands(value: int) -> List[Tuple[int, int]]:
+  unsigned = value & _MASK64
+  mask = (1 << BAND_BITS) - 1
+  return [(i, unsigned >> (i * BAND_BITS) & mask) for i in range(BANDS)]
+
+
+class NewsDedup:
+  @staticmethod
+  def find_canonical(db: Session, fingerprint: int, *, language: str, published_at: Optional[datetime] = None, exclude_id: Optional[str] = None) -> Optional[str]:
+    """Id of the closest canonical story within MAX_DISTANCE bits in the same language and time window."""
+    window = timedelta(days=get_settings().NEWS_DEDUP_WINDOW_DAYS)
+    around = published_at or datetime.utcnow()
+    query = (
+      db.query(News.id, News.simhash, News.published_at)
+      .join(NewsSimhashBucket, NewsSimhashBucket.news_id == News.id)
+      .filter(or_(*[and_(NewsSimhashBucket.band == b, NewsSimhashBucket.value == v) for b, v in bands(fingerprint)]))
+      .filter(News.language == language)
+      .filter(News.published_at >= around - window, News.published_at <= around + window)
+      .distinct()
+    )
+    if exclude_id:
+      query = query.filter(News.id != exclude_id)
+    best: Optional[Tuple[int, datetime, str]] = None
+    for news_id, candidate_hash, candidate_published in query.all():
+      if candidate_hash is None:
+        continue
+      key = (hamming(candidate_hash, fingerprint), candidate_published, news_id)
+      if key[0] <= MAX_DISTANCE and (best is None or key < best):
+        best = key
+    return best[2] if best else None
+
+  @staticmethod
+  def find_duplicate(db: Session, *, title: str, summary: str, language: str, published_at: Optional[datetime] = None) -> Optional[str]:
+    fingerprint = simhash(title, summary)
+    if fingerprint is None:
+      return None
+    return NewsDedup.find_canonical(db, fingerprint, language=language, published_at=published_at)
+
+  @staticmethod
+  def assign(db: Session, news: News) -> None:
+    """
+    Fingerprint `news` and link it to its cluster, indexing it as a new
+    canonical story if nothing similar exists. Caller commits.
+    """
+    fingerprint = simhash(news.title, news.summary)
+    news.simhash = fingerprint
+    if fingerprint is None:
+      news.cluster_id = news.id
+      return
+    canonical = NewsDedup.find_canonical(db, fingerprint, language=news.language, published_at=news.published_at, exclude_id=news.id)
+    if canonical is not None:
+      news.cluster_id = canonical
+      return
+    news.cluster_id = news.id
+    for band, value in bands(fingerprint):
+      db.add(NewsSimhashBucket(band=band, value=value, news_id=news.id))
+
+  @staticmethod
+  def detach(db: Session, news: News) -> None:
+    """
+    Take `news` out of its cluster before it is deleted or re-fingerprinted:
+    drop its buckets and, if it heads a cluster, promote the earliest
+    remaining member to canonical. Caller commits.
+    """
+    NewsDedup.detach_many(db, [news.id])
+
+  @staticmethod
+  def detach_many(db: Session, news_ids: Iterable[str]) -> None:
+    """`detach` for a batch of stories, e.g. rows a bulk import is about to overwrite. Caller commits."""
+    ids = list(news_ids)
+    if not ids:
+      return
+    db.query(NewsSimhashBucket).filter(NewsSimhashBucket.news_id.in_(ids)).delete(synchronize_session=False)
+    members = (
+      db.query(News)
+      .filter(News.cluster_id.in_(ids), News.id.notin_(ids))
+      .order_by(News.published_at.asc(), News.id.asc())
+      .all()
+    )
+    heads: Dict[str, News] = {}
+    for member in members:
+      head = heads.setdefault(member.cluster_id, member)
+      member.cluster_id = head.id
+    for head in heads.values():
+      if head.simhash is not None:
+        for band, value in bands(head.simhash):
+          db.add(NewsSimhashBucket(band=band, value=value, news_id=head.id))
+
+  @staticmethod
+  def backfill(db: Session, batch_size: int = 500) -> int:
+    """Cluster stories that predate fingerprinting, oldest first. Returns rows processed."""
+    rows = (
+      db.query(News)
+      .filter(News.cluster_id.is_(None))
+      .order_by(News.published_at.asc(), News.id.asc())
+      .limit(batch_size)
+      .all()
+    )
+    for news in rows:
+      NewsDedup.assign(db, news)
+      # Make this row's buckets visible to the next row's lookup
+      db.flush()
+    db.commit()
+    return len(rows)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+"""
+Full-text search over published news.
+
+PostgreSQL matches against the generated `news.search_vector` column (GIN
+indexed, see migration 0015); SQLite uses the `news_fts` FTS5 table kept in
+sync by triggers, keyed through `news_fts_keys` (migration 0024). Databases
+created without those objects (e.g. create_all in tests) fall back to a LIKE
+scan so the endpoint keeps working, unranked. Which backend an engine has is
+looked up once per engine.
+
+Results are ordered by (score, id) descending and paginated by keyset on that
+pair, so deep pages cost the same as the first one.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import weakref
+
+from sqlalchemy import or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..core.pagination import decode_cursor, encode_cursor
+from ..models.news import News
+
+
+# Text search configuration per news language. Must match the CASE expression
+# in migration 0015: rows are indexed with their own language's configuration.
+PG_CONFIGS: Dict[str, str] = {
+  "en": "english",
+  "ru": "russian",
+  "de": "german",
+  "fr": "french",
+  "it": "italian",
+}
+PG_DEFAULT_CONFIG = "simple"
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_QUERY_TOKENS = 12
+
+# engine -> "pg", "fts5" or "like"; the schema only changes with a migration
+_backends: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+_backends_lock = threading.Lock()
+
+
+def _tokens(q: str) -> List[str]:
+  return _TOKEN_RE.findall(q.lower())[:MAX_QUERY_TOKENS]
+
+
+class NewsSearch:
+  @staticmethod
+  def search(db: Session, q: str, *, language: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns ({"news", "rank", "headline"} hits, next cursor). Raises ValueError
+    for a malformed cursor.
+    """
+    after: Optional[Tuple[float, str]] = None
+    if cursor:
+      score, news_id = decode_cursor(cursor, 2)
+      if not isinstance(score, (int, float)) or not isinstance(news_id, str):
+        raise ValueError("Invalid cursor")
+      after = (float(score), news_id)
+    tokens = _tokens(q)
+    if not tokens:
+      return [], None
+
+    backend = NewsSearch._backend(db)
+    if backend == "pg":
+      ranked = NewsSearch._search_pg(db, q, language, limit, after)
+    elif backend == "fts5":
+      ranked = NewsSearch._search_fts5(db, tokens, language, limit, after)
+    else:
+      ranked = NewsSearch._search_like(db, tokens, language, limit, after)
+
+    by_id = {n.id: n for n in db.query(News).filter(News.id.in_([r[0] for r in ranked])).all()} if ranked else {}
+    hits = [
+      {"news": by_id[news_id], "rank": score, "headline": headline}
+      for news_id, score, headline in ranked
+      if news_id in by_id
+    ]
+    next_cursor = encode_cursor(ranked[-1][1], ranked[-1][0]) if ranked and len(ranked) == limit else None
+    return hits, next_cursor
+
+  @staticmethod
+  def _backend(db: Session) -> str:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _backends_lock:
+      backend = _backends.get(engine)
+    if backend is None:
+      dialect = engine.dialect.name
+      if dialect == "postgresql" and NewsSearch._has_pg_vector(db):
+        backend = "pg"
+      elif dialect == "sqlite" and NewsSearch._has_fts5_table(db):
+        backend = "fts5"
+      else:
+        backend = "like"
+      with _backends_lock:
+        _backends[engine] = backend
+    return backend
+
+  @staticmethod
+  def _has_pg_vector(db: Session) -> bool:
+    return db.execute(text(
+      "SELECT 1 FROM information_schema.columns "
+      "WHERE table_schema = current_schema() AND table_name = 'news' AND column_name = 'search_vector'"
+    )).first() is not None
+
+  @staticmethod
+  def _has_fts5_table(db: Session) -> bool:
+    return db.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts_keys'")).first() is not None
+
+  @staticmethod
+  def _search_pg(db: Session, q: str, language: Optional[str], limit: int, after: Optional[Tuple[float, str]]) -> List[Tuple[str, float, Optional[str]]]:
+    # A literal regconfig per OR-ed branch keeps `search_vector @@ query` GIN-indexable.
+    if language:
+      configs = [PG_CONFIGS.get(language, PG_DEFAULT_CONFIG)]
+    else:
+      configs = sorted(set(PG_CONFIGS.values()) | {PG_DEFAULT_CONFIG})
+    tsquery = " || ".join(f"websearch_to_tsquery('{cfg}', :q)" for cfg in configs)
+    headline_cfg = PG_CONFIGS.get(language, PG_DEFAULT_CONFIG) if language else PG_DEFAULT_CONFIG
+    params: Dict[str, Any] = {"q": q, "limit": limit}
+    filters = ["n.status = 'published'", "n.search_vector @@ x.query"]
+    if language:
+      filters.append("n.language = :language")
+      params["language"] = language
+    keyset = ""
+    if after:
+      keyset = "WHERE (r.score < :after_score OR (r.score = :after_score AND r.id < :after_id))"
+      params["after_score"], params["after_id"] = after
+    sql = f"""
+      SELECT r.id, r.score,
+        ts_headline('{headline_cfg}', coalesce(n.summary, '') || ' ' || coalesce(n.content, ''), x.query,
+          'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=30, MinWords=10') AS headline
+      FROM (
+        SELECT n.id, ts_rank_cd(n.search_vector, x.query)::float8 AS score
+        FROM news n, (SELECT {tsquery} AS query) x
+        WHERE {" AND ".join(filters)}
+      ) r
+      JOIN news n ON n.id = r.id
+      CROSS JOIN (SELECT {tsquery} AS query) x
+      {keyset}
+      ORDER BY r.score DESC, r.id DESC
+      LIMIT :limit
+    """
+    return [(row[0], float(row[1]), row[2]) for row in db.execute(text(sql), params)]
+
+  @staticmethod
+  def _search_fts5(db: Session, tokens: List[str], language: Optional[str], limit: int, after: Optional[Tuple[float, str]]) -> List[Tuple[str, float, Optional[str]]]:
+    # Every token must match, each as a prefix so partially typed words still hit.
+    match = " ".join(f'"{tok}"*' for tok in tokens)
+    params: Dict[str, Any] = {"match": match, "limit": limit}
+    filters = ["news_fts MATCH :match", "n.status = 'published'"]
+    if language:
+      filters.append("n.language = :language")
+      params["language"] = language
+    keyset = ""
+    if after:
+      keyset = "WHERE (score < :after_score OR (score = :after_score AND id < :after_id))"
+      params["after_score"], params["after_id"] = after
+    # bm25() is lower-is-better; negate so both backends rank descending.
+    # Column weights mirror the A/B/C weights of the PostgreSQL vector.
+    sql = f"""
+      SELECT id, score, headline FROM (
+        SELECT n.id AS id, -bm25(news_fts, 10.0, 4.0, 1.0) AS score,
+          snippet(news_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 24) AS headline
+        FROM news_fts
+        JOIN news_fts_keys k ON k.fts_rowid = news_fts.rowid
+        JOIN news n ON n.id = k.news_id
+        WHERE {" AND ".join(filters)}
+      )
+      {keyset}
+      ORDER BY score DESC, id DESC
+      LIMIT :limit
+    """
+    return [(row[0], float(row[1]), row[2]) for row in db.execute(text(sql), params)]
+
+  @staticmethod
+  def _search_like(db: Session, tokens: List[str], language: Optional[str], limit: int, after: Optional[Tuple[float, str]]) -> List[Tuple[str, float, Optional[str]]]:
+    query = db.query(News.id).filter(News.status == "published").order_by(News.id.desc())
+    if language:
+      query = query.filter(News.language == language)
+    for tok in tokens:
+      pattern = f"%{tok}%"
+      query = query.filter(or_(News.title.ilike(pattern), News.summary.ilike(pattern), News.content.ilike(pattern)))
+    if after:
+      query = query.filter(News.id < after[1])
+    return [(news_id, 0.0, None) for (news_id,) in query.limit(limit).all()]
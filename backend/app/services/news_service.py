@@ -1,30 +1,77 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from uuid import uuid4
 
+from ..core.cache import bump_version
+from ..core.pagination import decode_cursor, encode_cursor
 from ..models.news import News
+from .glossary_annotator import GlossaryAnnotator
+from .localization import localized_select
+from .news_dedup import NewsDedup
+
+
+_COLUMNS = tuple(c.key for c in News.__table__.columns)
+
+
+class NewsUrlTaken(ValueError):
+  """Another story already has this url (unique since migration 0020)."""
 
 
 class NewsService:
   @staticmethod
-  def list_news(db: Session, language: Optional[str] = None, limit: int = 50, *, status: Optional[str] = None, include_drafts: bool = False) -> List[News]:
-    query = db.query(News).order_by(News.published_at.desc())
+  def list_news(db: Session, language: Optional[str] = None, limit: int = 50, *, status: Optional[str] = None, include_drafts: bool = False, cursor: Optional[str] = None, collapse: bool = False) -> List[News]:
+    return NewsService.list_news_page(db, language=language, limit=limit, status=status, include_drafts=include_drafts, cursor=cursor, collapse=collapse)[0]
+
+  @staticmethod
+  def list_news_page(db: Session, language: Optional[str] = None, limit: int = 50, *, status: Optional[str] = None, include_drafts: bool = False, cursor: Optional[str] = None, collapse: bool = False, lang: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset pagination on (published_at, id), newest first.
+
+    `cursor` is the token returned for the previous page; raises ValueError if
+    it is malformed. Returns the rows and the cursor for the next page (None
+    when this page is the last one). Served by ix_news_status_language_published.
+    With `collapse`, only the canonical story of each near-duplicate cluster is listed.
+    `language` filters stories by their own language; `lang` translates them
+    (see services.localization), in which case rows are dicts.
+    """
+    stmt = localized_select(News, _COLUMNS, lang) if lang else select(News)
+    stmt = stmt.order_by(News.published_at.desc(), News.id.desc())
     if language:
-      query = query.filter(News.language == language)
+      stmt = stmt.where(News.language == language)
     if status:
-      query = query.filter(News.status == status)
+      stmt = stmt.where(News.status == status)
     elif not include_drafts:
-      query = query.filter(News.status == "published")
-    return query.limit(limit).all()
+      stmt = stmt.where(News.status == "published")
+    if collapse:
+      stmt = stmt.where(or_(News.cluster_id.is_(None), News.cluster_id == News.id))
+    if cursor:
+      published_at, news_id = decode_cursor(cursor, 2)
+      if not isinstance(published_at, datetime) or not isinstance(news_id, str):
+        raise ValueError("Invalid cursor")
+      stmt = stmt.where(tuple_(News.published_at, News.id) < (published_at, news_id))
+    result = db.execute(stmt.limit(limit))
+    rows: List[Any] = [dict(row._mapping) for row in result] if lang else list(result.scalars().all())
+    next_cursor = None
+    if rows and len(rows) == limit:
+      last = rows[-1]
+      next_cursor = encode_cursor(last["published_at"], last["id"]) if lang else encode_cursor(last.published_at, last.id)
+    return rows, next_cursor
 
   @staticmethod
   def get(db: Session, news_id: str) -> Optional[News]:
     return db.query(News).filter(News.id == news_id).first()
 
+  @staticmethod
+  def get_localized(db: Session, news_id: str, lang: str) -> Optional[Dict[str, Any]]:
+    row = db.execute(localized_select(News, _COLUMNS, lang).where(News.id == news_id)).first()
+    return dict(row._mapping) if row else None
+
   @staticmethod
   def create(db: Session, **data) -> News:
     news = News(
@@ -41,25 +88,60 @@ class NewsService:
       created_at=datetime.utcnow(),
       updated_at=datetime.utcnow(),
     )
+    NewsService._check_url(db, news.url)
+    GlossaryAnnotator.annotate(db, news)
     db.add(news)
-    db.commit()
+    NewsDedup.assign(db, news)
+    NewsService._commit(db)
+    bump_version("news")
     db.refresh(news)
     return news
 
   @staticmethod
   def update(db: Session, news: News, **data) -> News:
+    fingerprinted = (news.title, news.summary, news.language)
+    if data.get("url") is not None:
+      data["url"] = str(data["url"])
+      if data["url"] != news.url:
+        NewsService._check_url(db, data["url"], exclude_id=news.id)
     for field, value in data.items():
       if value is not None:
         setattr(news, field, value)
+    if (news.title, news.summary, news.language) != fingerprinted:
+      # The old fingerprint no longer describes the story: leave its cluster
+      # (promoting a new canonical if it headed one) and cluster it afresh
+      NewsDedup.detach(db, news)
+      NewsDedup.assign(db, news)
+    GlossaryAnnotator.annotate(db, news)
     news.updated_at = datetime.utcnow()
     db.add(news)
-    db.commit()
+    NewsService._commit(db)
+    bump_version("news")
     db.refresh(news)
     return news
 
+  @staticmethod
+  def _check_url(db: Session, url: str, exclude_id: Optional[str] = None) -> None:
+    query = db.query(News.id).filter(News.url == url)
+    if exclude_id:
+      query = query.filter(News.id != exclude_id)
+    if query.first() is not None:
+      raise NewsUrlTaken("A news story with this url already exists")
+
+  @staticmethod
+  def _commit(db: Session) -> None:
+    try:
+      db.commit()
+    except IntegrityError as exc:
+      # Lost a race with a concurrent write of the same url
+      db.rollback()
+      raise NewsUrlTaken("A news story with this url already exists") from exc
+
   @staticmethod
   def delete(db: Session, news: News) -> None:
+    NewsDedup.detach(db, news)
     db.delete(news)
     db.commit()
+    bump_version("news")
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ..core.cache import bump_version
 from ..core.config import get_settings
 
 
@@ -21,6 +22,7 @@ class RemoteConfigService:
             raise ValueError("'flags' must be an object")
         # mutate in-memory settings (ephemeral across restarts)
         settings.REMOTE_FLAGS = flags  # type: ignore[attr-defined]
+        bump_version("remote_config")
         return {
             "app_version": settings.APP_VERSION,
             "flags": settings.REMOTE_FLAGS,
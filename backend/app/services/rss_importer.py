@@ -1,20 +1,86 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, Any
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional
 from urllib.parse import urlparse, urljoin
+import itertools
 import time
 
 import feedparser
 import httpx
 from sqlalchemy.orm import Session
 
+from ..core.cache import bump_version
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..core import metrics
 from ..models.news import News
 from ..models.rss_feed import RSSFeed
+from .article_extractor import submit_extraction
+from .html_head import HeadMetaParser, read_head, sniff_charset
+from .news_dedup import NewsDedup
 from .news_service import NewsService
 from ..routers.media import UPLOAD_DIR
 
 
+log = get_logger(module="rss_importer")
+
+# Enough of the body to tell an XML feed from an HTML page
+SNIFF_BYTES = 1024
+_FEED_MARKERS = (b"<?xml", b"<rss", b"<feed", b"<rdf:rdf")
+# Metrics label for admin imports of arbitrary URLs (see core/metrics.py)
+ADHOC_FEED_LABEL = "adhoc"
+
+
+def _looks_like_feed(content_type: str, prefix: bytes) -> bool:
+  start = prefix.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+  if start.startswith((b"<!doctype html", b"<html")) or (start.startswith(b"<?xml") and b"<html" in start):
+    return False
+  if start.startswith(_FEED_MARKERS):
+    return True
+  ctype = content_type.lower()
+  return "xml" in ctype or "rss" in ctype or "atom" in ctype
+
+
+@dataclass
+class FeedImportStats:
+  """Telemetry collected while importing one feed."""
+  fetch_ms: Optional[int] = None
+  status_code: Optional[int] = None
+  bytes: int = 0
+  entries: int = 0
+  parse_ms: Optional[int] = None
+  image_bytes: int = 0
+  error: Optional[str] = None
+  # Full-article extraction: successes, failures and summed worker time
+  extracted: int = 0
+  extract_failed: int = 0
+  extract_ms: int = 0
+  extract_samples: List[int] = field(default_factory=list)
+
+  @property
+  def ok(self) -> bool:
+    return self.error is None
+
+  def fail(self, message: str) -> None:
+    # Keep the first error: later ones are usually consequences of it.
+    if self.error is None:
+      self.error = message[:500]
+
+
+@dataclass
+class FetchedDocument:
+  """A fetched feed (`body`) or HTML page (`head`, plus `body` when read in full)."""
+  body: bytes = b""
+  encoding: Optional[str] = None
+  head: Optional[HeadMetaParser] = None
+
+  def text(self) -> str:
+    return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
 class RSSImporter:
   @staticmethod
   def _fetch_text(client: httpx.Client, url: str) -> str:
@@ -27,44 +93,156 @@ class RSSImporter:
     return ""
 
   @staticmethod
-  def import_from_url(db: Session, feed_url: str, *, language: str = "uk", status: str = "draft", max_items: int = 50, download_images: bool = True) -> Dict[str, int]:
+  def _read_prefix(chunks: Iterator[bytes], size: int) -> bytes:
+    # Whole chunks, so nothing is lost when the rest of the body is read later
+    parts: List[bytes] = []
+    read = 0
+    for chunk in chunks:
+      parts.append(chunk)
+      read += len(chunk)
+      if read >= size:
+        break
+    return b"".join(parts)
+
+  @staticmethod
+  def _read_capped(chunks: Iterator[bytes], limit: int, prefix: bytes = b"") -> bytes:
+    parts = [prefix]
+    size = len(prefix)
+    for chunk in chunks:
+      if size >= limit:
+        break
+      parts.append(chunk)
+      size += len(chunk)
+    return b"".join(parts)[:limit]
+
+  @staticmethod
+  def _fetch_document(client: httpx.Client, url: str, stats: FeedImportStats, *, full_html: bool = False) -> FetchedDocument:
+    """
+    Stream `url` and sniff whether it is a feed. Feeds are read whole. For HTML
+    pages only the <head> is read (enough for OpenGraph metadata and feed
+    discovery) unless `full_html` asks for the body too.
+    """
+    settings = get_settings()
+    started = time.perf_counter()
+    try:
+      with client.stream("GET", url) as r:
+        stats.status_code = r.status_code
+        if r.status_code >= 400:
+          stats.fail(f"HTTP {r.status_code}")
+          return FetchedDocument()
+        chunks = r.iter_bytes()
+        prefix = RSSImporter._read_prefix(chunks, SNIFF_BYTES)
+        if _looks_like_feed(r.headers.get("content-type", ""), prefix):
+          body = prefix + b"".join(chunks)
+          stats.bytes = len(body)
+          return FetchedDocument(body=body)
+        encoding = r.charset_encoding or sniff_charset(prefix)
+        if full_html:
+          body = RSSImporter._read_capped(chunks, settings.ARTICLE_MAX_BYTES, prefix)
+          stats.bytes = len(body)
+          head, _ = read_head([body], encoding=encoding, max_bytes=settings.HTML_HEAD_MAX_BYTES)
+          return FetchedDocument(body=body, encoding=encoding, head=head)
+        head, read = read_head(itertools.chain([prefix], chunks), encoding=encoding, max_bytes=settings.HTML_HEAD_MAX_BYTES)
+        stats.bytes = read
+        return FetchedDocument(head=head)
+    except Exception as exc:
+      stats.fail(f"fetch failed: {type(exc).__name__}: {exc}")
+      return FetchedDocument()
+    finally:
+      stats.fetch_ms = int((time.perf_counter() - started) * 1000)
+
+  @staticmethod
+  def _download_image(client: httpx.Client, url: str, stats: FeedImportStats) -> Optional[str]:
+    r = client.get(url)
+    if r.status_code != 200:
+      return None
+    name = f"{__import__('uuid').uuid4()}.jpg"
+    (UPLOAD_DIR / name).write_bytes(r.content)
+    stats.image_bytes += len(r.content)
+    return f"/media/{name}"
+
+  @staticmethod
+  def _fetch_article(client: httpx.Client, url: str) -> str:
+    """Download an article page, reading at most ARTICLE_MAX_BYTES of it."""
+    limit = get_settings().ARTICLE_MAX_BYTES
+    with client.stream("GET", url) as r:
+      if r.status_code >= 400 or "html" not in r.headers.get("content-type", "html"):
+        return ""
+      return RSSImporter._read_capped(r.iter_bytes(), limit).decode(r.encoding or "utf-8", errors="replace")
+
+  @staticmethod
+  def _submit_extraction(html: str, url: str, stats: FeedImportStats) -> Optional[Future]:
+    if not html:
+      stats.extract_failed += 1
+      return None
+    return submit_extraction(html, url)
+
+  @staticmethod
+  def _collect_extraction(future: Optional[Future], stats: FeedImportStats) -> Optional[str]:
+    if future is None:
+      return None
+    try:
+      content, worker_ms = future.result(timeout=get_settings().ARTICLE_EXTRACT_TIMEOUT_SEC)
+    except Exception as exc:
+      future.cancel()
+      stats.extract_failed += 1
+      log.warning("article_extract_failed", error=f"{type(exc).__name__}: {exc}")
+      return None
+    stats.extract_ms += worker_ms
+    stats.extract_samples.append(worker_ms)
+    if content:
+      stats.extracted += 1
+    else:
+      stats.extract_failed += 1
+    return content
+
+  @staticmethod
+  def _is_dropped_duplicate(db: Session, data: Dict[str, Any]) -> bool:
+    if not get_settings().NEWS_DEDUP_DROP:
+      return False
+    duplicate = NewsDedup.find_duplicate(db, title=data["title"], summary=data["summary"], language=data["language"], published_at=data["published_at"])
+    if duplicate is None:
+      return False
+    log.info("rss_duplicate_dropped", url=data["url"], canonical_id=duplicate)
+    return True
+
+  @staticmethod
+  def import_from_url(db: Session, feed_url: str, *, language: str = "uk", status: str = "draft", max_items: int = 50, download_images: bool = True, extract_full: bool = False, stats: Optional[FeedImportStats] = None) -> Dict[str, int]:
+    stats = stats if stats is not None else FeedImportStats()
     client = httpx.Client(timeout=10, follow_redirects=True, headers={
       "User-Agent": "SweezyRSS/1.0 (+https://sweezy-9xyk.onrender.com)"
     })
-    text = RSSImporter._fetch_text(client, feed_url)
-    parsed = feedparser.parse(text or feed_url)
+    doc = RSSImporter._fetch_document(client, feed_url, stats, full_html=extract_full)
+    parse_started = time.perf_counter()
+    # Never hand feedparser the URL: it would re-download it outside our client and telemetry.
+    parsed = feedparser.parse(doc.body if doc.head is None else b"")
     created = updated = skipped = 0
     src = parsed.feed.get("title") if getattr(parsed, "feed", None) else (urlparse(feed_url).hostname or "RSS")
 
-    # Fallback to discover <link rel="alternate" type="application/rss+xml">
-    if not getattr(parsed, "entries", None):
-      import re as _re
-      m = _re.search(r'<link[^>]+type="application/(?:rss|atom)\+xml"[^>]+href="([^"]+)"', text, flags=_re.I) if text else None
-      if m:
-        feed_abs = urljoin(feed_url, m.group(1))
-        text2 = RSSImporter._fetch_text(client, feed_abs)
+    # HTML page: follow its <link rel="alternate" type="application/rss+xml">
+    if doc.head is not None:
+      links = doc.head.feed_links()
+      if links:
+        text2 = RSSImporter._fetch_text(client, urljoin(feed_url, links[0]))
         parsed = feedparser.parse(text2)
+        if getattr(parsed, "feed", None) and parsed.feed.get("title"):
+          src = parsed.feed.get("title")
+    stats.parse_ms = int((time.perf_counter() - parse_started) * 1000)
+    stats.entries = len(getattr(parsed, "entries", None) or [])
 
     if not getattr(parsed, "entries", None):
       # Single article import via OpenGraph
       try:
-        html = text or RSSImporter._fetch_text(client, feed_url)
-        import re as _re
-        def meta(prop=None, name=None):
-          if prop:
-            m = _re.search(rf'<meta[^>]+property=["\']{_re.escape(prop)}["\'][^>]*content=["\']([^"\']+)["\']', html, flags=_re.I)
-            if m: return m.group(1)
-          if name:
-            m = _re.search(rf'<meta[^>]+name=["\']{_re.escape(name)}["\'][^>]*content=["\']([^"\']+)["\']', html, flags=_re.I)
-            if m: return m.group(1)
-          return None
-        title = meta(prop="og:title") or meta(name="title")
-        if not title:
-          mtitle = _re.search(r'<title[^>]*>(.*?)</title>', html, flags=_re.I|_re.S)
-          title = (mtitle.group(1).strip() if mtitle else "Untitled")
-        desc = meta(prop="og:description") or meta(name="description") or ""
-        img = meta(prop="og:image") or meta(name="image")
-        pub = meta(prop="article:published_time") or meta(name="article:published_time")
+        head = doc.head
+        if head is None:
+          # Fetch failed (already recorded) or a feed without entries: nothing to import
+          client.close()
+          return {"created": created, "updated": updated, "skipped": skipped}
+        title = head.first("og:title", "twitter:title", "title") or head.title or "Untitled"
+        desc = head.first("og:description", "description", "twitter:description") or ""
+        img = head.first("og:image", "og:image:url", "og:image:secure_url", "twitter:image", "image")
+        pub = head.first("article:published_time", "og:published_time", "datepublished")
+        src = head.first("og:site_name") or src
         pub_dt = datetime.utcnow()
         try:
           p = pub.replace("Z","").split("+")[0] if pub else ""
@@ -74,20 +252,19 @@ class RSSImporter:
           pass
         image_url = None
         if img:
-          try:
-            r = client.get(urljoin(feed_url, img))
-            if r.status_code == 200 and download_images:
-              name = f"{__import__('uuid').uuid4()}.jpg"
-              (UPLOAD_DIR / name).write_bytes(r.content)
-              image_url = f"/media/{name}"
-            else:
+          image_url = img
+          if download_images:
+            try:
+              image_url = RSSImporter._download_image(client, urljoin(feed_url, img), stats) or img
+            except Exception:
               image_url = img
-          except Exception:
-            image_url = img
+        content = None
+        if extract_full:
+          content = RSSImporter._collect_extraction(RSSImporter._submit_extraction(doc.text(), feed_url, stats), stats)
         data = {
           "title": title.strip(),
           "summary": desc.strip(),
-          "content": None,
+          "content": content,
           "url": feed_url,
           "source": src,
           "language": language,
@@ -98,22 +275,27 @@ class RSSImporter:
         existing = db.query(News).filter(News.url == feed_url).first()
         if existing:
           NewsService.update(db, existing, **data); updated += 1
+        elif RSSImporter._is_dropped_duplicate(db, data):
+          skipped += 1
         else:
           NewsService.create(db, **data); created += 1
         client.close()
         return {"created": created, "updated": updated, "skipped": skipped}
-      except Exception:
+      except Exception as exc:
+        db.rollback()
+        stats.fail(f"article import failed: {type(exc).__name__}: {exc}")
         client.close()
         return {"created": created, "updated": updated, "skipped": skipped}
 
-    # Feed entries
+    # Feed entries. Pages are fetched here while earlier ones are still being
+    # extracted in the process pool; results are collected in the write pass below.
+    pending: List[tuple] = []
     for entry in getattr(parsed, "entries", [])[:max_items]:
       try:
         url = entry.get("link")
         if not url:
           skipped += 1
           continue
-        existing = db.query(News).filter(News.url == url).first()
         title = (entry.get("title") or "Untitled").strip()
         summary = entry.get("summary") or entry.get("description") or ""
         pub_dt = datetime.utcnow()
@@ -132,13 +314,16 @@ class RSSImporter:
             image_url = m.group(1)
         if image_url and download_images:
           try:
-            r = client.get(image_url)
-            if r.status_code == 200:
-              name = f"{__import__('uuid').uuid4()}.jpg"
-              (UPLOAD_DIR / name).write_bytes(r.content)
-              image_url = f"/media/{name}"
+            image_url = RSSImporter._download_image(client, image_url, stats) or image_url
           except Exception:
             pass
+        future = None
+        if extract_full:
+          try:
+            future = RSSImporter._submit_extraction(RSSImporter._fetch_article(client, url), url, stats)
+          except Exception as exc:
+            stats.extract_failed += 1
+            log.warning("article_fetch_failed", url=url, error=str(exc))
         data = {
           "title": title,
           "summary": summary,
@@ -150,29 +335,121 @@ class RSSImporter:
           "published_at": pub_dt,
           "image_url": image_url,
         }
+        pending.append((data, future))
+      except Exception as exc:
+        log.warning("rss_entry_failed", feed_url=feed_url, error=str(exc))
+        skipped += 1
+        continue
+
+    for data, future in pending:
+      try:
+        # None leaves previously extracted content untouched on update
+        data["content"] = RSSImporter._collect_extraction(future, stats)
+        existing = db.query(News).filter(News.url == data["url"]).first()
         if existing:
           NewsService.update(db, existing, **data); updated += 1
+        elif RSSImporter._is_dropped_duplicate(db, data):
+          skipped += 1
         else:
           NewsService.create(db, **data); created += 1
-      except Exception:
+      except Exception as exc:
+        db.rollback()
+        log.warning("rss_entry_failed", feed_url=feed_url, error=str(exc))
         skipped += 1
         continue
     client.close()
     return {"created": created, "updated": updated, "skipped": skipped}
 
   @staticmethod
-  def import_feed_record(db: Session, feed: RSSFeed) -> Dict[str, int]:
-    res = RSSImporter.import_from_url(
-      db,
-      feed.url,
-      language=feed.language,
-      status=feed.status,
-      max_items=feed.max_items,
-      download_images=feed.download_images,
-    )
+  def _record_stats(feed: RSSFeed, stats: FeedImportStats) -> None:
+    settings = get_settings()
+    now = datetime.utcnow()
+    feed.last_fetch_ms = stats.fetch_ms
+    feed.last_status_code = stats.status_code
+    feed.last_bytes = stats.bytes
+    feed.last_entries = stats.entries
+    feed.last_parse_ms = stats.parse_ms
+    feed.last_image_bytes = stats.image_bytes
+    feed.last_error = stats.error
+    feed.last_extracted = stats.extracted if feed.extract_full else None
+    feed.last_extract_failed = stats.extract_failed if feed.extract_full else None
+    feed.last_extract_ms = stats.extract_ms if feed.extract_full else None
+
+    if stats.ok:
+      feed.consecutive_failures = 0
+      feed.next_attempt_at = None
+      fetch_ms = stats.fetch_ms or 0
+      sample = 100.0 if fetch_ms < 2000 else 75.0 if fetch_ms < 10000 else 50.0
+    else:
+      # Exponential backoff so chronically failing feeds stop taking scheduler slots.
+      feed.consecutive_failures = (feed.consecutive_failures or 0) + 1
+      delay = min(
+        settings.FEED_BACKOFF_MAX_SEC,
+        settings.FEED_IMPORT_INTERVAL_SEC * 2 ** (feed.consecutive_failures - 1),
+      )
+      feed.next_attempt_at = now + timedelta(seconds=delay)
+      sample = 0.0
+    previous = feed.health_score if feed.health_score is not None else 100.0
+    feed.health_score = round(0.7 * previous + 0.3 * sample, 1)
+    RSSImporter.record_metrics(feed.url, stats)
+
+  @staticmethod
+  def record_metrics(label: str, stats: FeedImportStats) -> None:
+    """Export one import's telemetry; `label` is the feed URL, or ADHOC_FEED_LABEL."""
+    if stats.fetch_ms is not None:
+      metrics.RSS_FETCH_SECONDS.labels(feed=label).observe(stats.fetch_ms / 1000)
+      metrics.RSS_FETCH_BYTES.labels(feed=label).observe(stats.bytes)
+    if stats.parse_ms is not None:
+      metrics.RSS_PARSE_SECONDS.labels(feed=label).observe(stats.parse_ms / 1000)
+    metrics.RSS_ENTRIES.labels(feed=label).observe(stats.entries)
+    metrics.RSS_IMAGE_BYTES.labels(feed=label).observe(stats.image_bytes)
+    for worker_ms in stats.extract_samples:
+      metrics.RSS_EXTRACT_SECONDS.labels(feed=label).observe(worker_ms / 1000)
+    if stats.extracted:
+      metrics.RSS_EXTRACTIONS_TOTAL.labels(feed=label, outcome="ok").inc(stats.extracted)
+    if stats.extract_failed:
+      metrics.RSS_EXTRACTIONS_TOTAL.labels(feed=label, outcome="error").inc(stats.extract_failed)
+    metrics.RSS_IMPORTS_TOTAL.labels(feed=label, outcome="ok" if stats.ok else "error").inc()
+
+  @staticmethod
+  def import_feed_record(db: Session, feed: RSSFeed) -> Dict[str, Any]:
+    stats = FeedImportStats()
+    try:
+      res: Dict[str, Any] = RSSImporter.import_from_url(
+        db,
+        feed.url,
+        language=feed.language,
+        status=feed.status,
+        max_items=feed.max_items,
+        download_images=feed.download_images,
+        extract_full=feed.extract_full,
+        stats=stats,
+      )
+    except Exception as exc:
+      db.rollback()
+      stats.fail(f"{type(exc).__name__}: {exc}")
+      res = {"created": 0, "updated": 0, "skipped": 0}
     feed.last_imported_at = datetime.utcnow()
+    RSSImporter._record_stats(feed, stats)
     db.add(feed)
     db.commit()
+    if res.get("created") or res.get("updated"):
+      bump_version("news")
+    log.info(
+      "rss_feed_imported",
+      feed_id=feed.id,
+      ok=stats.ok,
+      fetch_ms=stats.fetch_ms,
+      bytes=stats.bytes,
+      entries=stats.entries,
+      parse_ms=stats.parse_ms,
+      image_bytes=stats.image_bytes,
+      extracted=stats.extracted,
+      extract_failed=stats.extract_failed,
+      extract_ms=stats.extract_ms,
+      error=stats.error,
+      **res,
+    )
+    if stats.error:
+      res["error"] = stats.error
     return res
-
-
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+"""
+Delta sync over the `content_changes` feed.
+
+Clients keep an opaque cursor (the last change sequence they applied) and ask
+for everything after it. Each page carries the current representation of
+changed rows plus tombstones for rows that were deleted or are no longer
+visible (unpublished, unapproved), so a client never has to re-download a
+full list once it holds a cursor.
+
+Sequence numbers are taken at flush time, so a slower transaction can commit
+a lower seq after a faster one. Changes younger than `SYNC_SETTLE_SEC` are
+therefore held back (`settle_cutoff`): by the time a change is served, lower
+sequences have had that long to commit. A transaction that stays open longer
+than that between its flush and its commit can still land behind a cursor
+already handed out; keep write transactions short. Other readers that follow
+the feed by sequence (search, translation memory, glossary, content bundle)
+use the same rule through `settled_seq`.
+"""
+
+from datetime import datetime, timedelta, timezone
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session, aliased
+
+from ..core.cache import get_versions
+from ..core.config import get_settings
+from ..core.pagination import decode_cursor, encode_cursor
+from ..models import Checklist, Guide, Template
+from ..models.content_change import ContentChange
+from ..models.glossary import GlossaryTerm
+from ..models.news import News
+from ..models.translation import Translation
+from ..schemas import ChecklistOut, GuideOut, TemplateOut
+from ..schemas.news import NewsOut
+from ..schemas.sync import SyncPage
+from ..schemas.translation import GlossaryTermOut, TranslationOut
+
+
+ENTITIES: Dict[str, Tuple[Any, Type[BaseModel]]] = {
+    "guides": (Guide, GuideOut),
+    "checklists": (Checklist, ChecklistOut),
+    "templates": (Template, TemplateOut),
+    "news": (News, NewsOut),
+    "glossary_terms": (GlossaryTerm, GlossaryTermOut),
+    "translations": (Translation, TranslationOut),
+}
+
+# Seconds between feed polls by a ChangeFollower that saw no local write
+REFRESH_INTERVAL_SEC = 2.0
+# More pending changes than this and a follower rebuilds instead
+MAX_INCREMENTAL_CHANGES = 2000
+
+
+def _visible(entity: str, row: Any) -> bool:
+    if entity == "glossary_terms":
+        return True
+    if entity == "translations":
+        return row.status == "approved"
+    return row.status == "published"
+
+
+def settle_cutoff() -> datetime:
+    """Changes stamped after this may still have lower sequences in flight."""
+    return datetime.now(timezone.utc) - timedelta(seconds=get_settings().SYNC_SETTLE_SEC)
+
+
+def settled_seq(db: Session) -> int:
+    """
+    Highest sequence a reader may move its position past: every lower
+    sequence is either visible now or will never appear.
+    """
+    return db.execute(select(func.max(ContentChange.seq)).where(ContentChange.changed_at <= settle_cutoff())).scalar() or 0
+
+
+class ChangeFollower:
+    """
+    Keeps an in-process structure in step with the feed for `entities`.
+
+    The owner supplies `rebuild(db)`, which builds from the rows as they are
+    now and swaps the result in, and `apply(db, changes)`, which updates it
+    for a batch of (seq, entity, entity_id) rows. The follower decides when
+    to poll, how far it may move past the changes it applied (`settled_seq`)
+    and when a full rebuild is cheaper than applying the backlog. `apply`
+    runs under `lock`; `rebuild` builds outside it and swaps under it. The
+    owner holds the same lock while reading.
+    """
+
+    def __init__(
+        self,
+        entities: Sequence[str],
+        rebuild: Callable[[Session], int],
+        apply: Callable[[Session, list], None],
+        *,
+        lock: Optional[threading.RLock] = None,
+    ) -> None:
+        self.entities = tuple(entities)
+        self.lock = lock or threading.RLock()
+        self._rebuild = rebuild
+        self._apply = apply
+        self._built = False
+        self._last_seq = 0
+        self._checked_at = 0.0
+        self._seen_versions: Tuple[int, ...] = ()
+
+    def rebuild(self, db: Session) -> int:
+        """Rebuild through the owner's callback. Returns what the callback returns."""
+        # Rows are read as they are now; changes past the settled point are
+        # re-applied by the next refresh in case a lower seq commits late
+        last_seq = settled_seq(db)
+        result = self._rebuild(db)
+        with self.lock:
+            self._last_seq = last_seq
+            self._checked_at = time.monotonic()
+            self._built = True
+        return result
+
+    def refresh(self, db: Session, *, force: bool = False) -> None:
+        """Apply changes committed since the last refresh (any worker's)."""
+        versions = get_versions(self.entities)
+        with self.lock:
+            if not self._built:
+                self.rebuild(db)
+                self._seen_versions = versions
+                return
+            local_write = versions != self._seen_versions
+            if not force and not local_write and time.monotonic() - self._checked_at < REFRESH_INTERVAL_SEC:
+                return
+            # Read first: anything it counts as settled is visible to the query below
+            settled = settled_seq(db)
+            changes = db.execute(
+                select(ContentChange.seq, ContentChange.entity, ContentChange.entity_id)
+                .where(ContentChange.seq > self._last_seq, ContentChange.entity.in_(self.entities))
+                .order_by(ContentChange.seq.asc())
+                .limit(MAX_INCREMENTAL_CHANGES + 1)
+            ).all()
+            self._checked_at = time.monotonic()
+            self._seen_versions = versions
+            if not changes:
+                return
+            if len(changes) > MAX_INCREMENTAL_CHANGES:
+                self.rebuild(db)
+                return
+            self._apply(db, changes)
+            # Only move past settled changes: a slower transaction can still commit
+            # a lower seq than the newest one applied here
+            self._last_seq = max(self._last_seq, min(changes[-1].seq, settled))
+
+
+class SyncService:
+    @staticmethod
+    def changes_since(db: Session, cursor: Optional[str], *, limit: int = 500) -> SyncPage:
+        """Raises ValueError for a malformed cursor."""
+        since = 0
+        if cursor:
+            (since,) = decode_cursor(cursor, 1)
+            if not isinstance(since, int) or since < 0:
+                raise ValueError("Invalid cursor")
+
+        rows = db.execute(
+            select(ContentChange.seq, ContentChange.entity, ContentChange.entity_id, ContentChange.op, ContentChange.changed_at)
+            .where(ContentChange.seq > since)
+            .order_by(ContentChange.seq.asc())
+            .limit(limit)
+        ).all()
+        has_more = len(rows) == limit
+
+        # Stop before very recent changes so late commits of lower sequences
+        # are still ahead of the cursor we hand out
+        settle = settle_cutoff()
+        retry_after: Optional[int] = None
+        page: List[Any] = []
+        for row in rows:
+            changed_at = row.changed_at if row.changed_at.tzinfo else row.changed_at.replace(tzinfo=timezone.utc)
+            if changed_at > settle:
+                # Nothing more is servable yet; tell the client when it will be
+                has_more = False
+                retry_after = max(1, math.ceil((changed_at - settle).total_seconds()))
+                break
+            page.append(row)
+
+        latest: Dict[Tuple[str, str], str] = {}
+        for row in page:
+            if row.entity in ENTITIES:
+                latest[(row.entity, row.entity_id)] = row.op
+
+        upserts: Dict[str, List[Dict[str, Any]]] = {}
+        deletes: Dict[str, List[str]] = {}
+        for entity, (model, schema) in ENTITIES.items():
+            ids = [entity_id for (e, entity_id), op in latest.items() if e == entity and op == "upsert"]
+            gone = [entity_id for (e, entity_id), op in latest.items() if e == entity and op == "delete"]
+            if ids:
+                found = {str(r.id): r for r in db.execute(select(model).where(model.id.in_(ids))).scalars()}
+                for entity_id in ids:
+                    obj = found.get(entity_id)
+                    if obj is not None and _visible(entity, obj):
+                        upserts.setdefault(entity, []).append(schema.model_validate(obj).model_dump(mode="json"))
+                    else:
+                        gone.append(entity_id)
+            if gone:
+                deletes[entity] = gone
+
+        next_seq = page[-1].seq if page else since
+        return SyncPage(upserts=upserts, deletes=deletes, cursor=encode_cursor(next_seq), has_more=has_more, retry_after=retry_after)
+
+    @staticmethod
+    def compact(db: Session) -> int:
+        """
+        Drop change rows superseded by a later change to the same row. A client
+        resuming from any cursor still sees the latest state of everything
+        changed after it. Returns the number of rows removed.
+        """
+        newer = aliased(ContentChange)
+        superseded = (
+            select(newer.seq)
+            .where(newer.entity == ContentChange.entity, newer.entity_id == ContentChange.entity_id, newer.seq > ContentChange.seq)
+            .exists()
+        )
+        result = db.execute(delete(ContentChange).where(superseded))
+        db.commit()
+        return result.rowcount or 0
@@ -1,34 +1,56 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from ..core.cache import bump_version
 from ..models import Template
 from ..schemas import TemplateCreate, TemplateUpdate
+from .localization import localized_select
 
 
 class TemplateService:
+    # List-screen projection: everything but the content body
+    SUMMARY_FIELDS = ("id", "name", "category", "status")
+
     @staticmethod
-    def list(db: Session, *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False) -> List[Template]:
-        stmt = select(Template)
+    def _visible(stmt: Select, status: str | None, include_drafts: bool) -> Select:
         if status:
             stmt = stmt.where(getattr(Template, "status", None) == status)  # type: ignore[attr-defined]
         elif not include_drafts and hasattr(Template, "status"):
             stmt = stmt.where(Template.status == "published")  # type: ignore[attr-defined]
+        return stmt
+
+    @staticmethod
+    def list(db: Session, *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False) -> List[Template]:
+        stmt = TemplateService._visible(select(Template), status, include_drafts)
         stmt = stmt.offset(offset).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
+    @staticmethod
+    def list_fields(db: Session, fields: Sequence[str], *, offset: int = 0, limit: int = 100, status: str | None = None, include_drafts: bool = False, language: str | None = None) -> List[Dict[str, Any]]:
+        """`list` selecting only the `fields` columns (see core.projection), translated into `language` if given; rows come back as dicts."""
+        stmt = TemplateService._visible(localized_select(Template, fields, language), status, include_drafts)
+        stmt = stmt.offset(offset).limit(limit)
+        return [dict(row._mapping) for row in db.execute(stmt)]
+
     @staticmethod
     def get(db: Session, template_id: str) -> Optional[Template]:
         return db.get(Template, template_id)
 
+    @staticmethod
+    def get_localized(db: Session, template_id: str, fields: Sequence[str], language: str) -> Optional[Dict[str, Any]]:
+        row = db.execute(localized_select(Template, fields, language).where(Template.id == template_id)).first()
+        return dict(row._mapping) if row else None
+
     @staticmethod
     def create(db: Session, data: TemplateCreate) -> Template:
         obj = Template(**data.model_dump())
         db.add(obj)
         db.commit()
+        bump_version("templates")
         db.refresh(obj)
         return obj
 
@@ -38,6 +60,7 @@ class TemplateService:
             setattr(template, key, value)
         db.add(template)
         db.commit()
+        bump_version("templates")
         db.refresh(template)
         return template
 
@@ -45,5 +68,6 @@ class TemplateService:
     def delete(db: Session, template: Template) -> None:
         db.delete(template)
         db.commit()
+        bump_version("templates")
 
 
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+"""
+Revocation of single-use tokens (refresh and password-reset tokens).
+
+Every such token carries a `jti`. Using it records the id in the
+`revoked_tokens` table; the primary key makes "use once" hold across
+workers, since a second insert of the same id fails. A Bloom filter in front
+of the table answers "was this id ever used?" in memory: a negative is
+certain, so a fresh token is never read back from the table, and only
+(rare) positives are confirmed by primary-key lookup. A Bloom filter cannot
+forget entries, so it is rebuilt from the table after the expired rows are
+purged, or when it outgrows its capacity.
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import math
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..models.revoked_token import RevokedToken
+
+
+log = get_logger(module="token_revocation")
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.num_bits = max(int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)), 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TokenRevocation:
+    _filter: Optional[BloomFilter] = None
+    _lock = threading.RLock()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Load the ids of unexpired revoked tokens into a fresh filter. Returns the id count."""
+        settings = get_settings()
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        jtis = db.execute(select(RevokedToken.jti).where(RevokedToken.expires_at > now)).scalars().all()
+        bloom = BloomFilter(max(settings.REVOKED_TOKENS_BLOOM_CAPACITY, len(jtis) * 2), settings.REVOKED_TOKENS_BLOOM_FP_RATE)
+        for jti in jtis:
+            bloom.add(jti)
+        with TokenRevocation._lock:
+            TokenRevocation._filter = bloom
+        log.info("token_revocation_loaded", tokens=len(jtis), duration_ms=int((time.perf_counter() - started) * 1000))
+        return len(jtis)
+
+    @staticmethod
+    def _bloom(db: Session) -> BloomFilter:
+        bloom = TokenRevocation._filter
+        if bloom is None or bloom.count > bloom.capacity:
+            TokenRevocation.rebuild(db)
+            bloom = TokenRevocation._filter
+        return bloom
+
+    @staticmethod
+    def is_revoked(db: Session, jti: str) -> bool:
+        if jti not in TokenRevocation._bloom(db):
+            return False
+        return db.get(RevokedToken, jti) is not None
+
+    @staticmethod
+    def revoke(db: Session, jti: str, subject: str, expires_at: datetime) -> bool:
+        """
+        Mark a token id as used. Returns False when it already was (by this or
+        another worker), so callers can use this as the one-time-use check.
+        Commits.
+        """
+        if TokenRevocation.is_revoked(db, jti):
+            return False
+        db.add(RevokedToken(jti=jti, subject=subject, expires_at=expires_at, revoked_at=datetime.now(timezone.utc)))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Concurrent use of the same token
+            db.rollback()
+            revoked = False
+        else:
+            revoked = True
+        with TokenRevocation._lock:
+            TokenRevocation._bloom(db).add(jti)
+        return revoked
+
+    @staticmethod
+    def purge(db: Session) -> int:
+        """Delete rows of tokens that have expired anyway, then rebuild the filter. Returns rows removed."""
+        result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+        db.commit()
+        removed = result.rowcount or 0
+        if removed:
+            TokenRevocation.rebuild(db)
+        return removed
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+"""
+Translation memory: fuzzy lookup of previously approved translations.
+
+Approved translations are split into sentence segments and paired with the
+matching segments of the base-language row, field by field. A field is only
+used when both sides split into the same number of segments; otherwise the
+pairing is ambiguous and the field is skipped.
+
+Source segments are indexed by character trigrams, per target language. A
+lookup counts shared trigrams over the rarest trigrams of the query (very
+common ones cost the most to scan and say the least), keeps candidates whose
+length could still reach `min_score`, and verifies the best-overlapping ones
+with an exact edit distance (Myers/Hyyrö bit-parallel Levenshtein). Scores
+are `1 - distance / max(len)` on normalized text.
+
+Like ContentSearch, the memory follows writes through the `content_changes`
+feed and re-indexes the affected (entity, entity_id) groups.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+import heapq
+from operator import itemgetter
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.logging import get_logger
+from ..models import Checklist, Guide, Template
+from ..models.news import News
+from ..models.translation import Translation
+from .localization import TRANSLATED_COLUMNS
+from .sync import ChangeFollower
+
+
+log = get_logger(module="translation_memory")
+
+GRAM = 3
+MIN_SEGMENT_CHARS = 3
+# Posting entries counted per lookup; rarer trigrams are counted first
+CANDIDATE_BUDGET = 20000
+# Candidates verified with the exact edit distance
+MAX_VERIFY = 64
+# Freed slots stay in the posting lists until they outnumber live ones
+COMPACT_MIN_DEAD = 1024
+
+ENTITIES = tuple(TRANSLATED_COLUMNS)
+_MODELS = {"guides": Guide, "checklists": Checklist, "templates": Template, "news": News}
+
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?…])\s+(?=\S)")
+# Markdown block markers that are not part of the sentence
+_BLOCK_MARKER_RE = re.compile(r"^\s*(?:#{1,6}\s+|[-*+]\s+|\d{1,9}[.)]\s+|>\s?)+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def segment(text: Optional[str]) -> List[str]:
+    """Split text into sentences: one or more per line, Markdown markers stripped."""
+    segments: List[str] = []
+    for line in (text or "").splitlines():
+        line = _BLOCK_MARKER_RE.sub("", line).strip()
+        for sentence in _SENTENCE_BREAK_RE.split(line):
+            sentence = sentence.strip()
+            if len(sentence) >= MIN_SEGMENT_CHARS and any(c.isalpha() for c in sentence):
+                segments.append(sentence)
+    return segments
+
+
+def normalize(text: str) -> str:
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def trigrams(norm: str) -> Set[str]:
+    padded = f" {norm} "
+    return {padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)}
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    bit = 1
+    for ch in pattern:
+        masks[ch] = masks.get(ch, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def _myers_distance(masks: Dict[str, int], m: int, text: str) -> int:
+    """Levenshtein distance between the pattern behind `masks` (length m) and `text`."""
+    if not m:
+        return len(text)
+    full = (1 << m) - 1
+    top = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    get = masks.get
+    for ch in text:
+        eq = get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & top:
+            score += 1
+        elif mh & top:
+            score -= 1
+        ph = (ph << 1) | 1
+        pv = ((mh << 1) | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+def levenshtein(a: str, b: str) -> int:
+    return _myers_distance(_pattern_masks(a), len(a), b)
+
+
+@dataclass(frozen=True)
+class Segment:
+    entity: str
+    entity_id: str
+    translation_id: str
+    language: str
+    field: str
+    source: str
+    target: str
+
+
+class SegmentIndex:
+    """Trigram inverted index of source segments, grouped by (entity, entity_id) for replacement."""
+
+    def __init__(self) -> None:
+        self._segments: List[Optional[Segment]] = []
+        self._norms: List[str] = []
+        # language -> trigram -> slots; removed slots are skipped until compaction
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._groups: Dict[Tuple[str, str], List[int]] = {}
+        self._count = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, seg: Segment) -> None:
+        norm = normalize(seg.source)
+        if not norm:
+            return
+        idx = len(self._segments)
+        self._segments.append(seg)
+        self._norms.append(norm)
+        postings = self._postings.setdefault(seg.language, {})
+        for gram in trigrams(norm):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = [idx]
+            else:
+                posting.append(idx)
+        self._groups.setdefault((seg.entity, seg.entity_id), []).append(idx)
+        self._count += 1
+
+    def remove_group(self, entity: str, entity_id: str) -> None:
+        for idx in self._groups.pop((entity, entity_id), []):
+            self._segments[idx] = None
+            self._count -= 1
+            self._dead += 1
+        if self._dead >= COMPACT_MIN_DEAD and self._dead > self._count:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [seg for seg in self._segments if seg is not None]
+        self.__init__()
+        for seg in live:
+            self.add(seg)
+
+    def suggest(self, source: str, language: str, *, limit: int = 5, min_score: float = 0.5) -> List[Tuple[Segment, float]]:
+        norm = normalize(source)
+        postings = self._postings.get(language)
+        if not norm or not postings:
+            return []
+        lists = sorted((p for p in (postings.get(g) for g in trigrams(norm)) if p), key=len)
+        counts: Counter = Counter()
+        scanned = 0
+        for posting in lists:
+            if scanned and scanned + len(posting) > CANDIDATE_BUDGET:
+                break
+            counts.update(posting)
+            scanned += len(posting)
+
+        # ratio >= min_score needs min_score * longer <= shorter
+        length = len(norm)
+        shortest, longest = length * min_score, length / min_score if min_score > 0 else float("inf")
+        segments, norms = self._segments, self._norms
+        # Overlap ranking first (cheap), then the per-segment length and liveness checks
+        ranked = heapq.nlargest(MAX_VERIFY * 4, counts.items(), key=itemgetter(1))
+        candidates = [
+            item for item in ranked
+            if segments[item[0]] is not None and shortest <= len(norms[item[0]]) <= longest
+        ][:MAX_VERIFY]
+
+        masks = _pattern_masks(norm)
+        best: Dict[Tuple[str, str], Tuple[Segment, float]] = {}
+        for idx, _ in candidates:
+            other = norms[idx]
+            score = 1.0 - _myers_distance(masks, length, other) / max(length, len(other))
+            if score < min_score:
+                continue
+            seg = segments[idx]
+            # The same sentence pair recurs across documents; report it once
+            key = (other, seg.target)
+            if key not in best or best[key][1] < score:
+                best[key] = (seg, score)
+        return sorted(best.values(), key=lambda pair: -pair[1])[:limit]
+
+
+def _segment_pairs(entity: str, row, translation: Translation) -> List[Segment]:
+    pairs: List[Segment] = []
+    for column, field in TRANSLATED_COLUMNS[entity].items():
+        sources, targets = segment(getattr(row, column)), segment(getattr(translation, field))
+        if not sources or len(sources) != len(targets):
+            continue
+        pairs.extend(
+            Segment(entity, row.id, translation.id, translation.language, field, s, t) for s, t in zip(sources, targets)
+        )
+    return pairs
+
+
+def _index_rows(index: SegmentIndex, db: Session, entity: str, ids: Optional[Sequence[str]] = None) -> None:
+    model = _MODELS[entity]
+    stmt = select(Translation).where(Translation.entity == entity, Translation.status == "approved")
+    if ids is not None:
+        stmt = stmt.where(Translation.entity_id.in_(ids))
+    translations: Dict[str, List[Translation]] = {}
+    for t in db.execute(stmt).scalars():
+        translations.setdefault(t.entity_id, []).append(t)
+    if not translations:
+        return
+    columns = [getattr(model, c) for c in TRANSLATED_COLUMNS[entity]]
+    entity_ids = list(translations)
+    for start in range(0, len(entity_ids), 500):
+        chunk = entity_ids[start:start + 500]
+        for row in db.execute(select(model.id, *columns).where(model.id.in_(chunk))):
+            for t in translations[row.id]:
+                for seg in _segment_pairs(entity, row, t):
+                    index.add(seg)
+
+
+class TranslationMemory:
+    _index: Optional[SegmentIndex] = None
+    # translation id -> (entity, entity_id), to re-index after a translation is deleted
+    _translation_groups: Dict[str, Tuple[str, str]] = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Build a fresh memory from the database and swap it in. Returns the segment count."""
+        return _follower.rebuild(db)
+
+    @staticmethod
+    def refresh(db: Session, *, force: bool = False) -> None:
+        """Apply content changes committed since the last refresh (any worker's)."""
+        _follower.refresh(db, force=force)
+
+    @staticmethod
+    def _build(db: Session) -> int:
+        started = time.perf_counter()
+        index = SegmentIndex()
+        for entity in ENTITIES:
+            _index_rows(index, db, entity)
+        groups = {
+            t_id: (entity, entity_id)
+            for t_id, entity, entity_id in db.execute(
+                select(Translation.id, Translation.entity, Translation.entity_id).where(Translation.entity.in_(ENTITIES))
+            )
+        }
+        with TranslationMemory._lock:
+            TranslationMemory._index = index
+            TranslationMemory._translation_groups = groups
+        log.info("translation_memory_built", segments=len(index), duration_ms=int((time.perf_counter() - started) * 1000))
+        return len(index)
+
+    @staticmethod
+    def _apply(db: Session, changes: list) -> None:
+        index = TranslationMemory._index
+        groups: Set[Tuple[str, str]] = set()
+        translation_ids = [c.entity_id for c in changes if c.entity == "translations"]
+        if translation_ids:
+            for t_id, entity, entity_id in db.execute(
+                select(Translation.id, Translation.entity, Translation.entity_id).where(Translation.id.in_(translation_ids))
+            ):
+                TranslationMemory._translation_groups[t_id] = (entity, entity_id)
+        for change in changes:
+            if change.entity in ENTITIES:
+                groups.add((change.entity, change.entity_id))
+            elif change.entity == "translations":
+                group = TranslationMemory._translation_groups.get(change.entity_id)
+                if group is not None and group[0] in ENTITIES:
+                    groups.add(group)
+        by_entity: Dict[str, List[str]] = {}
+        for entity, entity_id in groups:
+            index.remove_group(entity, entity_id)
+            by_entity.setdefault(entity, []).append(entity_id)
+        for entity, ids in by_entity.items():
+            _index_rows(index, db, entity, ids)
+
+    @staticmethod
+    def suggest(
+        db: Session,
+        source: str,
+        language: str,
+        *,
+        limit: int = 5,
+        min_score: float = 0.5,
+    ) -> List[Tuple[Segment, float]]:
+        TranslationMemory.refresh(db)
+        with TranslationMemory._lock:
+            return TranslationMemory._index.suggest(source, language, limit=limit, min_score=min_score)
+
+
+_follower = ChangeFollower(ENTITIES + ("translations",), TranslationMemory._build, TranslationMemory._apply, lock=TranslationMemory._lock)
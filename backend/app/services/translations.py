@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from sqlalchemy import and_, exists, func, literal, select, true, tuple_, union_all, update
+from sqlalchemy.orm import Session
+
+from ..core.cache import bump_version, get_versions
+from ..core.config import get_settings
+from ..core.database import upsert_insert
+from ..models import Checklist, Guide, Template
+from ..models.content_change import record_changes
+from ..models.translation import Translation
+from ..schemas.translation import TranslationUpsert
+
+
+_TEXT_FIELDS = ("title", "description", "content")
+
+COVERAGE_LANGUAGES = ("uk", "ru", "en")
+COVERAGE_STATUSES = ("approved", "pending", "rejected", "missing")
+# Content whose translations editors track, with the column shown as its title
+COVERAGE_ENTITIES = {"guides": (Guide, Guide.title), "checklists": (Checklist, Checklist.title), "templates": (Template, Template.name)}
+
+
+# Coverage results are kept until one of these tables is written (locally),
+# or RESPONSE_CACHE_TTL_SEC passes (another worker's write)
+COVERAGE_TABLES = ("translations", "guides", "checklists", "templates")
+COVERAGE_CACHE_MAX_ENTRIES = 128
+
+_coverage_cache: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[int, ...], float, Any]]" = OrderedDict()
+_coverage_lock = threading.Lock()
+
+
+def _cached_coverage(key: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+    # Read before computing: a write that lands meanwhile invalidates the result
+    versions = get_versions(COVERAGE_TABLES)
+    ttl = get_settings().RESPONSE_CACHE_TTL_SEC
+    with _coverage_lock:
+        entry = _coverage_cache.get(key)
+        if entry is not None and entry[0] == versions and time.monotonic() - entry[1] <= ttl:
+            _coverage_cache.move_to_end(key)
+            return copy.deepcopy(entry[2])
+    result = compute()
+    with _coverage_lock:
+        _coverage_cache[key] = (versions, time.monotonic(), result)
+        _coverage_cache.move_to_end(key)
+        while len(_coverage_cache) > COVERAGE_CACHE_MAX_ENTRIES:
+            _coverage_cache.popitem(last=False)
+    return copy.deepcopy(result)
+
+
+def _published_content():
+    return union_all(*[
+        select(literal(entity).label("entity"), model.id.label("id")).where(model.status == "published")
+        for entity, (model, _) in COVERAGE_ENTITIES.items()
+    ]).subquery("content")
+
+
+class TranslationService:
+    @staticmethod
+    def upsert_many(db: Session, items: Sequence[TranslationUpsert], author_email: Optional[str]) -> Dict[str, Any]:
+        """
+        Insert or update translations keyed by (entity, entity_id, language) in
+        one transaction. As with the single-row endpoint, fields and status
+        left out keep their stored values, and author_email is only set on
+        insert. A later item for the same key wins.
+        """
+        latest: Dict[Tuple[str, str, str], TranslationUpsert] = {}
+        for item in items:
+            latest[(item.entity, item.entity_id, item.language)] = item
+        key = tuple_(Translation.entity, Translation.entity_id, Translation.language)
+        existing = {
+            (entity, entity_id, language): row_id
+            for row_id, entity, entity_id, language in db.execute(
+                select(Translation.id, Translation.entity, Translation.entity_id, Translation.language).where(key.in_(list(latest)))
+            )
+        }
+        rows: List[Dict[str, Any]] = []
+        for k, item in latest.items():
+            row = item.model_dump()
+            row["id"] = existing.get(k) or str(uuid4())
+            row["author_email"] = author_email
+            rows.append(row)
+
+        stmt = upsert_insert(db, Translation.__table__)
+        if stmt is not None:
+            # Rows with and without a status need different SET clauses
+            for with_status in (True, False):
+                group = [r for r in rows if (r["status"] is not None) == with_status]
+                if not group:
+                    continue
+                if not with_status:
+                    group = [{**r, "status": "pending"} for r in group]
+                set_ = {f: func.coalesce(stmt.excluded[f], Translation.__table__.c[f]) for f in _TEXT_FIELDS}
+                set_["updated_at"] = func.now()
+                if with_status:
+                    set_["status"] = stmt.excluded.status
+                db.execute(stmt.on_conflict_do_update(index_elements=["entity", "entity_id", "language"], set_=set_), group)
+        else:
+            for row in rows:
+                k = (row["entity"], row["entity_id"], row["language"])
+                if k in existing:
+                    values = {f: row[f] for f in (*_TEXT_FIELDS, "status") if row[f] is not None}
+                    if values:
+                        db.execute(update(Translation).where(Translation.id == row["id"]).values(**values))
+                else:
+                    db.add(Translation(**{**row, "status": row["status"] or "pending"}))
+        record_changes(db, "translations", [r["id"] for r in rows])
+        db.commit()
+        bump_version("translations")
+        return {
+            "created": len(rows) - len(existing),
+            "updated": len(existing),
+            "items": [{"id": r["id"], "entity": r["entity"], "entity_id": r["entity_id"], "language": r["language"]} for r in rows],
+        }
+
+    @staticmethod
+    def coverage(db: Session, languages: Sequence[str] = COVERAGE_LANGUAGES) -> Dict[str, Any]:
+        """
+        Translation status counts of published content per entity and language,
+        in one grouped query: content x languages LEFT JOIN translations, where
+        no translation row counts as "missing". Cached until the next write.
+        """
+        languages = tuple(languages)
+        return _cached_coverage(("coverage", languages), lambda: TranslationService._coverage(db, languages))
+
+    @staticmethod
+    def _coverage(db: Session, languages: Sequence[str]) -> Dict[str, Any]:
+        content = _published_content()
+        langs = union_all(*[select(literal(lang).label("language")) for lang in languages]).subquery("langs")
+        status = func.coalesce(Translation.status, "missing")
+        stmt = (
+            select(content.c.entity, langs.c.language, status, func.count())
+            .select_from(content.join(langs, true()))
+            .outerjoin(
+                Translation,
+                and_(
+                    Translation.entity == content.c.entity,
+                    Translation.entity_id == content.c.id,
+                    Translation.language == langs.c.language,
+                ),
+            )
+            .group_by(content.c.entity, langs.c.language, status)
+        )
+        matrix = {
+            entity: {lang: dict.fromkeys(COVERAGE_STATUSES, 0) for lang in languages}
+            for entity in COVERAGE_ENTITIES
+        }
+        for entity, lang, row_status, count in db.execute(stmt):
+            cell = matrix[entity][lang]
+            cell[row_status] = cell.get(row_status, 0) + count
+        entities = {}
+        for entity, by_language in matrix.items():
+            # Every content row lands in exactly one status per language
+            total = sum(next(iter(by_language.values())).values()) if by_language else 0
+            entities[entity] = {
+                "total": total,
+                "languages": {
+                    lang: {**cell, "ratio": round(cell["approved"] / total, 4) if total else 1.0}
+                    for lang, cell in by_language.items()
+                },
+            }
+        return {"languages": list(languages), "entities": entities}
+
+    @staticmethod
+    def coverage_items(
+        db: Session,
+        entity: str,
+        languages: Sequence[str] = COVERAGE_LANGUAGES,
+        *,
+        language: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Published rows of one entity with their per-language translation status,
+        optionally only those where `language` is in `status`. Two queries per
+        page: the rows, then every translation of those rows. Cached like `coverage`.
+        """
+        languages = tuple(languages)
+        return _cached_coverage(
+            ("items", entity, languages, language, status, limit, offset),
+            lambda: TranslationService._coverage_items(db, entity, languages, language, status, limit, offset),
+        )
+
+    @staticmethod
+    def _coverage_items(
+        db: Session,
+        entity: str,
+        languages: Sequence[str],
+        language: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> List[Dict[str, Any]]:
+        model, title = COVERAGE_ENTITIES[entity]
+        stmt = select(model.id, title.label("title")).where(model.status == "published")
+        if language and status:
+            match = [Translation.entity == entity, Translation.entity_id == model.id, Translation.language == language]
+            if status == "missing":
+                stmt = stmt.where(~exists().where(*match))
+            else:
+                stmt = stmt.where(exists().where(*match, Translation.status == status))
+        rows = db.execute(stmt.order_by(title.asc(), model.id.asc()).limit(limit).offset(offset)).all()
+        ids = [r.id for r in rows]
+        found: Dict[Tuple[str, str], str] = {}
+        if ids:
+            for entity_id, lang, row_status in db.execute(
+                select(Translation.entity_id, Translation.language, Translation.status).where(
+                    Translation.entity == entity, Translation.entity_id.in_(ids), Translation.language.in_(list(languages))
+                )
+            ):
+                found[(entity_id, lang)] = row_status
+        return [
+            {"id": r.id, "title": r.title, "languages": {lang: found.get((r.id, lang), "missing") for lang in languages}}
+            for r in rows
+        ]
+
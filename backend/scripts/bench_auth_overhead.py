@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+"""
+Benchmark per-request authentication overhead.
+
+Runs the auth dependencies of a role-protected route that also needs the
+current user (`require_roles` plus `get_current_user`) against an in-memory
+database, for a set of users each re-sending their access token. "before"
+uses a token cache that keeps nothing, so every dependency decodes the JWT
+as it did without the cache; "after" uses the decoded-JWT cache. The
+principal cache is warm in both runs, so the difference is token decoding:
+
+    python backend/scripts/bench_auth_overhead.py --users 100 --requests 20000
+"""
+
+import argparse
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+
+# Make the repo root importable regardless of current working directory
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.app import dependencies
+from backend.app.core.database import Base
+from backend.app.core.principals import principal_cache
+from backend.app.core.security import create_access_token
+from backend.app.core.token_cache import TokenCache
+from backend.app.models.user import User
+
+
+def _run(db: Session, credentials, requests: int, seed: int, cache: TokenCache) -> list:
+    dependencies.token_cache = lambda: cache
+    check_role = dependencies.require_roles("editor").dependency
+    rng = random.Random(seed)
+    timings = []
+    for _ in range(requests):
+        creds = rng.choice(credentials)
+        started = time.perf_counter()
+        check_role(creds)
+        dependencies.get_current_user(creds, db)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _report(label: str, timings: list) -> float:
+    timings = sorted(timings)
+    mean = statistics.fmean(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"{label}: mean {mean * 1e6:.1f} us, p50 {timings[len(timings) // 2] * 1e6:.1f} us, p99 {p99 * 1e6:.1f} us")
+    return mean
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    emails = [f"user{i}@example.com" for i in range(args.users)]
+    db.add_all(User(email=email, hashed_password="x", role="editor") for email in emails)
+    db.commit()
+    credentials = [
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(subject=email, role="editor"))
+        for email in emails
+    ]
+
+    principal_cache().clear()
+    _run(db, credentials, args.users * 2, args.seed, TokenCache(max_entries=0))  # warm the principal cache
+    before = _report("before (decode every time)", _run(db, credentials, args.requests, args.seed, TokenCache(max_entries=0)))
+    after = _report("after (decoded-JWT cache) ", _run(db, credentials, args.requests, args.seed, TokenCache()))
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+"""
+Benchmark glossary term annotation.
+
+Builds the Aho-Corasick automaton from synthetic glossary entries (a term
+plus uk/ru/en translations each) and annotates generated text that mentions
+some of them, reporting build time and annotation throughput:
+
+    python backend/scripts/bench_glossary_annotator.py --terms 5000 --text-kb 1024
+"""
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+# Make the repo root importable regardless of current working directory
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.services.glossary_annotator import GlossaryAutomaton
+
+
+ALPHABETS = {
+    "term": "abcdefghijklmnopqrstuvwxyzäöü",
+    "uk": "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя",
+    "ru": "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+    "en": "abcdefghijklmnopqrstuvwxyz",
+}
+
+
+def _word(rng: random.Random, alphabet: str) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 12)))
+
+
+def _phrase(rng: random.Random, alphabet: str) -> str:
+    return " ".join(_word(rng, alphabet) for _ in range(rng.choice((1, 1, 1, 2, 3))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--text-kb", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    terms = [(f"term-{i}", {f: _phrase(rng, alphabet) for f, alphabet in ALPHABETS.items()}) for i in range(args.terms)]
+    started = time.perf_counter()
+    automaton = GlossaryAutomaton(terms)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"build: {args.terms} terms ({args.terms * len(ALPHABETS)} patterns) in {build_ms:.0f} ms")
+
+    # Mostly filler in the target language, with a glossary mention every ~20 words
+    words, size = [], 0
+    while size < args.text_kb * 1024:
+        if rng.random() < 0.05:
+            word = rng.choice(terms)[1]["uk"].capitalize()
+        else:
+            word = _word(rng, ALPHABETS["uk"])
+        words.append(word)
+        size += len(word) + 1
+    text = " ".join(words)
+
+    started = time.perf_counter()
+    spans = automaton.annotate(text)
+    elapsed = time.perf_counter() - started
+    print(
+        f"annotate: {len(text) / 1024:.0f} KiB, {len(spans)} spans in {elapsed * 1000:.0f} ms "
+        f"({len(text) / 1024 / 1024 / elapsed:.2f} MiB/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
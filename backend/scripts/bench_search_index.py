@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""
+Benchmark the in-process content search index.
+
+Builds a SearchIndex from synthetic multilingual documents and reports the
+build time and query latency percentiles:
+
+    python backend/scripts/bench_search_index.py --docs 5000 --queries 2000
+"""
+
+import argparse
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+
+# Make the repo root importable regardless of current working directory
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.services.content_search import DESCRIPTION_WEIGHT, TITLE_WEIGHT, SearchDocument, SearchIndex
+
+
+# Seed words per language; the rest of each vocabulary is pseudo-words built
+# from these syllables so term frequencies follow a Zipf curve like real text.
+WORDS = {
+    "uk": "паспорт посвідка проживання банк рахунок страхування медичне житло оренда робота дозвіл податки школа мова курси транспорт квиток лікар реєстрація громада кантон".split(),
+    "ru": "паспорт вид жительство банк счёт страховка медицинская жильё аренда работа разрешение налоги школа язык курсы транспорт билет врач регистрация община кантон".split(),
+    "de": "Pass Aufenthaltsbewilligung Bank Konto Krankenversicherung Wohnung Miete Arbeit Bewilligung Steuern Schule Sprache Kurse Verkehr Billett Arzt Anmeldung Gemeinde Kanton".split(),
+    "en": "passport residence permit bank account health insurance housing rent work permit taxes school language courses transport ticket doctor registration municipality canton".split(),
+}
+VOCABULARY_SIZE = 8000
+
+
+def _vocabulary(rng: random.Random, language: str):
+    seeds = WORDS[language]
+    syllables = sorted({w[i:i + 3].lower() for w in seeds for i in range(0, max(len(w) - 2, 1), 2)})
+    words = list(seeds)
+    while len(words) < VOCABULARY_SIZE:
+        words.append("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def _text(rng: random.Random, vocabulary, n: int) -> str:
+    words, weights = vocabulary
+    return " ".join(rng.choices(words, weights, k=n))
+
+
+def _documents(count: int, seed: int, vocabularies):
+    rng = random.Random(seed)
+    entities = ("guides", "checklists", "templates", "glossary_terms")
+    for i in range(count):
+        language = rng.choice(tuple(WORDS))
+        title = _text(rng, vocabularies[language], rng.randint(3, 8))
+        description = _text(rng, vocabularies[language], rng.randint(10, 25))
+        body = _text(rng, vocabularies[language], rng.randint(150, 600))
+        yield SearchDocument(
+            entities[i % len(entities)], f"doc-{i}", None if language == "uk" else language, title, description[:160],
+            ((title, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT), (body, 1.0)),
+        )
+
+
+def _queries(count: int, seed: int, vocabularies):
+    rng = random.Random(seed + 1)
+    for _ in range(count):
+        language = rng.choice(tuple(WORDS))
+        words = _text(rng, vocabularies[language], rng.randint(1, 3)).split()
+        # Simulate search-as-you-type on the last word
+        words[-1] = words[-1][: rng.randint(2, len(words[-1]))]
+        yield " ".join(words), (language if rng.random() < 0.5 else None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabularies = {language: _vocabulary(rng, language) for language in WORDS}
+    docs = list(_documents(args.docs, args.seed, vocabularies))
+    started = time.perf_counter()
+    index = SearchIndex()
+    for doc in docs:
+        index.add(doc)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"build: {len(index)} documents in {build_ms:.0f} ms ({build_ms / max(len(index), 1) * 1000:.0f} us/doc)")
+
+    timings = []
+    for query, language in _queries(args.queries, args.seed, vocabularies):
+        started = time.perf_counter()
+        index.search(query, language=language, limit=20)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    def pct(p: float) -> float:
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+    print(
+        f"query: n={len(timings)} mean={statistics.mean(timings):.2f} ms "
+        f"p50={pct(0.50):.2f} ms p95={pct(0.95):.2f} ms p99={pct(0.99):.2f} ms max={timings[-1]:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
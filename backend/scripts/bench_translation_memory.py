@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+"""
+Benchmark translation-memory lookups.
+
+Builds a SegmentIndex from synthetic sentence pairs and queries it with
+lightly edited copies of indexed sentences (the usual case: a reworded
+sentence in a new guide), reporting build time and lookup latency:
+
+    python backend/scripts/bench_translation_memory.py --segments 100000 --queries 1000
+"""
+
+import argparse
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+
+# Make the repo root importable regardless of current working directory
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.app.services.translation_memory import Segment, SegmentIndex
+
+
+WORDS = (
+    "apply for a residence permit at the cantonal migration office bring your passport photo and rental contract "
+    "health insurance is mandatory within three months of arrival the municipality registers new residents "
+    "children attend public school free of charge language courses are subsidised for status S holders "
+    "open a bank account with proof of address the tax return is due every spring"
+).split()
+VOCABULARY_SIZE = 6000
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _vocabulary(rng: random.Random):
+    words = list(WORDS)
+    while len(words) < VOCABULARY_SIZE:
+        words.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 10))))
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    cum, total = [], 0.0
+    for w in weights:
+        total += w
+        cum.append(total)
+    return words, cum
+
+
+def _sentence(rng: random.Random, vocabulary) -> str:
+    words, cum = vocabulary
+    return " ".join(rng.choices(words, cum_weights=cum, k=rng.randint(6, 20))).capitalize() + "."
+
+
+def _edit(rng: random.Random, text: str, edits: int) -> str:
+    chars = list(text)
+    for _ in range(edits):
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[i] = rng.choice(ALPHABET)
+        elif op < 0.7:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice(ALPHABET))
+    return "".join(chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--min-score", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = _vocabulary(rng)
+    sources = [_sentence(rng, vocabulary) for _ in range(args.segments)]
+    started = time.perf_counter()
+    index = SegmentIndex()
+    for i, source in enumerate(sources):
+        index.add(Segment("guides", f"guide-{i // 20}", f"tr-{i // 20}", "uk", "content", source, f"[uk] {source}"))
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"build: {len(index)} segments in {build_ms:.0f} ms ({build_ms / max(len(index), 1) * 1000:.0f} us/segment)")
+
+    timings, hits = [], 0
+    for _ in range(args.queries):
+        original = rng.choice(sources)
+        query = _edit(rng, original, rng.randint(0, max(1, len(original) // 10)))
+        started = time.perf_counter()
+        matches = index.suggest(query, "uk", limit=5, min_score=args.min_score)
+        timings.append((time.perf_counter() - started) * 1000)
+        hits += any(seg.source == original for seg, _ in matches)
+    timings.sort()
+
+    def pct(p: float) -> float:
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+    print(
+        f"suggest: n={len(timings)} mean={statistics.mean(timings):.2f} ms "
+        f"p50={pct(0.50):.2f} ms p95={pct(0.95):.2f} ms p99={pct(0.99):.2f} ms max={timings[-1]:.2f} ms "
+        f"recall={hits / max(len(timings), 1):.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
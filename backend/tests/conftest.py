@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.app.core.database import Base
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    """A session on a fresh in-memory SQLite database with every table created."""
+    # StaticPool keeps one connection, so the database outlives the session
+    # and TestClient threads see the same data
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = Session(engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from concurrent.futures.process import BrokenProcessPool
+import os
+import signal
+import time
+
+from backend.app.services import article_extractor
+from backend.app.services.article_extractor import extract_article, shutdown_extraction_pool, submit_extraction
+
+
+PARAGRAPH = (
+    "<p>Switzerland tightened the rules for rental housing this week, and tenants in Zurich, "
+    "Geneva and Basel will see changes to deposits, notice periods and inspections.</p>"
+)
+
+
+def test_keeps_article_body_and_drops_boilerplate():
+    html = f"""
+    <html><head><script>var x = "<p>not article</p>";</script></head><body>
+      <header><nav><a href="/">Home</a><a href="/news">News</a></nav></header>
+      <div class="sidebar related"><p>Related: promo text that is long enough to count as a paragraph.</p></div>
+      <div class="article-body">
+        <h1>Headline</h1>{PARAGRAPH}<img src="/img/a.jpg" alt="photo"><svg/>
+        <p>Read <a href="/more" onclick="track()">the full guide</a>, it covers permits too.</p>{PARAGRAPH}
+      </div>
+      <footer class="footer"><p>Copyright 2026, all rights reserved, some company name here.</p></footer>
+    </body></html>
+    """
+    content = extract_article(html, "https://example.ch/story/1")
+
+    assert content is not None
+    assert content.startswith("<h2>Headline</h2><p>Switzerland")
+    assert '<img src="https://example.ch/img/a.jpg" alt="photo">' in content
+    assert '<a href="https://example.ch/more">the full guide</a>' in content
+    for noise in ("not article", "Related", "Copyright", "Home", "onclick"):
+        assert noise not in content
+
+
+def test_returns_none_for_pages_without_an_article():
+    assert extract_article("<html><body><p>Short teaser.</p></body></html>") is None
+    links = "".join(f'<li><a href="/n/{i}">Another headline number {i} for the index</a></li>' for i in range(20))
+    assert extract_article(f"<html><body><ul>{links}</ul></body></html>") is None
+
+
+def test_pool_workers_come_from_a_fork_server():
+    html = f"<html><body><article>{PARAGRAPH * 4}</article></body></html>"
+    try:
+        content, worker_ms = submit_extraction(html).result(timeout=60)
+        assert content == extract_article(html)
+        assert worker_ms >= 0
+        assert article_extractor._pool._mp_context.get_start_method() == "forkserver"
+    finally:
+        shutdown_extraction_pool()
+
+
+def test_a_crashed_worker_pool_is_replaced():
+    html = f"<html><body><article>{PARAGRAPH * 4}</article></body></html>"
+    try:
+        assert submit_extraction(html).result(timeout=60)[0]
+        pool = article_extractor._pool
+        for pid in list(pool._processes):
+            os.kill(pid, signal.SIGKILL)
+        # Pages already in the dead pool may fail; later ones are extracted again
+        deadline = time.monotonic() + 30
+        while article_extractor._pool is pool and time.monotonic() < deadline:
+            try:
+                submit_extraction(html).result(timeout=60)
+            except BrokenProcessPool:
+                pass
+        assert article_extractor._pool is not pool
+        assert submit_extraction(html).result(timeout=60)[0] == extract_article(html)
+    finally:
+        shutdown_extraction_pool()
@@ -6,7 +6,7 @@ import uuid
 from fastapi.testclient import TestClient
 
 from backend.app.main import app
-from backend.app.core.security import create_access_token, create_refresh_token
+from backend.app.core.security import create_access_token, create_password_reset_token
 
 
 client = TestClient(app)
@@ -92,7 +92,7 @@ def test_password_reset_flow_changes_password():
     assert res.status_code == 201
 
     # Manually issue reset token the same way the endpoint does
-    token = create_refresh_token(subject=email, expires_delta=timedelta(hours=1))
+    token = create_password_reset_token(subject=email, expires_delta=timedelta(hours=1))
 
     # Reset password
     res = client.post(
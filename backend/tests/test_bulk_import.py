@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import json
+
+from backend.app.models import Guide
+from backend.app.models.content_change import ContentChange
+from backend.app.models.news import News, NewsSimhashBucket
+from backend.app.services.bulk_import import BulkImporter, import_items, ndjson_lines
+from backend.app.services.news_dedup import NewsDedup, simhash
+from backend.app.services.news_service import NewsService
+
+
+def _lines(chunks, max_line_bytes=64):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [item async for item in ndjson_lines(stream(), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_lines_split_across_chunks_and_reject_long_lines():
+    assert _lines([b'{"a":', b' 1}\n{"b"', b":2}\n\n", b"tail"]) == [(1, b'{"a": 1}'), (2, b'{"b":2}'), (3, b""), (4, b"tail")]
+    assert _lines([b"x" * 50, b"y" * 50, b"\nok\n"]) == [(1, None), (2, b"ok")]
+
+
+def test_ndjson_import_upserts_by_slug_and_reports_bad_lines(db):
+    db.add(Guide(title="Old", slug="permit", content="old"))
+    db.commit()
+
+    importer = BulkImporter(db, "guides", chunk_size=2)
+    lines = [
+        json.dumps({"title": "Permit", "slug": "permit", "content": "# New"}),
+        "{broken",
+        json.dumps({"title": "A", "slug": "a"}),
+        json.dumps({"title": "A2", "slug": "a"}),
+        json.dumps(["not", "an", "object"]),
+    ]
+    for number, line in enumerate(lines, start=1):
+        if importer.add_line(number, line.encode()):
+            importer.flush()
+    report = importer.finish()
+
+    assert (report.received, report.created, report.updated, report.failed) == (5, 1, 2, 2)
+    assert [e["line"] for e in report.errors] == [2, 5]
+    guides = {g.slug: g for g in db.query(Guide)}
+    assert guides["permit"].title == "Permit"
+    assert guides["permit"].content_html == '<h1 id="new">New</h1>'
+    # The later row for a repeated key wins
+    assert guides["a"].title == "A2"
+    assert db.query(ContentChange).filter(ContentChange.entity == "guides").count() >= 3
+
+
+def test_news_import_is_keyed_by_url(db):
+    report = import_items(db, "news", [
+        {"title": "First", "url": "https://example.ch/1"},
+        {"title": "Second", "url": "https://example.ch/2"},
+        {"title": "No url"},
+    ])
+    assert (report.created, report.failed) == (2, 1)
+
+    report = import_items(db, "news", [{"title": "First (updated)", "url": "https://example.ch/1"}])
+    assert (report.created, report.updated) == (0, 1)
+    assert db.query(News).count() == 2
+    assert db.query(News).filter(News.url == "https://example.ch/1").one().title == "First (updated)"
+
+
+def test_news_updated_by_import_is_reclustered_by_the_backfill(db):
+    title = "Swiss parliament approves new rules for Ukrainian refugees with status S"
+    summary = "The Federal Council said the protection status S will be extended until March 2027."
+    when = datetime(2024, 3, 1)
+    original = NewsService.create(db, title=title, summary=summary, url="https://example.ch/1", published_at=when)
+    copy = NewsService.create(db, title=f"{title} - SRF", summary=summary, url="https://example.ch/2", published_at=when + timedelta(hours=1))
+    assert copy.cluster_id == original.id
+
+    # The canonical story is rewritten by an import: it loses its fingerprint
+    # and cluster, and its copy takes the cluster over
+    report = import_items(db, "news", [{
+        "title": "Geneva hosts peace talks next month",
+        "summary": "Delegations from forty countries are expected at the Palais des Nations.",
+        "url": "https://example.ch/1",
+        "published_at": when.isoformat(),
+    }])
+    assert report.updated == 1
+    db.expire_all()
+    original, copy = db.get(News, original.id), db.get(News, copy.id)
+    assert (original.simhash, original.cluster_id) == (None, None)
+    assert copy.cluster_id == copy.id
+    assert db.query(NewsSimhashBucket).filter(NewsSimhashBucket.news_id == original.id).count() == 0
+
+    assert NewsDedup.backfill(db) == 1
+    assert original.cluster_id == original.id
+    assert original.simhash == simhash(original.title, original.summary)
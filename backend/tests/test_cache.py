@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend.app.core import cache as cache_module
+from backend.app.core.cache import ResponseCache, bump_version, etag_matches, get_versions, make_etag
+from backend.app.core.http_cache import ResponseCacheMiddleware
+from backend.app.dependencies import get_db
+from backend.app.routers import news as news_router
+from backend.app.services.news_service import NewsService
+
+
+def _news_client(db: Session) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    app.include_router(news_router.router, prefix="/news")
+    app.dependency_overrides[get_db] = lambda: db
+    # Route caches are per endpoint and survive between tests
+    news_router.list_news.__response_cache__.cache.clear()
+    return TestClient(app)
+
+
+def test_response_cache_hits_until_versions_move_or_ttl_expires(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock["now"])
+    cache = ResponseCache(ttl_seconds=30)
+    entry = cache.set("k", b"body", get_versions(["test_cache"]))
+    assert cache.get("k", get_versions(["test_cache"])) is entry
+
+    clock["now"] += 31
+    assert cache.get("k", get_versions(["test_cache"])) is None
+
+    cache.set("k", b"body", get_versions(["test_cache"]))
+    bump_version("test_cache")
+    assert cache.get("k", get_versions(["test_cache"])) is None
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", b"1234", ())
+    cache.set("b", b"1234", ())
+    assert cache.get("a", ()) is not None
+    cache.set("c", b"1234", ())
+    assert cache.get("b", ()) is None
+    assert cache.get("a", ()) is not None
+    # Bodies over the byte budget are never stored, but still get an ETag
+    big = cache.set("d", b"x" * 11, ())
+    assert big.etag == make_etag(b"x" * 11)
+    assert cache.get("d", ()) is None
+
+
+def test_etags_are_strong_and_if_none_match_compares_weakly():
+    etag = make_etag(b"payload")
+    assert etag == make_etag(b"payload") != make_etag(b"other")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"nope", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"nope"', etag)
+
+
+def test_news_list_is_served_from_cache_and_dropped_after_a_write(db, monkeypatch):
+    client = _news_client(db)
+    NewsService.create(db, title="First", url="https://example.com/1", published_at=datetime(2024, 1, 1))
+    calls = {"n": 0}
+    list_news_page = NewsService.list_news_page
+
+    def counting(*args, **kwargs):
+        calls["n"] += 1
+        return list_news_page(*args, **kwargs)
+
+    monkeypatch.setattr(NewsService, "list_news_page", staticmethod(counting))
+    first = client.get("/news/?limit=10")
+    etag = first.headers["etag"]
+    assert [n["title"] for n in first.json()] == ["First"]
+    assert client.get("/news/?limit=10").content == first.content
+    not_modified = client.get("/news/?limit=10", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert calls["n"] == 1
+
+    NewsService.create(db, title="Second", url="https://example.com/2", published_at=datetime(2024, 1, 2))
+    fresh = client.get("/news/?limit=10", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert [n["title"] for n in fresh.json()] == ["Second", "First"]
+    assert calls["n"] == 2
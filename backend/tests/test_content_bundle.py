@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import gzip
+import json
+
+import pytest
+
+from backend.app.core.config import get_settings
+from backend.app.models import Guide, Template
+from backend.app.models.content_change import ContentChange
+from backend.app.models.translation import Translation
+from backend.app.services import content_bundle
+from backend.app.services.content_bundle import ContentBundleService
+
+
+@pytest.fixture(autouse=True)
+def _fresh_bundles(monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 0)
+    # Built bundles are cached per process; start each test from scratch
+    ContentBundleService._states.clear()
+
+
+def test_bundle_is_versioned_and_rebuilt_on_change(db):
+    guide = Guide(title="A", slug="a", status="published")
+    db.add_all([guide, Guide(title="Draft", slug="d", status="draft"), Template(name="T", content="x")])
+    db.commit()
+
+    first = ContentBundleService.current(db)
+    assert ContentBundleService.current(db) is first
+    payload = json.loads(gzip.decompress(first.gzip))
+    assert payload["version"] == first.version
+    assert [g["slug"] for g in payload["guides"]] == ["a"]
+    assert first.counts == {"guides": 1, "checklists": 0, "templates": 1, "glossary": 0}
+    assert first.encoded("gzip, deflate") == (first.gzip, "gzip")
+    assert first.encoded("") == (first.raw, None)
+
+    guide.title = "A2"
+    db.commit()
+    second = ContentBundleService.current(db)
+    assert second.version != first.version
+    assert json.loads(second.raw)["guides"][0]["title"] == "A2"
+    # The previous version stays downloadable for clients mid-update
+    assert ContentBundleService.get_version(db, first.version) is first
+    assert ContentBundleService.get_version(db, "unknown") is None
+
+
+def test_language_bundle_merges_approved_translations(db):
+    guide = Guide(title="Hello", slug="hello", status="published")
+    template = Template(name="Letter", content="Dear")
+    db.add_all([guide, template])
+    db.commit()
+    db.add_all([
+        Translation(entity="guides", entity_id=guide.id, language="uk", status="approved", title="Привіт"),
+        Translation(entity="templates", entity_id=template.id, language="uk", status="pending", title="Лист"),
+    ])
+    db.commit()
+
+    payload = json.loads(ContentBundleService.current(db, "uk").raw)
+    assert payload["language"] == "uk"
+    assert payload["guides"][0]["title"] == "Привіт"
+    assert payload["templates"][0]["name"] == "Letter"
+    assert json.loads(ContentBundleService.current(db).raw)["guides"][0]["title"] == "Hello"
+
+
+def test_changes_count_once_settled_and_languages_are_fixed(db, monkeypatch):
+    db.add(Guide(title="A", slug="a", status="published"))
+    db.commit()
+    db.query(ContentChange).update({ContentChange.changed_at: datetime.now(timezone.utc) - timedelta(minutes=1)})
+    db.commit()
+    first = ContentBundleService.current(db)
+
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 30)
+    db.add(Guide(title="B", slug="b", status="published"))
+    db.commit()
+    assert ContentBundleService.current(db).version == first.version
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 0)
+    assert ContentBundleService.current(db).counts["guides"] == 2
+
+    with pytest.raises(ValueError):
+        ContentBundleService.current(db, "xx")
+    assert set(ContentBundleService._states) == {None}
+
+
+def test_any_worker_serves_a_version_built_from_the_same_rows(db, monkeypatch):
+    db.add(Guide(title="A", slug="a", status="published"))
+    db.commit()
+    db.query(ContentChange).update({ContentChange.changed_at: datetime.now(timezone.utc) - timedelta(minutes=1)})
+    db.commit()
+    # This worker builds before a write that has not settled yet
+    stale = ContentBundleService.current(db)
+    behind = dict(ContentBundleService._states)
+
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 30)
+    db.add(Guide(title="B", slug="b", status="published"))
+    db.commit()
+    # Another worker builds from the rows as they are now and advertises that
+    ContentBundleService._states.clear()
+    ahead = ContentBundleService.current(db)
+    assert ahead.counts["guides"] == 2
+    # The version names the bytes, so a third worker with no history agrees
+    ContentBundleService._states.clear()
+    assert ContentBundleService.get_version(db, ahead.version).raw == ahead.raw
+
+    # The first worker's fingerprints have not moved, but it re-reads on demand
+    ContentBundleService._states.clear()
+    ContentBundleService._states.update(behind)
+    monkeypatch.setattr(content_bundle, "REREAD_INTERVAL_SEC", 0)
+    assert ContentBundleService.current(db) is stale
+    assert ContentBundleService.get_version(db, ahead.version).raw == ahead.raw
+    assert ContentBundleService.get_version(db, "unknown") is None
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from backend.app.core.config import get_settings
+from backend.app.models import Guide, Template
+from backend.app.models.content_change import ContentChange
+from backend.app.models.glossary import GlossaryTerm
+from backend.app.models.translation import Translation
+from backend.app.services.content_search import ContentSearch, SearchDocument, SearchIndex, tokenize
+
+
+def _doc(entity_id: str, title: str, body: str = "", language=None) -> SearchDocument:
+    return SearchDocument("guides", entity_id, language, title, None, ((title, 3.0), (body, 1.0)))
+
+
+def test_tokenize_folds_case_apostrophes_and_yo():
+    assert tokenize("М'ЯСО та Ёлка, Straße!") == ["мясо", "та", "елка", "strasse"]
+
+
+def test_bm25_ranks_title_matches_and_requires_every_token():
+    index = SearchIndex()
+    index.add(_doc("a", "Bank account", "how to open an account"))
+    index.add(_doc("b", "Health insurance", "your bank pays the premium"))
+    index.add(_doc("c", "Housing", "rent and deposit"))
+
+    assert [d.entity_id for d, _ in index.search("bank")] == ["a", "b"]
+    assert [d.entity_id for d, _ in index.search("bank premium")] == ["b"]
+    # Prefix matching on the token being typed, and for inflected forms
+    assert [d.entity_id for d, _ in index.search("insur")] == ["b"]
+
+    index.remove_group("guides", "a")
+    assert [d.entity_id for d, _ in index.search("bank")] == ["b"]
+
+
+def test_index_follows_content_changes(db):
+    guide = Guide(title="Residence permit", slug="permit", content="Apply at the Gemeinde", status="published")
+    db.add_all([guide, Template(name="Permit letter", content="Dear office"), GlossaryTerm(term="Bewilligung", en="permit", uk="дозвіл")])
+    db.commit()
+    ContentSearch.rebuild(db)
+
+    hits = ContentSearch.search(db, "permit")
+    assert {d.entity for d, _ in hits} == {"guides", "templates", "glossary_terms"}
+    assert [d.entity for d, _ in ContentSearch.search(db, "дозв")] == ["glossary_terms"]
+
+    db.add(Translation(entity="guides", entity_id=guide.id, language="uk", status="approved", title="Посвідка на проживання"))
+    guide.status = "draft"
+    db.commit()
+    ContentSearch.refresh(db, force=True)
+    assert {d.entity for d, _ in ContentSearch.search(db, "permit")} == {"templates", "glossary_terms"}
+    assert ContentSearch.search(db, "посвідка", language="uk") == []
+
+    guide.status = "published"
+    db.commit()
+    ContentSearch.refresh(db, force=True)
+    (doc, _), = ContentSearch.search(db, "посвідка", language="uk")
+    assert (doc.entity_id, doc.language) == (guide.id, "uk")
+
+
+def test_late_commit_of_a_lower_seq_is_not_skipped(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 30)
+    ContentSearch.rebuild(db)
+    db.add(Guide(title="Alpha", slug="alpha", status="published"))
+    db.commit()
+    db.add(Guide(title="Bravo", slug="bravo", status="published"))
+    db.commit()
+
+    # Alpha's transaction took seq 1 but has not committed yet
+    late = db.query(ContentChange).filter(ContentChange.seq == 1).one()
+    db.expunge(late)
+    db.query(ContentChange).filter(ContentChange.seq == 1).delete()
+    db.commit()
+    ContentSearch.refresh(db, force=True)
+    assert [d.entity_id for d, _ in ContentSearch.search(db, "bravo")]
+
+    db.merge(late)
+    db.commit()
+    ContentSearch.refresh(db, force=True)
+    assert [d.entity_id for d, _ in ContentSearch.search(db, "alpha")]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from backend.app.core.config import get_settings
+from backend.app.models import Guide
+from backend.app.models.content_change import ContentChange
+from backend.app.models.glossary import GlossaryTerm
+from backend.app.models.translation import Translation
+from backend.app.schemas import GuideCreate
+from backend.app.services.bulk_import import import_items
+from backend.app.services.glossary_annotator import GlossaryAnnotator, GlossaryAutomaton
+from backend.app.services.guides import GuideService
+
+
+def test_whole_word_leftmost_longest_matches():
+    automaton = GlossaryAutomaton([
+        ("gemeinde", {"term": "Gemeinde", "en": "municipality"}),
+        ("verwaltung", {"term": "Gemeindeverwaltung"}),
+        ("he", {"term": "he"}),
+        ("permit", {"term": "Bewilligung", "uk": "Посвідка", "en": "permit"}),
+    ])
+    text = "Die GEMEINDEVERWALTUNG der Gemeinde: she needs a permit (ПОСВІДКА), not a permits-office."
+    spans = automaton.annotate(text)
+    assert [(text[s:e], term_id) for s, e, term_id in spans] == [
+        ("GEMEINDEVERWALTUNG", "verwaltung"),
+        ("Gemeinde", "gemeinde"),
+        ("permit", "permit"),
+        ("ПОСВІДКА", "permit"),
+    ]
+    assert automaton.annotate(None) == []
+
+
+def test_guides_are_annotated_on_write_and_backfilled_after_glossary_changes(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 0)
+    # Built against another test's database otherwise
+    GlossaryAnnotator._automaton = None
+    db.add(GlossaryTerm(term="Gemeinde", uk="громада"))
+    db.commit()
+
+    guide = GuideService.create(db, GuideCreate(title="Anmeldung", slug="anmeldung", content="Register at the Gemeinde office."))
+    term_id = db.query(GlossaryTerm.id).scalar()
+    assert guide.term_spans == [[16, 24, term_id]]
+    assert GlossaryAnnotator.backfill(db, Guide) == 0
+
+    db.add(GlossaryTerm(term="office"))
+    db.commit()
+    assert GlossaryAnnotator.backfill(db, Guide) == 1
+    db.expire_all()
+    assert [guide.content[s:e] for s, e, _ in db.get(Guide, guide.id).term_spans] == ["Gemeinde", "office"]
+
+    # A translated read drops offsets that point into the base content
+    db.add(Translation(entity="guides", entity_id=guide.id, language="uk", status="approved", content="Зареєструйтеся в громаді."))
+    db.commit()
+    (row,) = GuideService.list_fields(db, ("id", "term_spans"), language="uk")
+    assert row["term_spans"] is None
+    (row,) = GuideService.list_fields(db, ("id", "term_spans"), language="de")
+    assert len(row["term_spans"]) == 2
+
+
+def test_imported_updates_drop_stale_spans_until_the_backfill(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 0)
+    GlossaryAnnotator._automaton = None
+    db.add(GlossaryTerm(term="Miete"))
+    db.commit()
+    guide = GuideService.create(db, GuideCreate(title="Rent", slug="rent", content="Your Miete is due."))
+    assert guide.term_spans == [[5, 10, db.query(GlossaryTerm.id).scalar()]]
+
+    import_items(db, "guides", [{"title": "Rent", "slug": "rent", "content": "Pay the Miete monthly."}])
+    db.expire_all()
+    assert (db.get(Guide, guide.id).term_spans, db.get(Guide, guide.id).term_spans_version) == (None, None)
+    assert GlossaryAnnotator.backfill(db, Guide) == 1
+    db.expire_all()
+    assert [db.get(Guide, guide.id).content[s:e] for s, e, _ in db.get(Guide, guide.id).term_spans] == ["Miete"]
+
+
+def test_a_late_committed_term_still_rebuilds_the_automaton(db, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SEC", 30)
+    GlossaryAnnotator._automaton = None
+    now = datetime.now(timezone.utc)
+    # Miete commits with seq 2 while Steuer's transaction, holding seq 1, is still open
+    db.execute(insert(GlossaryTerm).values(id="miete", term="Miete"))
+    db.execute(insert(ContentChange).values(seq=2, entity="glossary_terms", entity_id="miete", op="upsert", changed_at=now))
+    db.commit()
+    version, automaton = GlossaryAnnotator.current(db)
+    assert automaton.annotate("Steuer") == []
+
+    db.execute(insert(GlossaryTerm).values(id="steuer", term="Steuer"))
+    db.execute(insert(ContentChange).values(seq=1, entity="glossary_terms", entity_id="steuer", op="upsert", changed_at=now))
+    db.commit()
+    # Once both changes have settled the version moves on, and the automaton with it
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SEC", 0)
+    settled_version, automaton = GlossaryAnnotator.current(db)
+    assert settled_version > version
+    assert automaton.annotate("Steuer") == [[0, 6, "steuer"]]
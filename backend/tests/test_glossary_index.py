@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from backend.app.core.config import get_settings
+from backend.app.models.content_change import ContentChange
+from backend.app.models.glossary import GlossaryTerm
+from backend.app.services.glossary_index import GlossaryIndex, GlossaryPrefixIndex
+
+
+def _entry(term_id: str, term: str, uk=None, en=None) -> dict:
+    return {"id": term_id, "term": term, "uk": uk, "ru": None, "en": en, "description": None}
+
+
+def test_prefix_ranking_across_fields_and_words():
+    index = GlossaryPrefixIndex()
+    index.load([
+        _entry("a", "Aufenthaltsbewilligung", uk="Посвідка на проживання", en="Residence permit"),
+        _entry("b", "Arbeitsbewilligung", en="Work permit"),
+        _entry("c", "Permit", uk="Дозвіл"),
+    ])
+
+    assert [(e["id"], f) for e, f in index.suggest("permit")] == [("c", "term"), ("b", "en"), ("a", "en")]
+    assert [e["id"] for e, _ in index.suggest("Ресид")] == []
+    assert [(e["id"], f) for e, f in index.suggest("прож")] == [("a", "uk")]
+
+    index.add(_entry("c", "Genehmigung", uk="Дозвіл"))
+    assert [e["id"] for e, _ in index.suggest("permit")] == ["b", "a"]
+    index.remove("b")
+    assert [e["id"] for e, _ in index.suggest("perm")] == ["a"]
+
+
+def test_index_follows_glossary_writes(db):
+    term = GlossaryTerm(term="Gemeinde", uk="Громада", en="Municipality")
+    db.add(term)
+    db.commit()
+    GlossaryIndex.rebuild(db)
+    assert [f for _, f in GlossaryIndex.suggest(db, "гром")] == ["uk"]
+
+    term.uk = "Община"
+    db.add(GlossaryTerm(term="Gemeindeverwaltung", en="Municipal office"))
+    db.commit()
+    GlossaryIndex.refresh(db, force=True)
+    assert GlossaryIndex.suggest(db, "гром") == []
+    assert [e["term"] for e, _ in GlossaryIndex.suggest(db, "gemeinde")] == ["Gemeinde", "Gemeindeverwaltung"]
+
+    db.delete(term)
+    db.commit()
+    GlossaryIndex.refresh(db, force=True)
+    assert [e["term"] for e, _ in GlossaryIndex.suggest(db, "munic")] == ["Gemeindeverwaltung"]
+
+
+def test_late_commit_of_a_lower_seq_is_not_skipped(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 30)
+    GlossaryIndex.rebuild(db)
+    db.add(GlossaryTerm(term="Steuer", en="Tax"))
+    db.commit()
+    db.add(GlossaryTerm(term="Miete", en="Rent"))
+    db.commit()
+
+    # Steuer's transaction took seq 1 but has not committed yet
+    late = db.query(ContentChange).filter(ContentChange.seq == 1).one()
+    db.expunge(late)
+    db.query(ContentChange).filter(ContentChange.seq == 1).delete()
+    db.commit()
+    GlossaryIndex.refresh(db, force=True)
+
+    db.merge(late)
+    db.commit()
+    GlossaryIndex.refresh(db, force=True)
+    assert [e["term"] for e, _ in GlossaryIndex.suggest(db, "steu")] == ["Steuer"]
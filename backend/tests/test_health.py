@@ -12,3 +12,8 @@ def test_health():
     assert res.json() == {"status": "ok"}
 
 
+
+
+def test_cross_origin_clients_can_read_the_next_cursor():
+    res = client.get("/health", headers={"Origin": "https://admin.example.com"})
+    assert "X-Next-Cursor" in res.headers["access-control-expose-headers"]
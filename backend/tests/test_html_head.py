@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from backend.app.services.html_head import read_head
+
+
+def test_reads_metadata_and_stops_at_end_of_head():
+    consumed = []
+
+    def chunks():
+        yield b'<!DOCTYPE html><html><head><meta charset="utf-8"><title> Fallback\n title</title>'
+        yield '<meta property="og:title" content="Київ &amp; Zürich"><meta name="description" content="About">'.encode("utf-8")
+        yield b'<link rel="alternate" type="application/rss+xml" href="/feed.xml"><script>var s = "<body>";</script>'
+        yield b"</head><body>"
+        consumed.append("body")
+        yield b"<p>" + b"x" * 10_000 + b"</p>"
+
+    head, read = read_head(chunks())
+
+    assert head.first("og:title") == "Київ & Zürich"
+    assert head.first("twitter:title", "description") == "About"
+    assert head.title == "Fallback title"
+    assert head.feed_links() == ["/feed.xml"]
+    assert consumed == []
+    assert read < 400
+
+
+def test_stops_at_byte_cap_without_end_of_head():
+    head, read = read_head(iter([b"<html><head><title>Only title"] + [b"<meta name=x content=y>"] * 10_000), max_bytes=4096)
+
+    assert read == 4096
+    assert head.title == "Only title"
+    assert head.first("x") == "y"
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.core.cache import bump_version
+from backend.app.core.http_cache import ResponseCacheMiddleware, cached
+
+
+def _client():
+    calls = {"n": 0}
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/items")
+    @cached("test_items")
+    def items(limit: int = 10):
+        calls["n"] += 1
+        return {"calls": calls["n"], "limit": limit}
+
+    @app.get("/items/{item_id}")
+    @cached("test_items")
+    def item(item_id: str):
+        calls["n"] += 1
+        return {"id": item_id}
+
+    return TestClient(app), calls
+
+
+def test_repeat_gets_are_served_from_cache_until_version_bump():
+    client, calls = _client()
+    first = client.get("/items?limit=5&x=1")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    # Query parameter order does not matter for the cache key
+    again = client.get("/items?x=1&limit=5")
+    assert again.json() == first.json()
+    assert again.headers["etag"] == etag
+    assert client.get("/items?limit=5&x=1", headers={"If-None-Match": etag}).status_code == 304
+    assert calls["n"] == 1
+
+    bump_version("test_items")
+    fresh = client.get("/items?limit=5&x=1", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["calls"] == 2
+
+
+def test_path_routes_cached_and_other_methods_pass_through():
+    client, calls = _client()
+    assert client.get("/items/a").status_code == 200
+    assert client.get("/items/a").status_code == 200
+    assert calls["n"] == 1
+    assert client.post("/items").status_code == 405
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.pool import StaticPool
+
+from backend.app.core.leader import LeaderElection
+from backend.app.models.leader_lease import LeaderLease
+
+
+def _engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    LeaderLease.__table__.create(engine)
+    return engine
+
+
+def test_only_one_process_holds_the_lease():
+    engine = _engine()
+    a = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="a")
+    b = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="b")
+
+    assert a.heartbeat() is True
+    assert b.heartbeat() is False
+    # Renewal keeps the lease with the current leader
+    assert a.heartbeat() is True
+    assert b.heartbeat() is False
+
+
+def test_expired_lease_is_taken_over():
+    engine = _engine()
+    a = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="a")
+    b = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="b")
+    assert a.heartbeat() is True
+
+    # Simulate a dead leader whose lease ran out
+    with engine.begin() as conn:
+        conn.execute(update(LeaderLease).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+
+    assert b.heartbeat() is True
+    assert a.heartbeat() is False
+
+
+def test_release_hands_over_immediately():
+    engine = _engine()
+    a = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="a")
+    b = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="b")
+    assert a.heartbeat() is True
+
+    a.release()
+    assert a.is_leader is False
+    assert b.heartbeat() is True
+
+
+def test_dropped_lock_connection_is_not_returned_to_the_pool():
+    engine = _engine()
+    a = LeaderElection("jobs", ttl_seconds=15, engine=engine, holder_id="a")
+    invalidated = []
+    event.listen(engine, "invalidate", lambda *args: invalidated.append(args[0]))
+    a._conn = engine.connect()
+    a._drop_connection()
+    assert len(invalidated) == 1 and a._conn is None
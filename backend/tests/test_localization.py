@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from backend.app.models import Guide, Template
+from backend.app.models.news import News
+from backend.app.models.translation import Translation
+from backend.app.schemas import GuideOut
+from backend.app.services import GuideService, TemplateService
+from backend.app.services.news_service import NewsService
+
+
+def test_guides_use_approved_translation_with_base_fallback(db):
+    permit, tax = Guide(title="Permit", slug="permit", description="Base", content="Body"), Guide(title="Tax", slug="tax")
+    db.add_all([permit, tax])
+    db.commit()
+    db.add_all([
+        Translation(entity="guides", entity_id=permit.id, language="uk", status="approved", title="Дозвіл", description="", content="Текст"),
+        Translation(entity="guides", entity_id=tax.id, language="uk", status="pending", title="Податок"),
+    ])
+    db.commit()
+
+    rows = {r["slug"]: r for r in GuideService.list_fields(db, tuple(GuideOut.model_fields), language="uk")}
+    assert (rows["permit"]["title"], rows["permit"]["content"], rows["permit"]["translated"]) == ("Дозвіл", "Текст", True)
+    # Empty translated fields and unapproved translations fall back to the base text
+    assert rows["permit"]["description"] == "Base"
+    assert (rows["tax"]["title"], rows["tax"]["translated"]) == ("Tax", False)
+
+    assert GuideService.get_by_slug_localized(db, "tax", ("id", "title"), "de")["title"] == "Tax"
+    assert GuideService.get_localized(db, "missing", ("id", "title"), "uk") is None
+
+
+def test_templates_and_news_map_their_own_columns(db):
+    template = Template(name="Letter", content="Dear")
+    db.add_all([template, News(id="n1", title="Story", summary="Sum", url="https://example.ch/1", published_at=datetime(2026, 1, 1))])
+    db.commit()
+    db.add_all([
+        Translation(entity="templates", entity_id=template.id, language="uk", status="approved", title="Лист"),
+        Translation(entity="news", entity_id="n1", language="uk", status="approved", description="Підсумок"),
+    ])
+    db.commit()
+
+    assert TemplateService.get_localized(db, template.id, ("id", "name", "content"), "uk") == {"id": template.id, "name": "Лист", "content": "Dear", "translated": True}
+    rows, _ = NewsService.list_news_page(db, lang="uk")
+    assert (rows[0]["title"], rows[0]["summary"]) == ("Story", "Підсумок")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from backend.app.models import Guide
+from backend.app.schemas import GuideCreate, GuideUpdate
+from backend.app.services import GuideService
+from backend.app.services.markdown_render import render
+
+
+def test_render_escapes_html_and_drops_unsafe_links():
+    out = render("Hi <script>x</script> [ok](https://a.ch) [bad](javascript:evil) ![i](data:x)")
+    assert "<script>" not in out.html
+    assert "&lt;script&gt;" in out.html
+    assert '<a href="https://a.ch"' in out.html
+    assert "javascript:" not in out.html
+    assert "<img" not in out.html
+
+
+def test_render_builds_toc_with_unique_anchors():
+    out = render("# Intro\n\ntext\n\n## Steps\n1. one\n2. two\n\n## Steps\n\n```sh\na < b\n```")
+    assert [(h["l"], h["id"]) for h in out.ast["toc"]] == [(1, "intro"), (2, "steps"), (2, "steps-2")]
+    assert "<ol><li>one</li><li>two</li></ol>" in out.html
+    assert '<pre><code class="language-sh">a &lt; b</code></pre>' in out.html
+    assert out.reading_minutes == 1
+    assert render("").reading_minutes == 0
+
+
+def test_heading_keeps_a_trailing_hash_that_is_part_of_the_text():
+    assert render("# Learn C#").html == '<h1 id="learn-c">Learn C#</h1>'
+    assert render("## Steps ##").html == '<h2 id="steps">Steps</h2>'
+    assert render("### F# and C# #").html == '<h3 id="f-and-c">F# and C#</h3>'
+
+
+def test_guide_is_rendered_on_write_and_rerendered_on_change(db):
+    guide = GuideService.create(db, GuideCreate(title="T", slug="t", content="# One"))
+    assert guide.content_html == '<h1 id="one">One</h1>'
+    first_hash = guide.content_hash
+
+    guide = GuideService.update(db, guide, GuideUpdate(title="T2"))
+    assert guide.content_hash == first_hash
+
+    guide = GuideService.update(db, guide, GuideUpdate(content="# Two"))
+    assert guide.content_hash != first_hash
+    assert guide.content_ast["toc"] == [{"l": 1, "text": "Two", "id": "two"}]
+
+
+def test_unrendered_guides_are_served_without_writes_and_backfilled(db):
+    # A guide from before pre-rendering existed
+    db.add(Guide(id="g1", title="Old", slug="old", content="# Old"))
+    db.commit()
+    guide = GuideService.get(db, "g1")
+
+    rendered = GuideService.rendered(guide)
+    assert rendered.html == '<h1 id="old">Old</h1>'
+    assert guide.content_hash is None
+    assert not db.dirty
+
+    assert GuideService.backfill_rendered(db) == 1
+    assert GuideService.backfill_rendered(db) == 0
+    db.refresh(guide)
+    assert guide.content_html == rendered.html
+    assert GuideService.rendered(guide) == rendered
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from backend.app.services.news_dedup import BANDS, MAX_DISTANCE, NewsDedup, bands, hamming, simhash
+from backend.app.services.news_service import NewsService
+
+
+TITLE = "Swiss parliament approves new rules for Ukrainian refugees with status S"
+SUMMARY = "The Federal Council said the protection status S will be extended until March 2027 for people fleeing the war in Ukraine."
+
+
+def test_syndicated_copies_are_within_threshold_and_unrelated_stories_are_not():
+    original = simhash(TITLE, SUMMARY)
+    copy = simhash(f"{TITLE} - SRF", f"<p>{SUMMARY}</p> Read more.")
+    unrelated = simhash("Geneva hosts peace talks next month", "Delegations from forty countries are expected at the Palais des Nations.")
+
+    assert hamming(original, copy) <= MAX_DISTANCE
+    assert hamming(original, unrelated) > 3 * MAX_DISTANCE
+    # Signed so it fits a BIGINT column
+    assert -(2**63) <= original < 2**63
+
+
+def test_short_text_is_not_fingerprinted():
+    assert simhash("Update", "") is None
+
+
+def test_hashes_within_threshold_share_a_band():
+    base = simhash(TITLE, SUMMARY)
+    # Flip MAX_DISTANCE bits spread over different bands
+    flipped = base ^ sum(1 << (i * (64 // BANDS) + i) for i in range(MAX_DISTANCE))
+    if flipped >= 2**63:
+        flipped -= 2**64
+    assert hamming(base, flipped) == MAX_DISTANCE
+    assert set(bands(base)) & set(bands(flipped))
+
+
+def test_editing_the_text_moves_a_story_to_its_new_cluster(db):
+    when = datetime(2024, 3, 1)
+    original = NewsService.create(db, title=TITLE, summary=SUMMARY, url="https://example.com/a", published_at=when)
+    copy = NewsService.create(db, title=f"{TITLE} - SRF", summary=SUMMARY, url="https://example.com/b", published_at=when + timedelta(hours=1))
+    assert copy.cluster_id == original.id
+
+    # The canonical story is rewritten: its copy takes over the cluster
+    NewsService.update(db, original, title="Geneva hosts peace talks next month", summary="Delegations from forty countries are expected at the Palais des Nations.")
+    db.refresh(copy)
+    assert original.cluster_id == original.id
+    assert original.simhash == simhash(original.title, original.summary)
+    assert copy.cluster_id == copy.id
+    assert NewsDedup.find_duplicate(db, title=TITLE, summary=SUMMARY, language="uk", published_at=when) == copy.id
+
+    # Edits that leave the text alone keep the cluster
+    later = NewsService.create(db, title=f"{TITLE} (update)", summary=SUMMARY, url="https://example.com/c", published_at=when + timedelta(hours=2))
+    assert later.cluster_id == copy.id
+    NewsService.update(db, later, source="SRF")
+    assert later.cluster_id == copy.id
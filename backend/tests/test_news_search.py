@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.app.models.content_change import ContentChange
+from backend.app.models.news import News
+from backend.app.services.news_search import NewsSearch
+
+
+VERSIONS = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+MIGRATIONS = ["0015_news_fulltext.py", "0024_news_fts_stable_keys.py"]
+
+
+def _session(with_fts: bool = True) -> Session:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    News.__table__.create(engine)
+    ContentChange.__table__.create(engine)
+    if with_fts:
+        for name in MIGRATIONS:
+            spec = importlib.util.spec_from_file_location(name[:-3], VERSIONS / name)
+            migration = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(migration)
+            with engine.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+                migration.upgrade()
+    return Session(engine)
+
+
+def _add(db: Session, title: str, summary: str = "", *, language: str = "en", status: str = "published") -> News:
+    news = News(id=str(uuid4()), title=title, summary=summary, url=f"https://example.com/{uuid4()}", language=language, status=status, published_at=datetime.utcnow())
+    db.add(news)
+    db.commit()
+    return news
+
+
+def test_ranks_title_matches_first_and_highlights():
+    db = _session()
+    body = _add(db, "Weekly digest", "New rules for rental housing")
+    title = _add(db, "Housing rules change", "Details inside")
+    _add(db, "Housing draft", status="draft")
+
+    hits, next_cursor = NewsSearch.search(db, "hous", limit=10)
+
+    assert [h["news"].id for h in hits] == [title.id, body.id]
+    assert "<mark>" in hits[0]["headline"]
+    assert next_cursor is None
+
+
+def test_keyset_pages_cover_all_hits_once_and_follow_updates():
+    db = _session()
+    for i in range(5):
+        _add(db, f"Permit update {i}", "permit")
+    other = _add(db, "Unrelated", language="de")
+
+    seen, cursor = [], None
+    while True:
+        hits, cursor = NewsSearch.search(db, "permit", limit=2, cursor=cursor)
+        seen += [h["news"].id for h in hits]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+    other.summary = "permit for Germany"
+    db.commit()
+    hits, _ = NewsSearch.search(db, "permit", language="de")
+    assert [h["news"].id for h in hits] == [other.id]
+
+
+def test_falls_back_to_like_without_fts_table():
+    db = _session(with_fts=False)
+    match = _add(db, "Zurich tram strike")
+    _add(db, "Weather")
+
+    hits, _ = NewsSearch.search(db, "tram")
+    assert [h["news"].id for h in hits] == [match.id]
+
+
+def test_index_follows_stories_whose_rowid_changes():
+    db = _session()
+    story = _add(db, "Tram strike in Zurich")
+    _add(db, "Weather")
+    # REPLACE gives the story a new implicit rowid without firing the delete trigger
+    db.execute(
+        text(
+            "INSERT OR REPLACE INTO news (id, title, summary, url, source, language, status, published_at, created_at, updated_at) "
+            "SELECT id, 'Tram strike ends', summary, url, source, language, status, published_at, created_at, updated_at FROM news WHERE id = :id"
+        ),
+        {"id": story.id},
+    )
+    db.commit()
+    db.expire_all()
+    hits, _ = NewsSearch.search(db, "tram")
+    assert [(h["news"].id, h["news"].title) for h in hits] == [(story.id, "Tram strike ends")]
+
+    db.delete(db.get(News, story.id))
+    db.commit()
+    assert NewsSearch.search(db, "tram") == ([], None)
+    assert db.execute(text("SELECT count(*) FROM news_fts_keys")).scalar() == 1
+
+
+def test_backend_is_detected_once_per_engine(monkeypatch):
+    db = _session()
+    _add(db, "Zurich tram strike")
+    calls = []
+    has_fts5_table = NewsSearch._has_fts5_table
+    monkeypatch.setattr(NewsSearch, "_has_fts5_table", staticmethod(lambda session: calls.append(1) or has_fts5_table(session)))
+    for _ in range(3):
+        hits, _ = NewsSearch.search(db, "tram")
+        assert len(hits) == 1
+    assert len(calls) == 1
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend.app.core.security import create_access_token
+from backend.app.dependencies import get_db
+from backend.app.models.news import News
+from backend.app.routers import news as news_router
+
+
+ADMIN = {"Authorization": "Bearer " + create_access_token(subject="admin@example.com", is_admin=True, role="admin")}
+
+
+def _client(db: Session) -> TestClient:
+    app = FastAPI()
+    app.include_router(news_router.router, prefix="/news")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def test_creating_a_story_with_a_taken_url_is_a_conflict(db):
+    client = _client(db)
+    first = client.post("/news/", headers=ADMIN, json={"title": "First", "url": "https://example.com/a", "published_at": "2024-01-01T00:00:00"})
+    assert first.status_code == 200
+
+    again = client.post("/news/", headers=ADMIN, json={"title": "Again", "url": "https://example.com/a", "published_at": "2024-01-01T00:00:00"})
+    assert again.status_code == 409
+    assert db.query(News).count() == 1
+
+
+def test_moving_a_story_to_a_taken_url_is_a_conflict(db):
+    client = _client(db)
+    a = client.post("/news/", headers=ADMIN, json={"title": "A", "url": "https://example.com/a", "published_at": "2024-01-01T00:00:00"}).json()
+    b = client.post("/news/", headers=ADMIN, json={"title": "B", "url": "https://example.com/b", "published_at": "2024-01-01T00:00:00"}).json()
+
+    moved = client.put(f"/news/{b['id']}", headers=ADMIN, json={"url": "https://example.com/a"})
+    assert moved.status_code == 409
+    assert client.get(f"/news/{b['id']}").json()["url"] == "https://example.com/b"
+    # Re-saving a story with its own url is not a conflict
+    assert client.put(f"/news/{a['id']}", headers=ADMIN, json={"url": "https://example.com/a", "title": "A2"}).status_code == 200
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import signal
+
+import pytest
+
+from backend.app.core import password_hashing
+from backend.app.core.metrics import PASSWORD_HASH_TOTAL
+from backend.app.core.password_hashing import PasswordHashingBusy
+from backend.app.core.security import get_password_hash, verify_password
+from backend.app.services import auth
+from backend.app.services.auth import AuthService
+
+
+def test_hashing_runs_in_the_pool_and_sheds_when_saturated():
+    hashed = get_password_hash("s3cret!")
+    assert verify_password("s3cret!", hashed)
+    assert not verify_password("wrong", hashed)
+
+    _, slots = password_hashing._get_pool()
+    taken = 0
+    while slots.acquire(blocking=False):
+        taken += 1
+    try:
+        with pytest.raises(PasswordHashingBusy):
+            verify_password("s3cret!", hashed)
+    finally:
+        for _ in range(taken):
+            slots.release()
+    assert verify_password("s3cret!", hashed)
+
+
+def test_admin_password_is_hashed_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(auth, "_admin_hash", None)
+    monkeypatch.setattr(auth, "get_password_hash", lambda password: calls.append(1) or get_password_hash(password))
+    settings = auth.get_settings()
+    assert AuthService.authenticate_admin(settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD)
+    assert AuthService.authenticate_admin(settings.ADMIN_EMAIL, "wrong") is None
+    assert AuthService.authenticate_admin("someone@example.com", settings.ADMIN_PASSWORD) is None
+    assert len(calls) == 1
+    # Only a digest of the plaintext is kept
+    assert settings.ADMIN_PASSWORD not in auth._admin_hash
+
+    monkeypatch.setattr(settings, "ADMIN_PASSWORD", settings.ADMIN_PASSWORD + "-rotated")
+    assert AuthService.authenticate_admin(settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD)
+    assert len(calls) == 2
+
+
+def test_a_crashed_worker_pool_is_replaced():
+    hashed = get_password_hash("s3cret!")
+    pool, _ = password_hashing._get_pool()
+    broken = PASSWORD_HASH_TOTAL.labels(op="verify", outcome="broken")
+    before = broken._value.get()
+    for pid in list(pool._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    assert verify_password("s3cret!", hashed)
+    assert password_hashing._get_pool()[0] is not pool
+    assert broken._value.get() == before + 1
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+import pytest
+from sqlalchemy import event
+
+from backend.app.core.principals import Principal, PrincipalCache, principal_cache
+from backend.app.core.security import create_access_token
+from backend.app.dependencies import get_current_user
+from backend.app.models.user import User
+
+
+def _principal(email: str) -> Principal:
+    return Principal(id=email, email=email, role="viewer", is_active=True, is_superuser=False, subscription_status="free", subscription_expire_at=None)
+
+
+def test_cache_is_bounded_and_invalidated_per_subject():
+    cache = PrincipalCache(max_entries=2)
+    cache.set("a@x", 1, _principal("a@x"))
+    cache.set("a@x", 2, _principal("a@x"))
+    cache.set("b@x", 1, _principal("b@x"))
+    assert cache.get("a@x", 1) is None  # least recently used went first
+    assert cache.get("a@x", 2).email == "a@x"
+    cache.invalidate("a@x")
+    assert (cache.get("a@x", 2), len(cache)) == (None, 1)
+
+    expired = PrincipalCache(ttl_seconds=0)
+    expired.set("a@x", 1, _principal("a@x"))
+    assert expired.get("a@x", 1) is None
+
+
+def test_current_user_is_served_from_cache_until_the_user_is_written(db):
+    db.add(User(email="u@x", hashed_password="x", role="viewer"))
+    db.commit()
+    principal_cache().clear()
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(subject="u@x"))
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert get_current_user(credentials, db).role == "viewer"
+    assert get_current_user(credentials, db).role == "viewer"
+    assert len(statements) == 1
+
+    user = db.query(User).one()
+    user.role = "editor"
+    db.commit()
+    assert get_current_user(credentials, db).role == "editor"
+
+    # Account deletion renames the email; tokens for the old one must stop working
+    user.email = "deleted@example.invalid"
+    user.is_active = False
+    db.commit()
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(credentials, db)
+    assert exc.value.status_code == 401
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.app.core.projection import parse_fields
+from backend.app.models import Guide
+from backend.app.schemas import GuideOut
+from backend.app.services import GuideService
+
+
+def test_parse_fields_adds_required_and_rejects_unknown():
+    assert parse_fields(None, GuideOut, GuideService.SUMMARY_FIELDS) is None
+    assert "content" not in parse_fields("summary", GuideOut, GuideService.SUMMARY_FIELDS)
+    assert parse_fields("category", GuideOut, GuideService.SUMMARY_FIELDS) == ("title", "slug", "category", "id")
+    with pytest.raises(ValueError):
+        parse_fields("title,password", GuideOut, GuideService.SUMMARY_FIELDS)
+
+
+def test_list_fields_selects_only_projected_columns(db):
+    db.add_all([Guide(title="A", slug="a", content="x" * 10_000), Guide(title="B", slug="b", status="draft")])
+    db.commit()
+
+    fields = parse_fields("summary", GuideOut, GuideService.SUMMARY_FIELDS)
+    rows = GuideService.list_fields(db, fields)
+    assert [r["slug"] for r in rows] == ["a"]
+    assert set(rows[0]) == set(fields)
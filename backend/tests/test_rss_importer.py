@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from backend.app.core import metrics
+from backend.app.core.config import get_settings
+from backend.app.models.rss_feed import RSSFeed
+from backend.app.services.rss_importer import ADHOC_FEED_LABEL, FeedImportStats, RSSImporter
+
+
+def _failed() -> FeedImportStats:
+    stats = FeedImportStats()
+    stats.fail("ConnectError: refused")
+    return stats
+
+
+def test_failures_back_off_exponentially_and_success_resets():
+    settings = get_settings()
+    feed = RSSFeed(url="https://example.ch/feed.xml")
+
+    delays = []
+    for _ in range(3):
+        before = datetime.utcnow()
+        RSSImporter._record_stats(feed, _failed())
+        delays.append(round((feed.next_attempt_at - before).total_seconds() / settings.FEED_IMPORT_INTERVAL_SEC))
+    assert delays == [1, 2, 4]
+    assert feed.consecutive_failures == 3
+    # EWMA: 100 -> 70 -> 49 -> 34.3
+    assert feed.health_score == 34.3
+    assert feed.last_error == "ConnectError: refused"
+
+    for _ in range(20):
+        RSSImporter._record_stats(feed, _failed())
+    assert feed.next_attempt_at - datetime.utcnow() <= timedelta(seconds=settings.FEED_BACKOFF_MAX_SEC)
+
+    RSSImporter._record_stats(feed, FeedImportStats(fetch_ms=500, entries=3))
+    assert (feed.consecutive_failures, feed.next_attempt_at, feed.last_error) == (0, None, None)
+    assert round(feed.health_score) == 30
+    # A slow but working feed counts as partly healthy
+    previous = feed.health_score
+    RSSImporter._record_stats(feed, FeedImportStats(fetch_ms=5000))
+    assert feed.health_score == round(0.7 * previous + 0.3 * 75.0, 1)
+
+
+def test_adhoc_imports_share_one_label():
+    counter = metrics.RSS_IMPORTS_TOTAL.labels(feed=ADHOC_FEED_LABEL, outcome="error")
+    before = counter._value.get()
+    RSSImporter.record_metrics(ADHOC_FEED_LABEL, _failed())
+    assert counter._value.get() == before + 1
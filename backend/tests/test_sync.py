@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.app.core.config import get_settings
+from backend.app.models import Guide
+from backend.app.models.content_change import ContentChange
+from backend.app.services import sync as sync_module
+from backend.app.services.sync import ChangeFollower, SyncService, settled_seq
+
+
+@pytest.fixture(autouse=True)
+def _settle_now(monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 0)
+
+
+def test_warm_sync_returns_only_changes_and_tombstones(db):
+    a = Guide(title="A", slug="a", status="published")
+    b = Guide(title="B", slug="b", status="published")
+    c = Guide(title="C", slug="c", status="published")
+    db.add_all([a, b, c])
+    db.commit()
+
+    first = SyncService.changes_since(db, None)
+    assert sorted(g["slug"] for g in first.upserts["guides"]) == ["a", "b", "c"]
+    assert SyncService.changes_since(db, first.cursor).upserts == {}
+
+    a.title = "A2"
+    b.status = "draft"
+    db.delete(c)
+    db.commit()
+
+    delta = SyncService.changes_since(db, first.cursor)
+    assert [g["title"] for g in delta.upserts["guides"]] == ["A2"]
+    assert sorted(delta.deletes["guides"]) == sorted([b.id, c.id])
+    assert delta.has_more is False
+
+
+def test_compaction_keeps_latest_change_per_row(db):
+    guide = Guide(title="A", slug="a", status="published")
+    db.add(guide)
+    db.commit()
+    for i in range(3):
+        guide.title = f"A{i}"
+        db.commit()
+
+    assert db.query(ContentChange).count() == 4
+    assert SyncService.compact(db) == 3
+    page = SyncService.changes_since(db, None)
+    assert [g["title"] for g in page.upserts["guides"]] == ["A2"]
+
+
+def test_unsettled_changes_are_held_back_without_has_more(db, monkeypatch):
+    db.add(Guide(title="A", slug="a", status="published"))
+    db.commit()
+    assert settled_seq(db) == 1
+
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 30)
+    page = SyncService.changes_since(db, None)
+    assert (page.upserts, page.has_more) == ({}, False)
+    assert 1 <= page.retry_after <= 30
+    assert settled_seq(db) == 0
+
+
+def test_follower_polls_on_interval_and_rebuilds_past_the_threshold(db, monkeypatch):
+    # Writes look like they came from another worker: no local version moves
+    monkeypatch.setattr(sync_module, "get_versions", lambda tables: (0,))
+    calls = []
+    follower = ChangeFollower(
+        ("guides",),
+        lambda db: calls.append("rebuild") or 0,
+        lambda db, changes: calls.append([c.entity_id for c in changes]),
+    )
+    follower.refresh(db)
+    assert calls == ["rebuild"]
+
+    guide = Guide(title="A", slug="a", status="published")
+    db.add(guide)
+    db.commit()
+    # Nothing moved locally, so the write waits for the next poll
+    follower.refresh(db)
+    assert calls == ["rebuild"]
+    follower.refresh(db, force=True)
+    assert calls == ["rebuild", [guide.id]]
+
+    monkeypatch.setattr(sync_module, "MAX_INCREMENTAL_CHANGES", 1)
+    guide.title = "A2"
+    db.commit()
+    guide.title = "A3"
+    db.commit()
+    follower.refresh(db, force=True)
+    assert calls == ["rebuild", [guide.id], "rebuild"]
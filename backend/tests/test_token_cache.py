@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from backend.app.core import token_cache as token_cache_module
+from backend.app.core.metrics import AUTH_CACHE_TOTAL
+from backend.app.core.security import create_access_token
+from backend.app.core.token_cache import TokenCache
+
+
+def _misses() -> float:
+    return AUTH_CACHE_TOTAL.labels(cache="token", result="miss")._value.get()
+
+
+def test_claims_are_cached_until_the_token_expires(monkeypatch):
+    cache = TokenCache(max_entries=2)
+    token = create_access_token(subject="u@x", role="editor", expires_delta=timedelta(minutes=5))
+    misses = _misses()
+    claims = cache.decode(token)
+    claims["role"] = "admin"  # callers cannot change what later requests see
+    assert cache.decode(token)["role"] == "editor"
+    assert _misses() == misses + 1
+
+    with pytest.raises(ValueError):
+        cache.decode("not-a-token")
+    assert len(cache) == 1
+
+    # Past exp the entry is dropped and the token goes back through decode_token
+    now = token_cache_module.time.time()
+    monkeypatch.setattr(token_cache_module.time, "time", lambda: now + 301)
+    cache.decode(token)
+    assert _misses() == misses + 3
+
+    for subject in ("a@x", "b@x"):
+        cache.decode(create_access_token(subject=subject))
+    assert len(cache) == 2
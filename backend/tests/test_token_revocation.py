@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, select
+
+from backend.app.models.revoked_token import RevokedToken
+from backend.app.services.token_revocation import BloomFilter, TokenRevocation
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_tokens_are_single_use_and_purged_after_expiry(db):
+    TokenRevocation._filter = None
+    now = datetime.now(timezone.utc)
+
+    assert TokenRevocation.revoke(db, "a", "u@x", now + timedelta(days=1))
+    assert not TokenRevocation.revoke(db, "a", "u@x", now + timedelta(days=1))
+
+    # Fresh ids are answered by the filter without touching the table
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert not TokenRevocation.is_revoked(db, "b")
+    assert statements == []
+
+    # Used by another worker: the filter here has not seen it, the primary key has
+    db.add(RevokedToken(jti="c", subject="u@x", expires_at=now + timedelta(days=1), revoked_at=now))
+    db.commit()
+    assert not TokenRevocation.revoke(db, "c", "u@x", now + timedelta(days=1))
+
+    TokenRevocation.revoke(db, "old", "u@x", now - timedelta(seconds=1))
+    assert TokenRevocation.purge(db) == 1
+    assert sorted(db.scalars(select(RevokedToken.jti))) == ["a", "c"]
+    assert TokenRevocation.is_revoked(db, "a")
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from backend.app.models.translation import Translation
+from backend.app.schemas.translation import TranslationUpsert
+from backend.app.services.translations import TranslationService
+
+
+def test_batch_upsert_keeps_omitted_fields_and_status(db):
+    db.add(Translation(entity="guides", entity_id="g1", language="uk", status="approved", title="Дозвіл", content="Текст", author_email="a@x"))
+    db.commit()
+
+    result = TranslationService.upsert_many(db, [
+        TranslationUpsert(entity="guides", entity_id="g1", language="uk", content="Новий текст"),
+        TranslationUpsert(entity="guides", entity_id="g2", language="uk", title="Податок"),
+        TranslationUpsert(entity="guides", entity_id="g2", language="uk", title="Податки", status="approved"),
+    ], "b@x")
+
+    assert (result["created"], result["updated"]) == (1, 1)
+    db.expire_all()
+    rows = {r.entity_id: r for r in db.query(Translation)}
+    assert (rows["g1"].title, rows["g1"].content, rows["g1"].status, rows["g1"].author_email) == ("Дозвіл", "Новий текст", "approved", "a@x")
+    assert (rows["g2"].title, rows["g2"].status, rows["g2"].author_email) == ("Податки", "approved", "b@x")
+    assert [i["entity_id"] for i in result["items"]] == ["g1", "g2"]
+
+    TranslationService.upsert_many(db, [TranslationUpsert(entity="guides", entity_id="g2", language="uk", title="Збори")], "c@x")
+    db.expire_all()
+    row = db.query(Translation).filter(Translation.entity_id == "g2").one()
+    assert (row.title, row.status) == ("Збори", "approved")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+
+from backend.app.core.cache import bump_version
+from backend.app.models import Guide, Template
+from backend.app.models.translation import Translation
+from backend.app.services import translations
+from backend.app.services.translations import TranslationService
+
+
+def test_coverage_matrix_and_drill_down(db):
+    # Results are cached per process; start from scratch
+    translations._coverage_cache.clear()
+    db.add_all([
+        Guide(id="g1", title="Bank", slug="bank", status="published"),
+        Guide(id="g2", title="Arzt", slug="arzt", status="published"),
+        Guide(id="g3", title="Draft", slug="draft", status="draft"),
+        Template(id="t1", name="Letter", content="", status="published"),
+        Translation(entity="guides", entity_id="g1", language="uk", status="approved"),
+        Translation(entity="guides", entity_id="g2", language="uk", status="pending"),
+        Translation(entity="guides", entity_id="g1", language="ru", status="rejected"),
+        Translation(entity="guides", entity_id="g3", language="uk", status="approved"),
+    ])
+    db.commit()
+
+    report = TranslationService.coverage(db)
+    guides = report["entities"]["guides"]
+    assert guides["total"] == 2
+    assert guides["languages"]["uk"] == {"approved": 1, "pending": 1, "rejected": 0, "missing": 0, "ratio": 0.5}
+    assert guides["languages"]["ru"] == {"approved": 0, "pending": 0, "rejected": 1, "missing": 1, "ratio": 0.0}
+    assert report["entities"]["templates"]["languages"]["en"]["missing"] == 1
+    assert report["entities"]["checklists"] == {
+        "total": 0,
+        "languages": {lang: {"approved": 0, "pending": 0, "rejected": 0, "missing": 0, "ratio": 1.0} for lang in ("uk", "ru", "en")},
+    }
+
+    items = TranslationService.coverage_items(db, "guides")
+    assert items == [
+        {"id": "g2", "title": "Arzt", "languages": {"uk": "pending", "ru": "missing", "en": "missing"}},
+        {"id": "g1", "title": "Bank", "languages": {"uk": "approved", "ru": "rejected", "en": "missing"}},
+    ]
+    assert [i["id"] for i in TranslationService.coverage_items(db, "guides", language="ru", status="missing")] == ["g2"]
+    assert [i["id"] for i in TranslationService.coverage_items(db, "guides", language="uk", status="approved")] == ["g1"]
+    assert TranslationService.coverage_items(db, "templates", ["de"]) == [{"id": "t1", "title": "Letter", "languages": {"de": "missing"}}]
+
+
+def test_coverage_is_cached_until_a_write(db):
+    translations._coverage_cache.clear()
+    db.add(Guide(id="g1", title="Bank", slug="bank", status="published"))
+    db.commit()
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    report = TranslationService.coverage(db)
+    report["entities"]["guides"]["total"] = 99  # callers get their own copy
+    assert TranslationService.coverage(db)["entities"]["guides"]["languages"]["uk"]["missing"] == 1
+    assert len(statements) == 1
+
+    db.add(Translation(entity="guides", entity_id="g1", language="uk", status="approved"))
+    db.commit()
+    bump_version("translations")
+    assert TranslationService.coverage(db)["entities"]["guides"]["languages"]["uk"]["approved"] == 1
+    assert TranslationService.coverage_items(db, "guides", ["uk"]) == [{"id": "g1", "title": "Bank", "languages": {"uk": "approved"}}]
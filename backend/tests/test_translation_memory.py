@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import random
+
+from backend.app.core.config import get_settings
+from backend.app.models import Guide
+from backend.app.models.content_change import ContentChange
+from backend.app.models.translation import Translation
+from backend.app.services.translation_memory import TranslationMemory, levenshtein, segment
+
+
+def _dp_levenshtein(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def test_bit_parallel_levenshtein_matches_dynamic_programming():
+    rng = random.Random(7)
+    for _ in range(500):
+        a = "".join(rng.choice("abcї ") for _ in range(rng.randint(0, 80)))
+        b = "".join(rng.choice("abcї ") for _ in range(rng.randint(0, 80)))
+        assert levenshtein(a, b) == _dp_levenshtein(a, b)
+
+
+def test_segment_splits_sentences_and_strips_markdown():
+    text = "## Permit\n\n- Bring your passport. Bring a photo!\n1. Pay the fee\n```"
+    assert segment(text) == ["Permit", "Bring your passport.", "Bring a photo!", "Pay the fee"]
+
+
+def test_suggest_returns_fuzzy_matches_and_follows_changes(db):
+    guide = Guide(
+        title="Residence permit",
+        slug="permit",
+        content="Bring your passport to the office. The fee is paid in cash.",
+        status="published",
+    )
+    db.add(guide)
+    db.commit()
+    db.add(Translation(
+        entity="guides", entity_id=guide.id, language="uk", status="approved",
+        title="Посвідка на проживання", content="Візьміть паспорт до офісу. Збір сплачується готівкою.",
+    ))
+    db.commit()
+    TranslationMemory.rebuild(db)
+
+    (seg, score), = TranslationMemory.suggest(db, "Bring your passport to the offices", "uk")
+    assert (seg.target, seg.field, seg.entity_id) == ("Візьміть паспорт до офісу.", "content", guide.id)
+    assert 0.9 < score < 1.0
+    assert TranslationMemory.suggest(db, "Bring your passport to the office", "de") == []
+    assert TranslationMemory.suggest(db, "Completely unrelated sentence", "uk") == []
+
+    # Segment counts no longer line up: the content pairs are dropped
+    guide.content = "Bring your passport to the office."
+    db.commit()
+    TranslationMemory.refresh(db, force=True)
+    assert TranslationMemory.suggest(db, "Bring your passport to the office", "uk") == []
+    assert TranslationMemory.suggest(db, "Residence permit", "uk")[0][0].target == "Посвідка на проживання"
+
+
+def test_late_commit_of_a_lower_seq_is_not_skipped(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SYNC_SETTLE_SEC", 30)
+    guide = Guide(title="Health insurance", slug="insurance", status="published")
+    db.add(guide)
+    db.commit()
+    TranslationMemory.rebuild(db)
+    db.add(Translation(entity="guides", entity_id=guide.id, language="uk", status="approved", title="Медичне страхування"))
+    db.commit()
+    db.add(Guide(title="Bank account", slug="bank", status="published"))
+    db.commit()
+
+    # The translation's transaction took the lower seq but has not committed yet
+    late = db.query(ContentChange).filter(ContentChange.entity == "translations").one()
+    db.expunge(late)
+    db.query(ContentChange).filter(ContentChange.seq == late.seq).delete()
+    db.commit()
+    TranslationMemory.refresh(db, force=True)
+
+    db.merge(late)
+    db.commit()
+    TranslationMemory.refresh(db, force=True)
+    assert TranslationMemory.suggest(db, "Health insurance", "uk")[0][0].target == "Медичне страхування"